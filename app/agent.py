@@ -1,24 +1,59 @@
 from langgraph.graph import StateGraph, END
 from typing import TypedDict, Optional, List, Dict, Any
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from app.intents import build_intent_messages, get_precomputed_intent, store_intent
+from app import inventory
+import asyncio
 import random
 import os
 import json
 from datetime import datetime, timedelta
 import uuid
+import logging
+import threading
+import time
 
-# Initialize LLM (will gracefully degrade if no API key)
-try:
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
-    LLM_AVAILABLE = True
-except Exception as e:
-    print(f"OpenAI not configured: {e}. Using rule-based fallback.")
-    LLM_AVAILABLE = False
+logger = logging.getLogger(__name__)
+
+_llm = None
+_llm_checked = False
+_llm_lock = threading.Lock()
+
+def get_llm():
+    """
+    The ChatOpenAI client, created on first use (None if OpenAI isn't configured,
+    in which case intent extraction uses the rule-based fallback).
+    """
+    global _llm, _llm_checked
+    if not _llm_checked:
+        with _llm_lock:
+            if not _llm_checked:
+                try:
+                    from langchain_openai import ChatOpenAI
+                    _llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+                except Exception as e:
+                    logger.warning("OpenAI not configured: %s. Using rule-based fallback.", e)
+                _llm_checked = True
+    return _llm
+
+# Per-request deadline for intent extraction (including time spent waiting for a slot),
+# and a cap on concurrent LLM calls per worker so booking bursts degrade to rules
+LLM_TIMEOUT_SECONDS = float(os.getenv("BOOKING_LLM_TIMEOUT", 4))
+LLM_MAX_CONCURRENCY = int(os.getenv("BOOKING_LLM_CONCURRENCY", 8))
+_llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+# Paused booking sessions (one LangGraph thread per booking id) live here between /agent/book and confirm;
+# sessions older than BOOKING_SESSION_TTL_HOURS are pruned
+CHECKPOINT_DB = os.getenv("BOOKING_CHECKPOINT_DB", os.path.join("data", "booking_checkpoints.sqlite"))
+BOOKING_SESSION_TTL_HOURS = float(os.getenv("BOOKING_SESSION_TTL_HOURS", 24))
+SESSION_PRUNE_INTERVAL = 600
+
+# A confirmation claims its booking id in Redis first, so concurrent confirms can't both book
+CONFIRM_CLAIM_TTL = 86400
 
 
 class BookingState(TypedDict):
     """State for the booking agent workflow"""
+    booking_id: str
     video_id: str
     user_id: str
     venue_info: Dict[str, Any]
@@ -30,51 +65,34 @@ class BookingState(TypedDict):
     logs: List[str]  # Execution trace for UI
 
 
-def extract_booking_intent(state: BookingState) -> BookingState:
+async def _call_llm(messages):
+    async with _llm_semaphore:
+        return await get_llm().ainvoke(messages)
+
+async def extract_booking_intent(state: BookingState) -> BookingState:
     """
     Use LLM to intelligently extract booking intent from video context.
-    Falls back to rule-based logic if LLM unavailable.
+    Reads the precomputed intent for the video when its content is unchanged;
+    falls back to rule-based logic if LLM unavailable or past the deadline.
     """
     video = state["venue_info"]
 
-    if LLM_AVAILABLE and os.getenv("OPENAI_API_KEY"):
+    precomputed = get_precomputed_intent(state["video_id"], video)
+
+    if precomputed:
+        intent = precomputed
+    elif os.getenv("OPENAI_API_KEY") and get_llm() is not None:
         try:
-            system_prompt = """You are a booking assistant that extracts intent from video content.
-Given a video about a venue, suggest appropriate booking parameters.
-
-Consider:
-- Video type (event, promo, ambiance, special) suggests timing
-- Categories suggest party size and occasion
-- Description may contain specific event times or offers
-
-Return JSON only, no other text:
-{
-    "party_size": <1-8>,
-    "suggested_date": "<YYYY-MM-DD>",
-    "suggested_time": "<HH:MM>",
-    "occasion": "<casual|date_night|group_outing|business|celebration>",
-    "special_requests": "<any relevant notes from video>",
-    "reasoning": "<brief explanation>"
-}"""
-
-            user_prompt = f"""Video Title: {video.get('title', 'Untitled')}
-Video Description: {video.get('description', 'No description')}
-Video Type: {video.get('video_type', 'general')}
-Categories: {', '.join(video.get('categories', []))}
-Venue: {video.get('venue_name', 'Unknown')}
-
-Extract booking intent."""
-
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt)
-            ]
-
-            response = llm.invoke(messages)
-            intent = json.loads(response.content)
+            messages = build_intent_messages(video)
+
+            response = await asyncio.wait_for(_call_llm(messages), timeout=LLM_TIMEOUT_SECONDS)
+            intent = store_intent(state["video_id"], video, json.loads(response.content))
 
+        except asyncio.TimeoutError:
+            logger.warning("LLM intent extraction timed out after %ss, using fallback", LLM_TIMEOUT_SECONDS)
+            intent = _rule_based_intent(video)
         except Exception as e:
-            print(f"LLM intent extraction failed: {e}, using fallback")
+            logger.warning("LLM intent extraction failed: %s, using fallback", e)
             intent = _rule_based_intent(video)
     else:
         # Rule-based fallback
@@ -83,7 +101,7 @@ Extract booking intent."""
     state["booking_intent"] = intent
     state["step"] = "intent_extracted"
     state.setdefault("logs", []).append(f"🧠 Extracted intent: Party of {intent.get('party_size', '?')} for {intent.get('occasion', 'visit')}")
-    print(f"DEBUG: Intent extracted: {intent}")
+    logger.debug("Intent extracted: %s", intent)
     return state
 
 
@@ -140,7 +158,8 @@ def _rule_based_intent(video: Dict[str, Any]) -> Dict[str, Any]:
 
 def check_availability(state: BookingState) -> BookingState:
     """
-    Mock availability check with realistic logic.
+    Check the requested slot against the venue's seat inventory (app.inventory).
+    When it can't seat the party, offer the nearest open slots instead.
     In production: integrate with OpenTable, Resy, Toast, etc.
     """
     intent = state["booking_intent"]
@@ -155,68 +174,37 @@ def check_availability(state: BookingState) -> BookingState:
     except:
         booking_datetime = datetime.now() + timedelta(days=3, hours=19)
 
-    # Realistic availability logic
-    hour = booking_datetime.hour
-    day_of_week = booking_datetime.weekday()  # 0=Monday, 6=Sunday
+    # Snap to a bookable slot so the proposal matches what will be reserved
+    booking_datetime = inventory.slot_datetime(booking_datetime.date(), inventory.slot_index(booking_datetime))
     party_size = intent['party_size']
 
-    # Calculate availability score
-    availability_score = 1.0
-
-    # Prime dinner times (7-9pm) are harder to book
-    if 19 <= hour <= 21:
-        availability_score *= 0.6
-
-    # Weekend evenings are harder
-    if day_of_week >= 5 and hour >= 18:  # Friday/Saturday evening
-        availability_score *= 0.5
-
-    # Large parties are harder
-    if party_size >= 6:
-        availability_score *= 0.7
-
-    # Weekday lunch is easy
-    if day_of_week < 5 and 11 <= hour <= 14:
-        availability_score *= 1.3
-
-    is_available = random.random() < availability_score
+    try:
+        open_slots = inventory.find_open_slots([venue_id], booking_datetime, party_size, per_venue=4)[venue_id]
+    except Exception as e:
+        # Inventory unavailable: let the request through, confirm_booking reserves for real
+        logger.warning("Inventory lookup failed: %s", e)
+        open_slots = [booking_datetime]
 
-    if is_available:
+    if booking_datetime in open_slots:
         state["availability_check"] = {
             "status": "available",
             "booking_datetime": booking_datetime.isoformat(),
             "message": f"Perfect! {state['venue_info']['venue_name']} has availability."
         }
     else:
-        # Generate alternatives
         alternatives = []
-
-        # Try 1 hour later
-        alt1 = booking_datetime + timedelta(hours=1)
-        alternatives.append({
-            "datetime": alt1.isoformat(),
-            "display": alt1.strftime("%A, %B %d at %I:%M %p"),
-            "reason": "Same day, slightly later"
-        })
-
-        # Try same time next day
-        alt2 = booking_datetime + timedelta(days=1)
-        alternatives.append({
-            "datetime": alt2.isoformat(),
-            "display": alt2.strftime("%A, %B %d at %I:%M %p"),
-            "reason": "Next day, same time"
-        })
-
-        # Try same day of week, different time
-        if hour >= 19:
-            alt3 = booking_datetime.replace(hour=17, minute=30)
-        else:
-            alt3 = booking_datetime.replace(hour=20, minute=0)
-        alternatives.append({
-            "datetime": alt3.isoformat(),
-            "display": alt3.strftime("%A, %B %d at %I:%M %p"),
-            "reason": "Same day, different time"
-        })
+        for alt in open_slots[:3]:
+            if alt.date() != booking_datetime.date():
+                reason = "Next day, " + ("same time" if alt.time() == booking_datetime.time() else "different time")
+            elif alt > booking_datetime:
+                reason = "Same day, slightly later"
+            else:
+                reason = "Same day, slightly earlier"
+            alternatives.append({
+                "datetime": alt.isoformat(),
+                "display": alt.strftime("%A, %B %d at %I:%M %p"),
+                "reason": reason
+            })
 
         state["availability_check"] = {
             "status": "unavailable",
@@ -228,10 +216,39 @@ def check_availability(state: BookingState) -> BookingState:
     state["step"] = "availability_checked"
     status_icon = "✅" if state.get("availability_check", {}).get("status") == "available" else "❌"
     state.setdefault("logs", []).append(f"{status_icon} Checked availability: {state.get('availability_check', {}).get('status')}")
-    print(f"DEBUG: Availability checked: {state['availability_check']}")
+    logger.debug("Availability checked: %s", state['availability_check'])
     return state
 
 
+def _ready_proposal(venue: Dict[str, Any], intent: Dict[str, Any], booking_datetime: datetime) -> Dict[str, Any]:
+    return {
+        "status": "ready_to_book",
+        "title": f"Book {venue['venue_name']}",
+        "venue_name": venue["venue_name"],
+        "venue_id": venue["venue_id"],
+        "venue_category": venue.get("category", "Restaurant"),
+        "party_size": intent["party_size"],
+        "date": booking_datetime.strftime("%A, %B %d, %Y"),
+        "time": booking_datetime.strftime("%I:%M %p"),
+        "datetime_iso": booking_datetime.isoformat(),
+        "occasion": intent.get("occasion", "casual").replace("_", " ").title(),
+        "special_requests": intent.get("special_requests", ""),
+        "message": f"Great choice! Ready to book a table for {intent['party_size']} on {booking_datetime.strftime('%A, %b %d at %I:%M %p')}?",
+        "action_required": "confirm_or_modify"
+    }
+
+
+def choose_alternative(state: BookingState, choice: str) -> Dict[str, Any]:
+    """
+    Bookable proposal for one of the alternatives offered in `state`.
+    Raises ValueError if `choice` isn't one of them.
+    """
+    offered = [alt["datetime"] for alt in (state.get("booking_proposal") or {}).get("alternatives", [])]
+    if choice not in offered:
+        raise ValueError(f"{choice} is not one of the offered alternatives")
+    return _ready_proposal(state["venue_info"], state["booking_intent"], datetime.fromisoformat(choice))
+
+
 def create_booking_proposal(state: BookingState) -> BookingState:
     """
     Generate user-friendly booking proposal with all details.
@@ -241,23 +258,7 @@ def create_booking_proposal(state: BookingState) -> BookingState:
     availability = state["availability_check"]
 
     if availability["status"] == "available":
-        booking_datetime = datetime.fromisoformat(availability["booking_datetime"])
-
-        proposal = {
-            "status": "ready_to_book",
-            "title": f"Book {venue['venue_name']}",
-            "venue_name": venue["venue_name"],
-            "venue_id": venue["venue_id"],
-            "venue_category": venue.get("category", "Restaurant"),
-            "party_size": intent["party_size"],
-            "date": booking_datetime.strftime("%A, %B %d, %Y"),
-            "time": booking_datetime.strftime("%I:%M %p"),
-            "datetime_iso": booking_datetime.isoformat(),
-            "occasion": intent.get("occasion", "casual").replace("_", " ").title(),
-            "special_requests": intent.get("special_requests", ""),
-            "message": f"Great choice! Ready to book a table for {intent['party_size']} on {booking_datetime.strftime('%A, %b %d at %I:%M %p')}?",
-            "action_required": "confirm_or_modify"
-        }
+        proposal = _ready_proposal(venue, intent, datetime.fromisoformat(availability["booking_datetime"]))
     else:
         proposal = {
             "status": "alternatives_available",
@@ -274,7 +275,7 @@ def create_booking_proposal(state: BookingState) -> BookingState:
     state["booking_proposal"] = proposal
     state["step"] = "proposal_created"
     state.setdefault("logs", []).append("📝 Generated booking proposal")
-    print(f"DEBUG: Proposal created: {proposal}")
+    logger.debug("Proposal created: %s", proposal)
     return state
 
 
@@ -283,51 +284,111 @@ def confirm_booking(state: BookingState) -> BookingState:
     Finalize booking and store in Neo4j.
     In production: call venue API, send confirmation email, etc.
     """
-    from app.graph import driver
+    from app.graph import run_query
+    from app.cache import invalidate_profile
 
     proposal = state["booking_proposal"]
-    booking_id = f"booking_{uuid.uuid4().hex[:12]}"
+    booking_id = state.get("booking_id") or new_booking_id()
+    booking_datetime = datetime.fromisoformat(proposal["datetime_iso"])
+
+    # Take the seats first; two users racing for the last table can't both get it.
+    # Without inventory we can't tell whether the seats exist, so nothing is booked.
+    try:
+        reserved = inventory.reserve(proposal["venue_id"], booking_datetime, proposal["party_size"])
+    except Exception as e:
+        logger.warning("Inventory reserve failed: %s", e)
+        state["booking_confirmation"] = {
+            "status": "failed",
+            "booking_id": booking_id,
+            "venue_name": proposal["venue_name"],
+            "party_size": proposal["party_size"],
+            "date": proposal["date"],
+            "time": proposal["time"],
+            "message": f"Sorry, we couldn't check availability at {proposal['venue_name']} right now. Your table was not reserved - please try again.",
+            "error": "Inventory unavailable",
+            "stored_in_db": False
+        }
+        state["step"] = "booking_failed"
+        state.setdefault("logs", []).append("❌ Could not reserve seats; nothing was booked")
+        return state
+
+    if not reserved:
+        state["booking_confirmation"] = {
+            "status": "unavailable",
+            "venue_name": proposal["venue_name"],
+            "party_size": proposal["party_size"],
+            "date": proposal["date"],
+            "time": proposal["time"],
+            "message": f"Sorry, that table at {proposal['venue_name']} was just taken. Please pick another time.",
+            "stored_in_db": False
+        }
+        state["step"] = "booking_unavailable"
+        state.setdefault("logs", []).append("❌ Slot was taken before confirmation")
+        return state
 
     # Store booking in Neo4j
     try:
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (u:User {id: $user_id})
-                MATCH (v:Venue {id: $venue_id})
-                MATCH (video:Video {id: $video_id})
-                CREATE (u)-[b:BOOKED {
-                    booking_id: $booking_id,
-                    party_size: $party_size,
-                    booking_datetime: datetime($datetime_iso),
-                    occasion: $occasion,
-                    special_requests: $special_requests,
-                    status: 'confirmed',
-                    created_at: datetime(),
-                    video_source: $video_id
-                }]->(v)
-                CREATE (u)-[:WATCHED {
-                    action: 'booked',
-                    watch_time: 0,
-                    timestamp: datetime(),
-                    booking_id: $booking_id
-                }]->(video)
-                RETURN b.booking_id as booking_id
-            """,
-                user_id=state["user_id"],
-                venue_id=proposal["venue_id"],
-                video_id=state["video_id"],
-                booking_id=booking_id,
-                party_size=proposal["party_size"],
-                datetime_iso=proposal["datetime_iso"],
-                occasion=proposal.get("occasion", "casual"),
-                special_requests=proposal.get("special_requests", "")
-            )
-
-            confirmation_created = result.single() is not None
+        records = run_query("confirm_booking", """
+            MATCH (u:User {id: $user_id})
+            MATCH (v:Venue {id: $venue_id})
+            MATCH (video:Video {id: $video_id})
+            CREATE (u)-[b:BOOKED {
+                booking_id: $booking_id,
+                party_size: $party_size,
+                booking_datetime: datetime($datetime_iso),
+                occasion: $occasion,
+                special_requests: $special_requests,
+                status: 'confirmed',
+                created_at: datetime(),
+                video_source: $video_id
+            }]->(v)
+            CREATE (u)-[:WATCHED {
+                action: 'booked',
+                watch_time: 0,
+                timestamp: datetime(),
+                booking_id: $booking_id
+            }]->(video)
+            RETURN b.booking_id as booking_id
+        """,
+            write=True,
+            user_id=state["user_id"],
+            venue_id=proposal["venue_id"],
+            video_id=state["video_id"],
+            booking_id=booking_id,
+            party_size=proposal["party_size"],
+            datetime_iso=proposal["datetime_iso"],
+            occasion=proposal.get("occasion", "casual"),
+            special_requests=proposal.get("special_requests", "")
+        )
+
+        confirmation_created = bool(records)
+
+        invalidate_profile(state["user_id"])
     except Exception as e:
-        print(f"Failed to store booking in Neo4j: {e}")
+        logger.exception("Failed to store booking in Neo4j: %s", e)
         confirmation_created = False
 
+    if not confirmation_created:
+        try:
+            inventory.release(proposal["venue_id"], booking_datetime, proposal["party_size"])
+        except Exception as e:
+            logger.warning("Inventory release failed: %s", e)
+
+        state["booking_confirmation"] = {
+            "status": "failed",
+            "booking_id": booking_id,
+            "venue_name": proposal["venue_name"],
+            "party_size": proposal["party_size"],
+            "date": proposal["date"],
+            "time": proposal["time"],
+            "message": f"Sorry, we couldn't complete your booking at {proposal['venue_name']}. Your table was not reserved - please try again.",
+            "error": "Booking could not be stored",
+            "stored_in_db": False
+        }
+        state["step"] = "booking_failed"
+        state.setdefault("logs", []).append("❌ Booking could not be stored; seats released")
+        return state
+
     # Generate confirmation
     state["booking_confirmation"] = {
         "status": "confirmed",
@@ -343,7 +404,7 @@ def confirm_booking(state: BookingState) -> BookingState:
             "Add to your calendar (coming soon!)",
             "View booking details in your profile"
         ],
-        "stored_in_db": confirmation_created
+        "stored_in_db": True
     }
 
     state["step"] = "booking_confirmed"
@@ -359,15 +420,21 @@ def route_after_availability(state: BookingState) -> str:
         return "create_proposal"  # Still create proposal with alternatives
 
 
-def build_booking_agent() -> StateGraph:
+def build_booking_agent(checkpointer=None) -> StateGraph:
     """
     Build the complete booking agent workflow.
 
     Workflow:
     1. Extract Intent: Analyze video context to determine booking parameters
-    2. Check Availability: Mock availability check (pluggable with real APIs)
+    2. Check Availability: Slot inventory lookup, nearest open slots as alternatives
     3. Create Proposal: Generate user-friendly booking proposal or alternatives
     4. Confirm Booking: Finalize and store in Neo4j
+
+    Without a checkpointer the graph stops after the proposal and the caller
+    confirms by calling confirm_booking() itself. With one, it pauses before
+    confirm_booking and is resumed on the same thread_id (see booking_config).
+
+    Intent extraction is async, so run the agent with `ainvoke`.
     """
     workflow = StateGraph(BookingState)
 
@@ -387,17 +454,136 @@ def build_booking_agent() -> StateGraph:
             "create_proposal": "create_proposal"
         }
     )
-    workflow.add_edge("create_proposal", END)  # User must confirm before booking
     workflow.add_edge("confirm_booking", END)
 
-    return workflow.compile()
+    if checkpointer is None:
+        workflow.add_edge("create_proposal", END)  # User must confirm before booking
+        return workflow.compile()
+
+    # User must confirm before booking: pause here, resume from the checkpoint
+    workflow.add_edge("create_proposal", "confirm_booking")
+    return workflow.compile(checkpointer=checkpointer, interrupt_before=["confirm_booking"])
+
+
+def new_booking_id() -> str:
+    return f"booking_{uuid.uuid4().hex[:12]}"
+
+
+def booking_config(booking_id: str) -> dict:
+    """LangGraph config addressing one booking session"""
+    return {"configurable": {"thread_id": booking_id}}
+
+
+def claim_confirmation(booking_id: str) -> bool:
+    """Atomically claim the right to confirm a booking; False if another confirm already holds it"""
+    from app.cache import get_redis_client
+    return bool(get_redis_client().set(f"booking:confirm:{booking_id}", 1, nx=True, ex=CONFIRM_CLAIM_TTL))
+
+
+def release_confirmation(booking_id: str):
+    """Drop a claim whose confirm didn't run to completion, so it can be retried"""
+    from app.cache import get_redis_client
+    get_redis_client().delete(f"booking:confirm:{booking_id}")
+
+
+async def _open_checkpointer():
+    try:
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    except ImportError:
+        from langgraph.checkpoint.memory import MemorySaver
+        logger.warning("langgraph-checkpoint-sqlite not installed; booking sessions are kept in memory")
+        return MemorySaver()
+
+    os.makedirs(os.path.dirname(CHECKPOINT_DB) or ".", exist_ok=True)
+    conn = await aiosqlite.connect(CHECKPOINT_DB)
+    saver = AsyncSqliteSaver(conn)
+    await saver.setup()
+    # LangGraph's tables have no timestamps, so session start times are kept alongside them.
+    # Sessions from before the table existed are dated now and expire one TTL from here.
+    await conn.execute("CREATE TABLE IF NOT EXISTS booking_sessions (thread_id TEXT PRIMARY KEY, started_at REAL NOT NULL)")
+    await conn.execute(
+        "INSERT OR IGNORE INTO booking_sessions SELECT DISTINCT thread_id, ? FROM checkpoints",
+        (time.time(),)
+    )
+    await conn.commit()
+    return saver
+
+
+_stateless_agent = None
+_resumable_agent = None
+_checkpointer = None
+_resumable_lock = asyncio.Lock()
+_memory_sessions = {}  # thread_id -> started_at, when checkpoints are kept in memory
+_last_prune = 0.0
+
+
+async def get_booking_agent():
+    """The checkpointed agent used by the API (opened on first use, inside the event loop)"""
+    global _resumable_agent, _checkpointer
+    if _resumable_agent is None:
+        async with _resumable_lock:
+            if _resumable_agent is None:
+                _checkpointer = await _open_checkpointer()
+                _resumable_agent = build_booking_agent(checkpointer=_checkpointer)
+    return _resumable_agent
+
+
+async def start_booking_session(booking_id: str):
+    """Record when a booking session started; expired sessions are pruned every SESSION_PRUNE_INTERVAL"""
+    global _last_prune
+    await get_booking_agent()
+    now = time.time()
+    conn = getattr(_checkpointer, "conn", None)
+    if conn is not None:
+        await conn.execute("INSERT OR REPLACE INTO booking_sessions VALUES (?, ?)", (booking_id, now))
+        await conn.commit()
+    else:
+        _memory_sessions[booking_id] = now
+
+    if now - _last_prune > SESSION_PRUNE_INTERVAL:
+        _last_prune = now
+        try:
+            await prune_booking_sessions(now)
+        except Exception as e:
+            logger.warning("Pruning booking sessions failed: %s", e)
+
+
+async def prune_booking_sessions(now: float = None) -> int:
+    """Delete the checkpoints of sessions older than BOOKING_SESSION_TTL_HOURS; returns how many"""
+    await get_booking_agent()
+    cutoff = (now or time.time()) - BOOKING_SESSION_TTL_HOURS * 3600
+    conn = getattr(_checkpointer, "conn", None)
+    if conn is not None:
+        async with conn.execute("SELECT thread_id FROM booking_sessions WHERE started_at < ?", (cutoff,)) as cursor:
+            expired = [row[0] for row in await cursor.fetchall()]
+    else:
+        expired = [thread_id for thread_id, started_at in _memory_sessions.items() if started_at < cutoff]
+
+    for thread_id in expired:
+        await _checkpointer.adelete_thread(thread_id)
+        if conn is not None:
+            await conn.execute("DELETE FROM booking_sessions WHERE thread_id = ?", (thread_id,))
+        else:
+            _memory_sessions.pop(thread_id, None)
+    if conn is not None:
+        await conn.commit()
+    if expired:
+        logger.info("Pruned %d expired booking sessions", len(expired))
+    return len(expired)
 
 
-# Initialize the agent
-booking_agent = build_booking_agent()
+def __getattr__(name):
+    # `booking_agent` (stateless, for scripts and direct use) is compiled on first access
+    global _stateless_agent
+    if name == "booking_agent":
+        if _stateless_agent is None:
+            _stateless_agent = build_booking_agent()
+        return _stateless_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Legacy function for backward compatibility
 def booking_agent_workflow():
     """Legacy function - returns the new agent"""
-    return booking_agent
+    return __getattr__("booking_agent")
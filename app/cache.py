@@ -0,0 +1,54 @@
+import os
+import json
+import redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
+# Profiles are rebuilt at most every 10 minutes, and sooner when the user's
+# engagement or friendships change (see invalidate_profile callers)
+PROFILE_TTL = 600
+
+r = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+# For values that are packed binary rather than text
+rb = redis.Redis.from_url(REDIS_URL)
+
+def get_redis_client():
+    return r
+
+def get_binary_redis_client():
+    return rb
+
+def _profile_key(user_id: str) -> str:
+    return f"profile:{user_id}"
+
+def get_cached_profile(user_id: str) -> dict | None:
+    try:
+        cached = r.get(_profile_key(user_id))
+        return json.loads(cached) if cached else None
+    except Exception as e:
+        logger.warning("Profile cache read failed: %s", e)
+        return None
+
+def set_cached_profile(user_id: str, profile: dict):
+    try:
+        r.set(_profile_key(user_id), json.dumps(profile, default=str), ex=PROFILE_TTL)
+    except Exception as e:
+        logger.warning("Profile cache write failed: %s", e)
+
+def invalidate_profile(*user_ids: str):
+    try:
+        if user_ids:
+            r.delete(*[_profile_key(user_id) for user_id in user_ids])
+    except Exception as e:
+        logger.warning("Profile cache invalidation failed: %s", e)
+
+def invalidate_all_profiles():
+    try:
+        keys = list(r.scan_iter(match=_profile_key("*"), count=1000))
+        if keys:
+            r.delete(*keys)
+    except Exception as e:
+        logger.warning("Profile cache invalidation failed: %s", e)
@@ -0,0 +1,244 @@
+import sys
+import logging
+import time
+import threading
+from array import array
+from datetime import datetime, timezone
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# How often lookups trigger an incremental pull of newly added points,
+# and how often a refresh reloads a collection in full to pick up changed and reused ids
+REFRESH_INTERVAL = 60
+FULL_RELOAD_INTERVAL = 600
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _to_epoch(value) -> float:
+    """Epoch seconds for an ISO timestamp; one without an offset is taken as UTC"""
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except Exception:
+        return float("nan")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+class PayloadTable:
+    """
+    Columnar in-process copy of one Qdrant collection's payloads.
+    Repeated strings are interned, lat/lon and timestamps live in typed arrays,
+    and rows are addressable by both Qdrant point id and business id.
+    """
+
+    collection = None
+    key_field = None
+    string_fields = ()
+    list_fields = ()
+    time_fields = ()
+
+    def __init__(self):
+        self.keys = []         # row -> business id ("video_12")
+        self.rows = {}         # business id -> row
+        self.point_rows = {}   # Qdrant point id -> row
+        self.keyless = set()   # Qdrant point ids whose payload has no business id (not served)
+        self.strings = {f: [] for f in self.string_fields}
+        self.lists = {f: [] for f in self.list_fields}
+        self.times = {f: array("d") for f in self.time_fields}
+        self.lat = array("d")
+        self.lon = array("d")
+        self.price_tier = array("b")
+        self.max_point_id = -1
+        self.refreshed_at = 0.0
+        self.loaded_at = 0.0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, point_id, payload: dict):
+        """
+        Insert or overwrite one point's payload.
+        Readers run concurrently with refreshes, so a new row's columns are all
+        filled in before its key is published in `keys`/`rows`/`point_rows`.
+        """
+        key = payload.get(self.key_field)
+        if key is None:
+            self.keyless.add(point_id)
+            return
+        location = payload.get("location")
+        strings = {f: _intern(payload.get(f)) for f in self.string_fields}
+        # None marks an absent list so payload() can leave the key out, as Qdrant does
+        lists = {f: tuple(_intern(v) for v in payload[f] or ()) if payload.get(f) is not None else None for f in self.list_fields}
+        times = {f: _to_epoch(payload.get(f) or "") for f in self.time_fields}
+        lat = location.get("lat", float("nan")) if location else float("nan")
+        lon = location.get("lon", float("nan")) if location else float("nan")
+        price_tier = payload.get("price_tier")
+        price_tier = -1 if price_tier is None else price_tier  # -1 marks a missing price tier
+
+        row = self.rows.get(key)
+        if row is None:
+            row = len(self.keys)
+            for f in self.string_fields:
+                self.strings[f].append(strings[f])
+            for f in self.list_fields:
+                self.lists[f].append(lists[f])
+            for f in self.time_fields:
+                self.times[f].append(times[f])
+            self.lat.append(lat)
+            self.lon.append(lon)
+            self.price_tier.append(price_tier)
+            self.keys.append(_intern(key))
+            self.rows[key] = row
+        else:
+            for f in self.string_fields:
+                self.strings[f][row] = strings[f]
+            for f in self.list_fields:
+                self.lists[f][row] = lists[f]
+            for f in self.time_fields:
+                self.times[f][row] = times[f]
+            self.lat[row] = lat
+            self.lon[row] = lon
+            self.price_tier[row] = price_tier
+
+        self.point_rows[point_id] = row
+        if isinstance(point_id, int):
+            self.max_point_id = max(self.max_point_id, point_id)
+
+    def payload(self, row: int) -> dict:
+        """Rebuild the payload dict for a row, in the shape Qdrant returns it (absent fields stay absent)"""
+        payload = {self.key_field: self.keys[row]}
+        for f in self.string_fields:
+            if self.strings[f][row] is not None:
+                payload[f] = self.strings[f][row]
+        for f in self.list_fields:
+            if self.lists[f][row] is not None:
+                payload[f] = list(self.lists[f][row])
+        for f in self.time_fields:
+            ts = self.times[f][row]
+            if ts == ts:  # NaN marks a missing timestamp
+                payload[f] = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+        lat, lon = self.lat[row], self.lon[row]
+        if lat == lat and lon == lon:
+            payload["location"] = {"lat": lat, "lon": lon}
+        if self.price_tier[row] >= 0:
+            payload["price_tier"] = self.price_tier[row]
+        return payload
+
+    def get(self, key: str) -> dict | None:
+        row = self.rows.get(key)
+        return self.payload(row) if row is not None else None
+
+    def get_by_point(self, point_id) -> dict | None:
+        row = self.point_rows.get(point_id)
+        return self.payload(row) if row is not None else None
+
+    def all(self) -> list[dict]:
+        return [self.payload(row) for row in range(len(self.keys))]
+
+class VideoTable(PayloadTable):
+    collection = "videos"
+    key_field = "video_id"
+    string_fields = ("venue_id", "venue_name", "title", "description", "video_type", "neighborhood", "gradient")
+    list_fields = ("categories",)
+    time_fields = ("created_at", "valid_until")
+
+class VenueTable(PayloadTable):
+    collection = "venues"
+    key_field = "venue_id"
+    string_fields = ("name", "category", "description", "neighborhood", "video_url")
+    list_fields = ("categories", "vibes")
+
+class Catalog:
+    """
+    Video and venue payloads shared by the feed, profile and friend injection.
+    Loaded in full once, then topped up incrementally by scrolling from the
+    highest known point id (seeders assign sequential integer ids). A refresh
+    reloads a collection in full when its point count no longer matches (points
+    deleted, or the collection recreated by a reseed) and every
+    FULL_RELOAD_INTERVAL, which picks up payloads updated in place.
+    """
+
+    def __init__(self):
+        self.videos = VideoTable()
+        self.venues = VenueTable()
+        self._lock = threading.Lock()
+
+    def _scroll_into(self, table: PayloadTable, start=None):
+        from app.vector import client
+
+        offset = start
+        while True:
+            with span("qdrant.scroll", collection=table.collection):
+                points, offset = client.scroll(
+                    collection_name=table.collection,
+                    limit=1000,
+                    offset=offset,
+                    with_payload=True
+                )
+            for point in points:
+                table.add(point.id, point.payload)
+            if offset is None:
+                break
+        table.refreshed_at = time.time()
+
+    def _full_table(self, table_class) -> PayloadTable:
+        table = table_class()
+        self._scroll_into(table)
+        table.loaded_at = table.refreshed_at
+        return table
+
+    def load(self):
+        """
+        Full (re)load of both collections. Raises if either scroll fails, keeping
+        the tables loaded before, so warm-up can report the catalog as failed and retry.
+        """
+        videos, venues = self._full_table(VideoTable), self._full_table(VenueTable)
+        with self._lock:
+            self.videos, self.venues = videos, venues
+
+    def _refresh_table(self, table: PayloadTable) -> PayloadTable:
+        """Top up `table`, or return a freshly loaded replacement when it has drifted from Qdrant"""
+        from app.vector import client
+
+        if time.time() - table.loaded_at > FULL_RELOAD_INTERVAL:
+            return self._full_table(type(table))
+        self._scroll_into(table, start=table.max_point_id + 1 if table.max_point_id >= 0 else None)
+        count = client.count(collection_name=table.collection, exact=True).count
+        known = len(table.point_rows) + len(table.keyless)
+        if count != known:
+            logger.info("Catalog %s has %d points, Qdrant has %d; reloading", table.collection, known, count)
+            return self._full_table(type(table))
+        return table
+
+    def refresh(self):
+        """Bring both tables up to date with Qdrant (skipped if a refresh is already running)"""
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            for name in ("videos", "venues"):
+                table = getattr(self, name)
+                try:
+                    # Readers keep using the old table until a reloaded one is swapped in
+                    setattr(self, name, self._refresh_table(table))
+                except Exception as e:
+                    table.refreshed_at = time.time()
+                    logger.warning("Catalog refresh failed for %s: %s", table.collection, e)
+        finally:
+            self._lock.release()
+
+    def maybe_refresh(self):
+        """Start a refresh in the background when the data is stale; lookups never wait on Qdrant"""
+        if time.time() - self.videos.refreshed_at > REFRESH_INTERVAL and not self._lock.locked():
+            threading.Thread(target=self.refresh, name="catalog-refresh", daemon=True).start()
+
+    def add_video(self, point_id, payload: dict):
+        with self._lock:
+            self.videos.add(point_id, payload)
+
+catalog = Catalog()
+
+def get_catalog() -> Catalog:
+    catalog.maybe_refresh()
+    return catalog
@@ -1,16 +1,57 @@
 import os
+import time
+import logging
+import threading
 from neo4j import GraphDatabase
+from app.cache import invalidate_profile
+from app.querylog import record_query
+from app.tracing import span
+from app.trending import record_venue_engagement, get_venue_engager_counts, record_video_engagement
+
+logger = logging.getLogger(__name__)
 
 URI = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
 AUTH = (os.getenv("NEO4J_USER", "neo4j"), os.getenv("NEO4J_PASSWORD", "password"))
 
-driver = GraphDatabase.driver(URI, auth=AUTH)
+_driver = None
+_driver_lock = threading.Lock()
 
 def get_db_driver():
-    return driver
+    """The shared Neo4j driver, created on first use rather than at import"""
+    global _driver
+    if _driver is None:
+        with _driver_lock:
+            if _driver is None:
+                _driver = GraphDatabase.driver(URI, auth=AUTH)
+    return _driver
 
 def close_db_driver():
-    driver.close()
+    if _driver is not None:
+        _driver.close()
+
+def __getattr__(name):
+    # Keeps `from app.graph import driver` working with the lazily created driver
+    if name == "driver":
+        return get_db_driver()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def run_query(query_name: str, query: str, /, write: bool = False, **params) -> list:
+    """
+    Run one named Cypher query and return all its records.
+    Traced as cypher.<query_name>; slow runs are logged (and sampled for PROFILE) by app.querylog.
+    Pass write=True for queries with side effects so they are never re-run for profiling.
+    """
+    with span(f"cypher.{query_name}") as query_span:
+        start = time.perf_counter()
+        with get_db_driver().session() as session:
+            result = session.run(query, **params)
+            records = list(result)
+            summary = result.consume()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        query_span.set(rows=len(records))
+
+    record_query(query_name, query, params, elapsed_ms, summary, write=write)
+    return records
 
 def get_social_scores_for_videos(video_ids: list[str], user_id: str) -> dict[str, dict]:
     """
@@ -49,82 +90,80 @@ def get_social_scores_for_videos(video_ids: list[str], user_id: str) -> dict[str
 
     social_data = {}
 
-    with driver.session() as session:
-        result = session.run(query, video_ids=video_ids, user_id=user_id)
-        for record in result:
-            video_id = record["video_id"]
-            video_engagements = record["video_engagements"]
-            venue_id = record["venue_id"]
-            venue_level_friends = record["venue_level_friends"]
-            mutual_ids = record["mutual_ids"]
-
-            score = 0
-            contributors = []
-
-            # Video-specific engagement scoring (higher weight)
-            for engagement in video_engagements:
-                if engagement['name']:
-                    if engagement['action'] == 'shared':
-                        boost = 15  # Shared THIS video
-                        score += boost
-                        contributors.append({
-                            "friend": engagement['name'],
-                            "action": "shared",
-                            "boost": boost,
-                            "video_specific": True
-                        })
-                    elif engagement['action'] == 'saved':
-                        boost = 8  # Saved THIS video
+    for record in run_query("get_social_scores_for_videos", query, video_ids=video_ids, user_id=user_id):
+        video_id = record["video_id"]
+        video_engagements = record["video_engagements"]
+        venue_id = record["venue_id"]
+        venue_level_friends = record["venue_level_friends"]
+        mutual_ids = record["mutual_ids"]
+
+        score = 0
+        contributors = []
+
+        # Video-specific engagement scoring (higher weight)
+        for engagement in video_engagements:
+            if engagement['name']:
+                if engagement['action'] == 'shared':
+                    boost = 15  # Shared THIS video
+                    score += boost
+                    contributors.append({
+                        "friend": engagement['name'],
+                        "action": "shared",
+                        "boost": boost,
+                        "video_specific": True
+                    })
+                elif engagement['action'] == 'saved':
+                    boost = 8  # Saved THIS video
+                    score += boost
+                    contributors.append({
+                        "friend": engagement['name'],
+                        "action": "saved",
+                        "boost": boost,
+                        "video_specific": True
+                    })
+                elif engagement['action'] == 'viewed':
+                    watch_time = engagement.get('watch_time', 0)
+                    if watch_time >= 10:
+                        boost = 5  # Watched THIS video >=10s
                         score += boost
                         contributors.append({
                             "friend": engagement['name'],
-                            "action": "saved",
+                            "action": "viewed",
                             "boost": boost,
                             "video_specific": True
                         })
-                    elif engagement['action'] == 'viewed':
-                        watch_time = engagement.get('watch_time', 0)
-                        if watch_time >= 10:
-                            boost = 5  # Watched THIS video >=10s
-                            score += boost
-                            contributors.append({
-                                "friend": engagement['name'],
-                                "action": "viewed",
-                                "boost": boost,
-                                "video_specific": True
-                            })
-
-            # Venue-level context (friends who engaged with OTHER videos from this venue)
-            # This provides broader social proof with lower weight
-            venue_friend_count = len(venue_level_friends) if venue_level_friends else 0
-            if venue_friend_count > 0:
-                boost = min(venue_friend_count * 2, 10)  # Cap at +10
-                score += boost
-                contributors.append({
-                    "venue_friends": venue_friend_count,
-                    "action": "love_venue",
-                    "boost": boost,
-                    "video_specific": False
-                })
-
-            # Mutual friends boost
-            mutual_count = len(mutual_ids) if mutual_ids else 0
-            if mutual_count > 0:
-                boost = mutual_count * 2
-                score += boost
-                contributors.append({
-                    "mutuals": mutual_count,
-                    "action": "interested",
-                    "boost": boost,
-                    "video_specific": False
-                })
 
-            social_data[video_id] = {
-                "social_score": score,
-                "contributors": contributors[:6],  # Top 6 contributors
-                "friend_activity": _format_friend_activity_video(contributors),
-                "venue_id": venue_id
-            }
+        # Venue-level context (friends who engaged with OTHER videos from this venue)
+        # This provides broader social proof with lower weight
+        venue_friend_count = len(venue_level_friends) if venue_level_friends else 0
+        if venue_friend_count > 0:
+            boost = min(venue_friend_count * 2, 10)  # Cap at +10
+            score += boost
+            contributors.append({
+                "venue_friends": venue_friend_count,
+                "action": "love_venue",
+                "boost": boost,
+                "video_specific": False
+            })
+
+        # Mutual friends boost
+        mutual_count = len(mutual_ids) if mutual_ids else 0
+        if mutual_count > 0:
+            boost = mutual_count * 2
+            score += boost
+            contributors.append({
+                "mutuals": mutual_count,
+                "action": "interested",
+                "boost": boost,
+                "video_specific": False
+            })
+
+        social_data[video_id] = {
+            "social_score": score,
+            "contributors": contributors[:6],  # Top 6 contributors
+            "friend_activity": _format_friend_activity_video(contributors),
+            "venue_id": venue_id
+        }
 
     return social_data
 
@@ -166,75 +205,73 @@ def get_social_scores(venue_ids: list[str], user_id: str) -> dict[str, dict]:
 
     social_data = {}
 
-    with driver.session() as session:
-        result = session.run(query, venue_ids=venue_ids, user_id=user_id)
-        for record in result:
-            venue_id = record["venue_id"]
-            friends = record["friends_activity"]
-            shares = record["shares"]
-            mutual_ids = record["mutual_ids"]
-
-            score = 0
-            contributors = []
-
-            # Scoring logic (updated for new engagement model)
-            for f in friends:
-                if f['name']:
-                    if f['type'] == 'shared':
-                        boost = 15
-                        score += boost
-                        contributors.append({
-                            "friend": f['name'],
-                            "action": "shared",
-                            "boost": boost
-                        })
-                    elif f['type'] == 'saved':
-                        boost = 8
-                        score += boost
-                        contributors.append({
-                            "friend": f['name'],
-                            "action": "saved",
-                            "boost": boost
-                        })
-                    elif f['type'] == 'viewed':
-                        # Only count engaged views (watch_time > 10s)
-                        watch_time = f.get('watch_time', 0)
-                        if watch_time >= 10:
-                            boost = 5
-                            score += boost
-                            contributors.append({
-                                "friend": f['name'],
-                                "action": "viewed",
-                                "boost": boost
-                            })
-
-            # Add shares
-            for s in shares:
-                if s['name']:
+    for record in run_query("get_social_scores", query, venue_ids=venue_ids, user_id=user_id):
+        venue_id = record["venue_id"]
+        friends = record["friends_activity"]
+        shares = record["shares"]
+        mutual_ids = record["mutual_ids"]
+
+        score = 0
+        contributors = []
+
+        # Scoring logic (updated for new engagement model)
+        for f in friends:
+            if f['name']:
+                if f['type'] == 'shared':
                     boost = 15
                     score += boost
                     contributors.append({
-                        "friend": s['name'],
+                        "friend": f['name'],
                         "action": "shared",
                         "boost": boost
                     })
+                elif f['type'] == 'saved':
+                    boost = 8
+                    score += boost
+                    contributors.append({
+                        "friend": f['name'],
+                        "action": "saved",
+                        "boost": boost
+                    })
+                elif f['type'] == 'viewed':
+                    # Only count engaged views (watch_time > 10s)
+                    watch_time = f.get('watch_time', 0)
+                    if watch_time >= 10:
+                        boost = 5
+                        score += boost
+                        contributors.append({
+                            "friend": f['name'],
+                            "action": "viewed",
+                            "boost": boost
+                        })
 
-            # Mutual friends boost
-            mutual_count = len(mutual_ids) if mutual_ids else 0
-            if mutual_count > 0:
-                boost = mutual_count * 2
+        # Add shares
+        for s in shares:
+            if s['name']:
+                boost = 15
                 score += boost
                 contributors.append({
-                    "mutuals": mutual_count,
-                    "action": "interested",
+                    "friend": s['name'],
+                    "action": "shared",
                     "boost": boost
                 })
 
-            social_data[venue_id] = {
-                "social_score": score,
-                "contributors": contributors[:5],  # Top 5 contributors
-                "friend_activity": _format_friend_activity(contributors)
-            }
+        # Mutual friends boost
+        mutual_count = len(mutual_ids) if mutual_ids else 0
+        if mutual_count > 0:
+            boost = mutual_count * 2
+            score += boost
+            contributors.append({
+                "mutuals": mutual_count,
+                "action": "interested",
+                "boost": boost
+            })
+
+        social_data[venue_id] = {
+            "social_score": score,
+            "contributors": contributors[:5],  # Top 5 contributors
+            "friend_activity": _format_friend_activity(contributors)
+        }
 
     return social_data
 
@@ -279,8 +316,9 @@ def create_friendship(user_id_a: str, user_id_b: str):
     MERGE (b:User {id: $user_id_b})
     MERGE (a)-[:FRIENDS_WITH]->(b)
     """
-    with driver.session() as session:
-        session.run(query, user_id_a=user_id_a, user_id_b=user_id_b)
+    run_query("create_friendship", query, write=True, user_id_a=user_id_a, user_id_b=user_id_b)
+
+    invalidate_profile(user_id_a, user_id_b)
 
 def log_interaction_to_graph(user_id: str, venue_id: str, interaction_type: str, weight: float):
     """Legacy function for backwards compatibility"""
@@ -329,15 +367,23 @@ def log_video_engagement(user_id: str, video_id: str, action_type: str, watch_ti
             r.timestamp = datetime()
         """
 
-    with driver.session() as session:
-        session.run(
-            query,
-            user_id=user_id,
-            video_id=video_id,
-            action=action_type,
-            watch_time=watch_time,
-            weight=weight
-        )
+    run_query(
+        "log_video_engagement",
+        query,
+        write=True,
+        user_id=user_id,
+        video_id=video_id,
+        action=action_type,
+        watch_time=watch_time,
+        weight=weight
+    )
+
+    invalidate_profile(user_id)
+
+    try:
+        record_video_engagement(video_id, weight)
+    except Exception as e:
+        logger.warning("Failed to update video velocity: %s", e)
 
 def log_engagement(user_id: str, venue_id: str, action_type: str, watch_time: int, weight: float):
     """
@@ -353,15 +399,22 @@ def log_engagement(user_id: str, venue_id: str, action_type: str, watch_time: in
         r.weight = $weight,
         r.timestamp = datetime()
     """
-    with driver.session() as session:
-        session.run(
-            query,
-            user_id=user_id,
-            venue_id=venue_id,
-            type=action_type,
-            watch_time=watch_time,
-            weight=weight
-        )
+    run_query(
+        "log_engagement",
+        query,
+        write=True,
+        user_id=user_id,
+        venue_id=venue_id,
+        type=action_type,
+        watch_time=watch_time,
+        weight=weight
+    )
+
+    # Keep the trending hour buckets in step with the graph
+    try:
+        record_venue_engagement(venue_id, user_id)
+    except Exception as e:
+        logger.warning("Failed to update trending counters: %s", e)
 
 def log_share(user_id: str, venue_id: str, shared_with_ids: list[str]):
     """
@@ -375,46 +428,57 @@ def log_share(user_id: str, venue_id: str, shared_with_ids: list[str]):
         MERGE (u)-[:SHARED_WITH {timestamp: datetime()}]->(f)
         MERGE (f)-[:RECEIVED_SHARE {from: $user_id, timestamp: datetime()}]->(v)
     """
-    with driver.session() as session:
-        session.run(
-            query,
-            user_id=user_id,
-            venue_id=venue_id,
-            shared_with_ids=shared_with_ids
-        )
+    run_query(
+        "log_share",
+        query,
+        write=True,
+        user_id=user_id,
+        venue_id=venue_id,
+        shared_with_ids=shared_with_ids
+    )
 
 def get_trending_scores(venue_ids: list[str], hours: int = 24) -> dict[str, dict]:
     """
-    Get trending scores based on recent engagement (last N hours)
-    """
-    query = """
-    UNWIND $venue_ids AS venue_id
-    MATCH (v:Venue {id: venue_id})
-    OPTIONAL MATCH ()-[r:ENGAGED_WITH]->(v)
-    WHERE r.timestamp > datetime() - duration({hours: $hours})
-    WITH venue_id, count(r) as recent_engagements
-    RETURN venue_id, recent_engagements
+    Get trending scores based on how many people engaged recently (last N hours).
+    Counts distinct users from the per-venue hour buckets in Redis; falls back to
+    counting them from ENGAGED_WITH edges if the counters are unavailable.
     """
+    try:
+        counts = get_venue_engager_counts(venue_ids, hours=hours)
+    except Exception as e:
+        logger.warning("Trending counters unavailable: %s, scanning graph", e)
+        counts = _count_recent_engagers(venue_ids, hours)
 
     trending_data = {}
 
-    with driver.session() as session:
-        result = session.run(query, venue_ids=venue_ids, hours=hours)
-        for record in result:
-            venue_id = record["venue_id"]
-            count = record["recent_engagements"] or 0
+    for venue_id, count in counts.items():
+        count = count or 0
 
-            # Normalize to 0-1 scale (assuming max 50 engagements in 24h is high)
-            score = min(count / 50.0, 1.0)
+        # Normalize to 0-1 scale (assuming 50 people engaging in 24h is high)
+        score = min(count / 50.0, 1.0)
 
-            trending_data[venue_id] = {
-                "trending_score": score,
-                "recent_count": count,
-                "reason": f"{count} people engaged in last {hours}h" if count > 0 else "No recent activity"
-            }
+        trending_data[venue_id] = {
+            "trending_score": score,
+            "recent_count": count,
+            "reason": f"{count} {'person' if count == 1 else 'people'} engaged in last {hours}h" if count > 0 else "No recent activity"
+        }
 
     return trending_data
 
+def _count_recent_engagers(venue_ids: list[str], hours: int) -> dict[str, int]:
+    """Fallback: count distinct users with an ENGAGED_WITH edge in the window straight from Neo4j"""
+    query = """
+    UNWIND $venue_ids AS venue_id
+    MATCH (v:Venue {id: venue_id})
+    OPTIONAL MATCH (u:User)-[r:ENGAGED_WITH]->(v)
+    WHERE r.timestamp > datetime() - duration({hours: $hours})
+    WITH venue_id, count(DISTINCT u) as recent_engagers
+    RETURN venue_id, recent_engagers
+    """
+
+    records = run_query("count_recent_engagers", query, venue_ids=venue_ids, hours=hours)
+    return {record["venue_id"]: record["recent_engagers"] for record in records}
+
 def get_user_video_history(user_id: str, limit: int = 50) -> list[dict]:
     """
     Get user's video watch history with engagement details
@@ -433,9 +497,54 @@ def get_user_video_history(user_id: str, limit: int = 50) -> list[dict]:
     LIMIT $limit
     """
 
-    with driver.session() as session:
-        result = session.run(query, user_id=user_id, limit=limit)
-        return [dict(r) for r in result]
+    return [dict(r) for r in run_query("get_user_video_history", query, user_id=user_id, limit=limit)]
+
+def get_user_profile_data(user_id: str, limit: int = 50, before: list = None) -> dict | None:
+    """
+    User, friends and a page of video watch history in a single query.
+    History is ordered by (timestamp, video id), newest first; `before` is the
+    [timestamp, video_id] of the last item on the previous page.
+    """
+    query = """
+    MATCH (u:User {id: $user_id})
+    RETURN u.name as name,
+           u.interests as interests,
+           u.archetype as archetype,
+           COLLECT {
+               MATCH (u)-[:FRIENDS_WITH]-(f:User)
+               WITH DISTINCT f
+               ORDER BY f.name
+               RETURN {id: f.id, name: f.name, interests: f.interests}
+           } as friends,
+           COLLECT {
+               MATCH (u)-[r:WATCHED]->(vid:Video)<-[:POSTED]-(venue:Venue)
+               WHERE $before_ts IS NULL
+                  OR r.timestamp < datetime($before_ts)
+                  OR (r.timestamp = datetime($before_ts) AND vid.id < $before_id)
+               WITH r, vid, venue
+               ORDER BY r.timestamp DESC, vid.id DESC
+               LIMIT $limit
+               RETURN {
+                   video_id: vid.id,
+                   video_title: vid.title,
+                   venue_id: venue.id,
+                   venue_name: venue.name,
+                   action: r.action,
+                   watch_time: r.watch_time,
+                   timestamp: toString(r.timestamp)
+               }
+           } as watch_history
+    """
+
+    records = run_query(
+        "get_user_profile_data",
+        query,
+        user_id=user_id,
+        limit=limit,
+        before_ts=before[0] if before else None,
+        before_id=before[1] if before else None
+    )
+    return dict(records[0]) if records else None
 
 def get_seen_videos(user_id: str) -> list[str]:
     """
@@ -446,9 +555,7 @@ def get_seen_videos(user_id: str) -> list[str]:
     RETURN vid.id as video_id
     """
 
-    with driver.session() as session:
-        result = session.run(query, user_id=user_id)
-        return [record["video_id"] for record in result]
+    return [record["video_id"] for record in run_query("get_seen_videos", query, user_id=user_id)]
 
 def clear_user_video_activity(user_id: str):
     """
@@ -459,8 +566,9 @@ def clear_user_video_activity(user_id: str):
     DELETE r
     """
 
-    with driver.session() as session:
-        session.run(query, user_id=user_id)
+    run_query("clear_user_video_activity", query, write=True, user_id=user_id)
+
+    invalidate_profile(user_id)
 
 def get_user_watch_history(user_id: str, limit: int = 50) -> list[dict]:
     """
@@ -476,20 +584,186 @@ def get_user_watch_history(user_id: str, limit: int = 50) -> list[dict]:
     LIMIT $limit
     """
 
-    with driver.session() as session:
-        result = session.run(query, user_id=user_id, limit=limit)
-        return [dict(r) for r in result]
+    return [dict(r) for r in run_query("get_user_watch_history", query, user_id=user_id, limit=limit)]
 
-def get_all_users() -> list[dict]:
+def ensure_indexes():
     """
-    Get all users for friend discovery
+    Create the schema indexes the API queries rely on, and backfill the properties they index (idempotent).
     """
-    query = """
+    statements = [
+        # Keyset pagination on name for the user directory
+        "CREATE INDEX user_name IF NOT EXISTS FOR (u:User) ON (u.name)",
+        # Case-insensitive prefix search matches on name_lower; backfill users created before it existed
+        """
+        MATCH (u:User) WHERE u.name IS NOT NULL AND u.name_lower IS NULL
+        CALL { WITH u SET u.name_lower = toLower(u.name) } IN TRANSACTIONS OF 10000 ROWS
+        """,
+        "CREATE TEXT INDEX user_name_lower_text IF NOT EXISTS FOR (u:User) ON (u.name_lower)",
+    ]
+    for statement in statements:
+        run_query("ensure_indexes", statement, write=True)
+
+def get_all_users(limit: int = None, after: list = None, search: str = None, current_user_id: str = None) -> list[dict]:
+    """
+    Get users for friend discovery, ordered by name.
+    Keyset-paginated: `after` is [name, id] of the last user on the previous page.
+    `search` is a case-insensitive name prefix, matched against the stored name_lower.
+    If current_user_id is given, is_friend/is_self are computed for the returned page only.
+    """
+    conditions = ["u.name IS NOT NULL"]
+    if search:
+        search = search.strip().lower()
+        conditions.append("u.name_lower STARTS WITH $search")
+    if after:
+        conditions.append("(u.name > $after_name OR (u.name = $after_name AND u.id > $after_id))")
+
+    query = f"""
     MATCH (u:User)
+    WHERE {" AND ".join(conditions)}
+    WITH u
+    ORDER BY u.name, u.id
+    {"LIMIT $limit" if limit else ""}
     RETURN u.id as id, u.name as name, u.interests as interests, u.archetype as archetype
-    ORDER BY u.name
+    """
+    if current_user_id:
+        query += """,
+           EXISTS { (u)-[:FRIENDS_WITH]-(:User {id: $current_user_id}) } as is_friend,
+           u.id = $current_user_id as is_self
+        """
+
+    records = run_query(
+        "get_all_users",
+        query,
+        limit=limit,
+        search=search,
+        after_name=after[0] if after else None,
+        after_id=after[1] if after else None,
+        current_user_id=current_user_id
+    )
+    return [dict(r) for r in records]
+
+BUSINESS_SORTS = {
+    # sort name -> (ORDER BY clause, keyset condition on the cursor values)
+    "videos": (
+        "total_videos DESC, name ASC, venue_id ASC",
+        """total_videos < $cursor[0]
+           OR (total_videos = $cursor[0] AND name > $cursor[1])
+           OR (total_videos = $cursor[0] AND name = $cursor[1] AND venue_id > $cursor[2])"""
+    ),
+    "name": (
+        "name ASC, venue_id ASC",
+        """name > $cursor[1]
+           OR (name = $cursor[1] AND venue_id > $cursor[2])"""
+    ),
+}
+
+def count_venues() -> int:
+    """Total number of venues (answered from Neo4j's count store, no scan)"""
+    records = run_query("count_venues", "MATCH (v:Venue) RETURN count(v) as total")
+    return records[0]["total"]
+
+def get_businesses_page(limit: int = None, sort: str = "videos", cursor: list = None, include_videos: bool = True) -> list[dict]:
+    """
+    Venues with all their videos and per-video engagement stats in one query.
+    Keyset-paginated: `cursor` is [total_videos, name, venue_id] of the last row of the previous page.
+    With include_videos=False the per-video aggregation is skipped entirely.
+    """
+    order_by, keyset = BUSINESS_SORTS[sort]
+
+    videos_subquery = """
+    CALL {
+        WITH venue
+        OPTIONAL MATCH (venue)-[:POSTED]->(video:Video)
+        OPTIONAL MATCH (video)<-[r:WATCHED]-(u:User)
+        WITH video,
+             COUNT(DISTINCT u) as total_views,
+             COUNT(DISTINCT CASE WHEN r.action = 'saved' THEN u END) as saves,
+             COUNT(DISTINCT CASE WHEN r.action = 'shared' THEN u END) as shares,
+             SUM(CASE WHEN r.watch_time >= 10 THEN 1 ELSE 0 END) as quality_views
+        ORDER BY video.created_at DESC
+        RETURN collect(CASE WHEN video IS NULL THEN null ELSE {
+            id: video.id,
+            title: video.title,
+            description: video.description,
+            video_type: video.video_type,
+            categories: coalesce(video.categories, []),
+            created_at: toString(video.created_at),
+            engagement: {
+                total_views: total_views,
+                saves: saves,
+                shares: shares,
+                quality_views: quality_views
+            }
+        } END) as videos
+    }
+    """ if include_videos else "WITH venue, venue_id, total_videos, [] as videos"
+
+    query = f"""
+    MATCH (venue:Venue)
+    WITH venue,
+         venue.id as venue_id,
+         coalesce(venue.name, '') as name,
+         COUNT {{ (venue)-[:POSTED]->(:Video) }} as total_videos
+    WHERE $cursor IS NULL OR {keyset}
+    ORDER BY {order_by}
+    {"LIMIT $limit" if limit else ""}
+    {videos_subquery}
+    RETURN venue_id,
+           venue.name as name,
+           venue.category as category,
+           venue.description as description,
+           venue.location as location,
+           venue.address as address,
+           venue.neighborhood as neighborhood,
+           venue.price_tier as price_tier,
+           total_videos,
+           videos
+    """
+
+    return [dict(r) for r in run_query("get_businesses_page", query, limit=limit, cursor=cursor)]
+
+def get_sample_videos_for_venues(venue_ids: list[str], per_venue: int = 2) -> dict[str, list[dict]]:
+    """
+    Get up to `per_venue` sample videos for each venue in a single query.
+    """
+    query = """
+    UNWIND $venue_ids AS venue_id
+    MATCH (venue:Venue {id: venue_id})-[:POSTED]->(video:Video)
+    WITH venue_id, collect({id: video.id, title: video.title, description: video.description})[..$per_venue] as videos
+    RETURN venue_id, videos
+    """
+
+    records = run_query("get_sample_videos_for_venues", query, venue_ids=venue_ids, per_venue=per_venue)
+    return {record["venue_id"]: record["videos"] for record in records}
+
+def warm_social_graph() -> int:
+    """
+    Walk every friendship once so the first feed requests hit a warm page cache
+    (and an open connection pool). Returns the number of friendships.
+    """
+    query = """
+    MATCH (u:User)-[:FRIENDS_WITH]-(f:User)
+    WITH u, count(f) as friends
+    RETURN sum(friends) / 2 as friendships
+    """
+    records = run_query("warm_social_graph", query)
+    return records[0]["friendships"] if records else 0
+
+def get_video_booking_contexts(video_ids: list[str] = None) -> list[dict]:
+    """
+    Video + venue fields the booking agent builds its intent prompt from.
+    All videos when video_ids is None.
+    """
+    query = """
+    MATCH (v:Video)<-[:POSTED]-(venue:Venue)
+    WHERE $video_ids IS NULL OR v.id IN $video_ids
+    RETURN v.id as video_id,
+           v.title as title,
+           v.description as description,
+           v.video_type as video_type,
+           coalesce(v.categories, []) as categories,
+           venue.id as venue_id,
+           venue.name as venue_name
     """
 
-    with driver.session() as session:
-        result = session.run(query)
-        return [dict(r) for r in result]
+    return [dict(r) for r in run_query("get_video_booking_contexts", query, video_ids=video_ids)]
@@ -0,0 +1,162 @@
+"""
+Precomputed booking intents.
+
+The LLM's booking intent depends only on the video (title, description, type,
+categories, venue name), so it is computed once per video and cached in Redis
+under a hash of that content. The model doesn't know today's date, so it is
+asked for a relative day (days ahead, or a weekday) rather than an absolute
+date; that is what gets stored, and it is turned into a date on read.
+
+Run the batch job with:  python -m app.intents [--force]
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import date, timedelta
+from langchain_core.messages import HumanMessage, SystemMessage
+from app.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt changes so every cached intent is recomputed
+PROMPT_VERSION = 2
+DEFAULT_DAYS_AHEAD = 3
+MAX_DAYS_AHEAD = 30
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+INTENT_SYSTEM_PROMPT = """You are a booking assistant that extracts intent from video content.
+Given a video about a venue, suggest appropriate booking parameters.
+
+Consider:
+- Video type (event, promo, ambiance, special) suggests timing
+- Categories suggest party size and occasion
+- Description may contain specific event times or offers
+- You don't know today's date: give the day relative to today, never a calendar date
+
+Return JSON only, no other text:
+{
+    "party_size": <1-8>,
+    "days_ahead": <1-30, days from today; 1 is tomorrow>,
+    "weekday": "<monday-sunday if the video points to a day of the week, otherwise null>",
+    "suggested_time": "<HH:MM>",
+    "occasion": "<casual|date_night|group_outing|business|celebration>",
+    "special_requests": "<any relevant notes from video>",
+    "reasoning": "<brief explanation>"
+}"""
+
+def build_intent_messages(video: dict) -> list:
+    user_prompt = f"""Video Title: {video.get('title', 'Untitled')}
+Video Description: {video.get('description', 'No description')}
+Video Type: {video.get('video_type', 'general')}
+Categories: {', '.join(video.get('categories', []))}
+Venue: {video.get('venue_name', 'Unknown')}
+
+Extract booking intent."""
+
+    return [
+        SystemMessage(content=INTENT_SYSTEM_PROMPT),
+        HumanMessage(content=user_prompt)
+    ]
+
+def intent_content_hash(video: dict) -> str:
+    """Hash of everything the prompt is built from"""
+    content = {
+        "version": PROMPT_VERSION,
+        "title": video.get("title"),
+        "description": video.get("description"),
+        "video_type": video.get("video_type"),
+        "categories": list(video.get("categories") or []),
+        "venue_name": video.get("venue_name"),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+def to_relative(intent: dict) -> dict:
+    """Normalize the LLM's relative day into days_ahead (and weekday, if it named one)"""
+    stored = {k: v for k, v in intent.items() if k not in ("suggested_date", "days_ahead", "weekday")}
+    try:
+        days = int(intent["days_ahead"])
+    except (KeyError, TypeError, ValueError):
+        days = DEFAULT_DAYS_AHEAD
+    stored["days_ahead"] = days if 1 <= days <= MAX_DAYS_AHEAD else DEFAULT_DAYS_AHEAD
+    weekday = str(intent.get("weekday") or "").strip().lower()
+    if weekday in WEEKDAYS:
+        stored["weekday"] = weekday
+    return stored
+
+def from_relative(stored: dict, today: date = None) -> dict:
+    """Turn a stored intent back into an absolute suggested_date; a weekday wins over days_ahead"""
+    today = today or date.today()
+    intent = {k: v for k, v in stored.items() if k not in ("days_ahead", "weekday")}
+    if stored.get("weekday") in WEEKDAYS:
+        # Next occurrence of that weekday, never today
+        days = (WEEKDAYS.index(stored["weekday"]) - today.weekday() - 1) % 7 + 1
+    else:
+        days = stored.get("days_ahead", DEFAULT_DAYS_AHEAD)
+    intent["suggested_date"] = (today + timedelta(days=days)).strftime("%Y-%m-%d")
+    return intent
+
+def _intent_key(video_id: str) -> str:
+    return f"booking_intent:{video_id}"
+
+def get_precomputed_intent(video_id: str, video: dict) -> dict | None:
+    """Cached intent for this video, or None if missing or the content has changed"""
+    try:
+        cached = get_redis_client().get(_intent_key(video_id))
+    except Exception as e:
+        logger.warning("Intent cache read failed: %s", e)
+        return None
+    if not cached:
+        return None
+    entry = json.loads(cached)
+    if entry.get("hash") != intent_content_hash(video):
+        return None
+    return from_relative(entry["intent"])
+
+def store_intent(video_id: str, video: dict, intent: dict) -> dict:
+    """Cache an LLM intent; returns it with its date normalized the same way reads will see it"""
+    entry = {"hash": intent_content_hash(video), "intent": to_relative(intent)}
+    try:
+        get_redis_client().set(_intent_key(video_id), json.dumps(entry))
+    except Exception as e:
+        logger.warning("Intent cache write failed: %s", e)
+    return from_relative(entry["intent"])
+
+async def precompute_intents(videos: list[dict], llm, concurrency: int = 8, force: bool = False) -> dict:
+    """
+    Compute and store intents for every video whose cached entry is missing or stale.
+    `videos` are booking contexts with a video_id; `llm` is anything with `ainvoke(messages)`.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"computed": 0, "skipped": 0, "failed": 0}
+
+    async def run(video: dict):
+        video_id = video["video_id"]
+        if not force and get_precomputed_intent(video_id, video) is not None:
+            stats["skipped"] += 1
+            return
+        async with semaphore:
+            try:
+                response = await llm.ainvoke(build_intent_messages(video))
+                store_intent(video_id, video, json.loads(response.content))
+                stats["computed"] += 1
+            except Exception as e:
+                logger.warning("Intent precompute failed for %s: %s", video_id, e)
+                stats["failed"] += 1
+
+    await asyncio.gather(*(run(video) for video in videos))
+    return stats
+
+if __name__ == "__main__":
+    import sys
+    from app import agent
+    from app.graph import get_video_booking_contexts
+
+    llm = agent.get_llm()
+    if llm is None:
+        sys.exit("OpenAI is not configured; nothing to precompute")
+
+    videos = get_video_booking_contexts()
+    print(f"Precomputing booking intents for {len(videos)} videos...")
+    stats = asyncio.run(precompute_intents(videos, llm, force="--force" in sys.argv))
+    print(f"✅ Computed {stats['computed']}, unchanged {stats['skipped']}, failed {stats['failed']}")
@@ -0,0 +1,104 @@
+"""
+Logging for the API and the Celery worker.
+
+Records are written as one JSON object per line. The handler on the root
+logger only enqueues; a listener thread does the JSON encoding and the
+(blocking) stdout write, so request threads and the event loop never wait on I/O.
+
+Below WARNING, records can be sampled per logger with LOG_SAMPLE_RATES, e.g.
+"app.request=0.1,app.worker=0.01" (a rate applies to that logger and its
+children). Warnings and errors are always kept.
+
+Log with %-style args -- logger.debug("Proposal: %s", proposal) -- so large
+objects are only formatted when the record is actually emitted.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+# Attributes every LogRecord has; anything else came from `extra=` and goes into the line
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    rates = {}
+    for part in spec.split(","):
+        name, _, rate = part.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = max(0.0, min(1.0, float(rate)))
+    return rates
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of sub-WARNING records, by the closest configured logger name"""
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        name = record.name
+        while name:
+            if name in self.rates:
+                return random.random() < self.rates[name]
+            name = name.rpartition(".")[0]
+        return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve args now (callers may mutate them later) and render tracebacks
+        # while they're still alive; JSON encoding waits for the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_listener = None
+
+def configure_logging(level: str = None, sample_rates: str = None):
+    """Route the root logger through the queue. Safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    enqueue_handler = _EnqueueHandler(log_queue)
+    enqueue_handler.addFilter(SamplingFilter(parse_sample_rates(sample_rates if sample_rates is not None else LOG_SAMPLE_RATES)))
+
+    root = logging.getLogger()
+    root.handlers = [enqueue_handler]
+    root.setLevel(level or LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
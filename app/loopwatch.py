@@ -0,0 +1,141 @@
+"""
+Event-loop lag watchdog.
+
+A ticker coroutine sleeps TICK_SECONDS at a time and records how late it wakes
+up (the loop's lag) in a histogram. A watchdog thread checks the ticker's
+heartbeat; when the loop has been stuck longer than LOOP_LAG_THRESHOLD_MS it
+captures the loop thread's stack, once per stall. The stall's duration is then
+charged to the innermost app/ frame of that stack ("site"), so blocking calls
+left in async endpoints show up ranked by total blocked time.
+
+Served by /debug/loop-lag.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", 100))
+TICK_SECONDS = 0.05
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class LagHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)  # last bucket is +Inf
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, lag_ms: float):
+        for i, bound in enumerate(BUCKETS_MS):
+            if lag_ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += 1
+        self.sum_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def to_dict(self) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, count in zip([*map(str, BUCKETS_MS), "+Inf"], self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            "buckets_ms": buckets,  # cumulative, Prometheus-style "le" buckets
+            "count": self.total,
+            "sum_ms": round(self.sum_ms, 1),
+            "max_ms": round(self.max_ms, 1)
+        }
+
+def _blocking_site(frame) -> tuple[str, list[str]]:
+    """(innermost frame in app/, full stack outermost-first) for a captured frame"""
+    stack, site = [], None
+    while frame is not None:
+        code = frame.f_code
+        location = f"{os.path.relpath(code.co_filename, os.path.dirname(APP_DIR))}:{frame.f_lineno} {code.co_name}"
+        stack.append(location)
+        if site is None and code.co_filename.startswith(APP_DIR) and code.co_filename != __file__:
+            site = location
+        frame = frame.f_back
+    stack.reverse()
+    return site or (stack[-1] if stack else "unknown"), stack
+
+class LoopWatchdog:
+    def __init__(self, threshold_ms: float = LOOP_LAG_THRESHOLD_MS):
+        self.threshold_ms = threshold_ms
+        self.histogram = LagHistogram()
+        self.blocked_ms = Counter()   # site -> total ms the loop was stuck there
+        self.stalls = Counter()       # site -> number of stalls
+        self.last_stacks = {}         # site -> most recent full stack
+        self._heartbeat = time.monotonic()
+        self._captured_site = None
+        self._loop_thread_id = None
+        self._task = None
+        self._stop = threading.Event()
+
+    async def _tick(self):
+        while True:
+            expected = time.monotonic() + TICK_SECONDS
+            self._heartbeat = expected
+            await asyncio.sleep(TICK_SECONDS)
+            lag_ms = max(0.0, (time.monotonic() - expected) * 1000)
+            self.histogram.observe(lag_ms)
+
+            site, self._captured_site = self._captured_site, None
+            if site is not None and lag_ms >= self.threshold_ms:
+                self.blocked_ms[site] += lag_ms
+                self.stalls[site] += 1
+                logger.warning("Event loop blocked for %.0fms at %s", lag_ms, site, extra={
+                    "lag_ms": round(lag_ms, 1),
+                    "site": site,
+                    "stack": self.last_stacks.get(site)
+                })
+
+    def _watch(self):
+        while not self._stop.wait(self.threshold_ms / 4000):
+            stuck_ms = (time.monotonic() - self._heartbeat) * 1000
+            if stuck_ms < self.threshold_ms or self._captured_site is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            site, stack = _blocking_site(frame)
+            self.last_stacks[site] = stack
+            self._captured_site = site
+
+    def start(self):
+        """Call from inside the running event loop"""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    def report(self, top: int = 20) -> dict:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "lag": self.histogram.to_dict(),
+            "blocking_sites": [
+                {
+                    "site": site,
+                    "blocked_ms": round(ms, 1),
+                    "stalls": self.stalls[site],
+                    "stack": self.last_stacks.get(site)
+                }
+                for site, ms in self.blocked_ms.most_common(top)
+            ]
+        }
+
+watchdog = LoopWatchdog()
@@ -1,13 +1,42 @@
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, HTTPException, Body, Query
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from pydantic import BaseModel
-from app.worker import process_interaction
-from app.graph import get_db_driver
-from app.vector import get_vector_client
-from app.agent import booking_agent, confirm_booking
+from typing import Optional
+import asyncio
+import base64
+import json
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
 
 from fastapi.middleware.cors import CORSMiddleware
+from app.logs import configure_logging
+from app.tracing import span, start_span, finish_span, activate
 
-app = FastAPI()
+configure_logging()
+logger = logging.getLogger(__name__)
+request_logger = logging.getLogger("app.request")
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Nothing is connected at import; clients are created on first use.
+    Warm-up (clients, catalog, indexes, user vectors, social graph, booking agent)
+    runs in the background so the process is live immediately and ready after it.
+    """
+    from app.loopwatch import watchdog
+    from app.warmup import warm_up
+    from app.graph import close_db_driver
+
+    watchdog.start()
+    warmup_task = asyncio.create_task(warm_up())
+    yield
+    warmup_task.cancel()
+    watchdog.stop()
+    close_db_driver()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -18,6 +47,81 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def log_request(request, call_next):
+    """
+    Root trace span plus one structured line per request
+    (sample the lines with LOG_SAMPLE_RATES=app.request=<rate>).
+    The span ends when the response body has been sent, so streamed
+    responses (NDJSON, SSE) are timed to their last chunk.
+    """
+    start = time.perf_counter()
+    request_span = start_span(f"{request.method} {request.url.path}")
+
+    def finish(status: int, error: BaseException = None):
+        route = request.scope.get("route")
+        if route is not None:
+            request_span.name = f"{request.method} {route.path}"
+        user_id = request.query_params.get("user_id") or request.path_params.get("user_id")
+        request_span.set(status=status, user_id=user_id)
+        finish_span(request_span, error)
+        request_logger.info("%s %s", request.method, request.url.path, extra={
+            "status": status,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "user_id": user_id,
+            "trace_id": request_span.trace_id
+        })
+
+    try:
+        with activate(request_span):
+            response = await call_next(request)
+    except BaseException as e:
+        finish(500, e)
+        raise
+    response.headers["X-Trace-Id"] = request_span.trace_id
+
+    body = response.body_iterator
+
+    async def traced_body():
+        error = None
+        try:
+            async for chunk in body:
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            # The client went away mid-stream (e.g. closed an SSE feed); not a server error
+            request_span.set(disconnected=True)
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            finish(response.status_code, error)
+
+    response.body_iterator = traced_body()
+    return response
+
+@app.middleware("http")
+async def profile_request(request, call_next):
+    """Opt-in profiling with ?_profile=1|cprofile or X-Profile (see app/profiling.py, off unless PROFILING_ENABLED=1)"""
+    from app import profiling
+
+    mode = profiling.requested_mode(request.query_params, request.headers)
+    profile = profiling.try_start(mode) if mode else None
+    if profile is None:
+        response = await call_next(request)
+        if mode:
+            response.headers["X-Profile"] = "busy"
+        return response
+
+    try:
+        response = await call_next(request)
+    finally:
+        route = request.scope.get("route")
+        user_id = request.query_params.get("user_id") or request.path_params.get("user_id")
+        name = profiling.finish(profile, route.path if route is not None else request.url.path, user_id)
+    response.headers["X-Profile"] = name
+    return response
+
 class Interaction(BaseModel):
     user_id: str
     venue_id: str
@@ -34,6 +138,17 @@ class AgentAction(BaseModel):
     party_size: int
     time: str
 
+@app.get("/health/live")
+async def health_live():
+    """Liveness: the process is up and its event loop is serving"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: warm-up has finished and no required step failed (503 with per-step progress otherwise)"""
+    from app.warmup import readiness
+    return ORJSONResponse(readiness.to_dict(), status_code=200 if readiness.ready else 503)
+
 @app.post("/debug/reset")
 async def debug_reset(clear_venues: bool = False):
     """
@@ -41,8 +156,8 @@ async def debug_reset(clear_venues: bool = False):
     Set clear_venues=True to wipe everything.
     """
     from app.vector import client
-    from app.graph import driver
-    
+    from app.graph import run_query
+
     try:
         if clear_venues:
             # Clear Qdrant
@@ -55,18 +170,75 @@ async def debug_reset(clear_venues: bool = False):
             )
             
             # Clear Neo4j completely
-            with driver.session() as session:
-                session.run("MATCH (n) DETACH DELETE n")
+            run_query("debug_reset_all", "MATCH (n) DETACH DELETE n", write=True)
         else:
             # Only clear Users and their relationships in Neo4j
             # This preserves Venue nodes if they exist, but removes all User activity
-            with driver.session() as session:
-                session.run("MATCH (u:User) DETACH DELETE u")
+            run_query("debug_reset_users", "MATCH (u:User) DETACH DELETE u", write=True)
             
+        from app.cache import invalidate_all_profiles
+        from app.trending import clear_counters
+        invalidate_all_profiles()
+        clear_counters()
+
+        if clear_venues:
+            from app.catalog import catalog
+            from app.search import invalidate_venue_index
+            from app.maptiles import invalidate_cluster_index
+            catalog.load()
+            invalidate_venue_index()
+            invalidate_cluster_index()
+
         return {"status": "reset_complete", "venues_cleared": clear_venues}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/debug/traces")
+async def debug_traces(limit: int = 20):
+    """Most recent request traces handled by this process"""
+    from app.tracing import recent_traces
+    return {"traces": recent_traces(limit)}
+
+@app.get("/debug/traces/{trace_id}")
+async def debug_trace(trace_id: str):
+    """
+    One trace as a waterfall (spans ordered by start, with depth and offset_ms).
+    Includes worker spans when API and worker share TRACE_FILE.
+    """
+    from app.tracing import get_trace
+    spans = get_trace(trace_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return {"trace_id": trace_id, "spans": spans}
+
+@app.get("/debug/loop-lag")
+async def debug_loop_lag(top: int = 20):
+    """Event-loop lag histogram and the code sites that blocked the loop longest"""
+    from app.loopwatch import watchdog
+    return watchdog.report(top)
+
+@app.get("/debug/slow-queries")
+async def debug_slow_queries(name: str = None, limit: int = 5):
+    """Sampled PROFILE results (db hits per operator) of slow Cypher queries, by query name"""
+    from app.querylog import get_slow_query_profiles
+    return {"queries": get_slow_query_profiles(name, limit)}
+
+@app.get("/debug/profiles")
+async def debug_profiles():
+    """Stored request profiles, newest first"""
+    from app.profiling import list_profiles
+    return {"profiles": list_profiles()}
+
+@app.get("/debug/profiles/{name}")
+async def debug_profile(name: str):
+    """Download one profile (.collapsed text or .pstats)"""
+    from fastapi.responses import FileResponse
+    from app.profiling import profile_path
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=name)
+
 class ClearActivityRequest(BaseModel):
     user_id: str
 
@@ -77,33 +249,38 @@ async def clear_user_activity(req: ClearActivityRequest):
     Supports both video-level (WATCHED) and legacy venue-level (ENGAGED_WITH).
     Useful for testing how watch time affects recommendations.
     """
-    from app.graph import driver, clear_user_video_activity
+    from app.graph import run_query
+    from app.cache import invalidate_profile
+    from app.trending import backfill_venue_counters
 
     try:
-        with driver.session() as session:
-            # Remove all WATCHED relationships (video-level)
-            session.run("""
-                MATCH (u:User {id: $user_id})-[r:WATCHED]->()
-                DELETE r
-            """, user_id=req.user_id)
-
-            # Remove all ENGAGED_WITH relationships (legacy venue-level)
-            session.run("""
-                MATCH (u:User {id: $user_id})-[r:ENGAGED_WITH]->()
-                DELETE r
-            """, user_id=req.user_id)
-
-            # Remove all SHARED_WITH and RECEIVED_SHARE relationships
-            session.run("""
-                MATCH (u:User {id: $user_id})-[r:SHARED_WITH]->()
-                DELETE r
-            """, user_id=req.user_id)
-
-            session.run("""
-                MATCH ()-[r:RECEIVED_SHARE]->(v:Venue)
-                WHERE r.from = $user_id
-                DELETE r
-            """, user_id=req.user_id)
+        # Remove all WATCHED relationships (video-level)
+        run_query("clear_activity_watched", """
+            MATCH (u:User {id: $user_id})-[r:WATCHED]->()
+            DELETE r
+        """, write=True, user_id=req.user_id)
+
+        # Remove all ENGAGED_WITH relationships (legacy venue-level)
+        run_query("clear_activity_engaged", """
+            MATCH (u:User {id: $user_id})-[r:ENGAGED_WITH]->()
+            DELETE r
+        """, write=True, user_id=req.user_id)
+
+        # Remove all SHARED_WITH and RECEIVED_SHARE relationships
+        run_query("clear_activity_shared", """
+            MATCH (u:User {id: $user_id})-[r:SHARED_WITH]->()
+            DELETE r
+        """, write=True, user_id=req.user_id)
+
+        run_query("clear_activity_received_shares", """
+            MATCH ()-[r:RECEIVED_SHARE]->(v:Venue)
+            WHERE r.from = $user_id
+            DELETE r
+        """, write=True, user_id=req.user_id)
+
+        invalidate_profile(req.user_id)
+        # Trending buckets can't drop one person, so rebuild them from the remaining edges
+        backfill_venue_counters()
 
         return {"status": "activity_cleared", "user_id": req.user_id}
     except Exception as e:
@@ -118,7 +295,7 @@ async def debug_create_user(request: CreateUserRequest = Body(...)):
     """
     Create a new random user. Optional interests list.
     """
-    from app.graph import driver
+    from app.graph import run_query
     from faker import Faker
     import uuid
     import random
@@ -133,126 +310,122 @@ async def debug_create_user(request: CreateUserRequest = Body(...)):
         interests = random.sample(possible_interests, random.randint(2, 5))
     
     try:
-        with driver.session() as session:
-            session.run("CREATE (:User {id: $id, name: $name, interests: $interests})", id=user_id, name=name, interests=interests)
+        run_query(
+            "create_user",
+            "CREATE (:User {id: $id, name: $name, name_lower: toLower($name), interests: $interests})",
+            write=True, id=user_id, name=name, interests=interests
+        )
         return {"id": user_id, "name": name, "interests": interests}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/user/{user_id}")
-async def get_user_profile(user_id: str):
+async def get_user_profile(user_id: str, limit: int = Query(50, ge=1, le=200), cursor: str = None, fields: str = None):
     """
     Enhanced user profile with VIDEO watch history and engagement details.
+    The first page is cached per user and invalidated on the user's engagement
+    or friendship writes. cursor: `next_cursor` from a previous page of history.
+    fields: comma-separated keys to keep in each history item's `video` object.
     """
-    from app.graph import driver, get_user_video_history
-    from app.vector import client
+    from app.graph import get_user_profile_data
+    from app.vector import get_video_payloads
+    from app.cache import get_cached_profile, set_cached_profile
+
+    video_fields = _parse_fields(fields)
+
+    def respond(profile: dict):
+        if video_fields is not None:
+            for item in profile["watch_history"]:
+                if "video" in item:
+                    item["video"] = _project(item["video"], video_fields, keep=("video_id",))
+        return ORJSONResponse(profile)
+
+    before = _decode_history_cursor(cursor) if cursor else None
+
+    cacheable = cursor is None and limit == 50
+    if cacheable:
+        cached = get_cached_profile(user_id)
+        if cached:
+            return respond(cached)
+    cacheable = cacheable and video_fields is None
 
     try:
-        with driver.session() as session:
-            # Get User & Interests
-            user_result = session.run("""
-                MATCH (u:User {id: $id})
-                RETURN u.name as name, u.interests as interests, u.archetype as archetype
-            """, id=user_id).single()
-
-            if not user_result:
-                raise HTTPException(status_code=404, detail="User not found")
-
-            user_data = {
-                "id": user_id,
-                "name": user_result["name"],
-                "interests": user_result["interests"] or [],
-                "archetype": user_result.get("archetype", "Unknown")
-            }
+        # Graph read and payload enrichment run in worker threads, off the event loop
+        data = await asyncio.to_thread(get_user_profile_data, user_id, limit, before)
+        if not data:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        user_data = {
+            "id": user_id,
+            "name": data["name"],
+            "interests": data["interests"] or [],
+            "archetype": data["archetype"] or "Unknown"
+        }
 
-            # Get Friends (use DISTINCT to avoid duplicates from bidirectional relationships)
-            friends_result = session.run("""
-                MATCH (u:User {id: $id})-[:FRIENDS_WITH]-(f:User)
-                RETURN DISTINCT f.id as id, f.name as name, f.interests as interests
-                ORDER BY f.name
-            """, id=user_id)
-            friends = [{"id": r["id"], "name": r["name"], "interests": r["interests"]} for r in friends_result]
-
-            # Get VIDEO Watch History (using new WATCHED relationships)
-            video_history = get_user_video_history(user_id, limit=50)
-
-            # Enrich video history with video details from Qdrant
-            if video_history:
-                video_ids = []
-                video_id_to_point_id = {}
-
-                for item in video_history:
-                    try:
-                        # Extract numeric ID from video_id (e.g., "video_123" -> 123)
-                        vid = item["video_id"]
-                        pid = int(vid.split("_")[1])
-                        video_ids.append(pid)
-                        video_id_to_point_id[vid] = pid
-                    except:
-                        pass
-
-                if video_ids:
-                    # Retrieve video data from Qdrant
-                    points = client.retrieve(
-                        collection_name="videos",
-                        ids=video_ids,
-                        with_payload=True
-                    )
-
-                    point_map = {p.id: p.payload for p in points}
-
-                    for item in video_history:
-                        pid = video_id_to_point_id.get(item["video_id"])
-                        if pid is not None and pid in point_map:
-                            video_data = point_map[pid]
-                            item["video"] = {
-                                "video_id": video_data.get("video_id"),
-                                "title": video_data.get("title"),
-                                "description": video_data.get("description"),
-                                "video_type": video_data.get("video_type"),
-                                "categories": video_data.get("categories"),
-                                "gradient": video_data.get("gradient"),
-                                "venue_id": video_data.get("venue_id"),
-                                "venue_name": video_data.get("venue_name"),
-                                "neighborhood": video_data.get("neighborhood"),
-                                "location": video_data.get("location")
-                            }
-
-            return {
-                "user": user_data,
-                "friends": friends,
-                "watch_history": video_history  # Now contains video data
-            }
+        video_history = data["watch_history"]
+
+        # Enrich video history with video details (payload cache, Qdrant on miss)
+        if video_history:
+            point_map = await asyncio.to_thread(
+                get_video_payloads,
+                [item["video_id"] for item in video_history],
+                sorted(video_fields) if video_fields is not None else None
+            )
+
+            for item in video_history:
+                video_data = point_map.get(item["video_id"])
+                if video_data:
+                    item["video"] = {
+                        "video_id": video_data.get("video_id"),
+                        "title": video_data.get("title"),
+                        "description": video_data.get("description"),
+                        "video_type": video_data.get("video_type"),
+                        "categories": video_data.get("categories"),
+                        "gradient": video_data.get("gradient"),
+                        "venue_id": video_data.get("venue_id"),
+                        "venue_name": video_data.get("venue_name"),
+                        "neighborhood": video_data.get("neighborhood"),
+                        "location": video_data.get("location")
+                    }
+
+        profile = {
+            "user": user_data,
+            "friends": data["friends"],
+            "watch_history": video_history,  # Now contains video data
+            "next_cursor": (
+                _encode_cursor([video_history[-1]["timestamp"], video_history[-1]["video_id"]])
+                if video_history and len(video_history) == limit else None
+            )
+        }
 
+        if cacheable:
+            set_cached_profile(user_id, profile)
+
+        return respond(profile)
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/users")
-async def get_all_users(current_user_id: str = None):
+async def get_all_users(current_user_id: str = None, search: str = None, limit: int = 100, cursor: str = None):
     """
-    Get all users for friend discovery.
+    Get users for friend discovery, one page at a time (ordered by name).
+    search: name prefix. cursor: `next_cursor` from the previous page.
     If current_user_id is provided, marks which users are already friends.
     """
-    from app.graph import get_all_users, driver
-
-    try:
-        all_users = get_all_users()
-
-        # If current_user_id provided, mark existing friends
-        if current_user_id:
-            with driver.session() as session:
-                friends_result = session.run("""
-                    MATCH (u:User {id: $id})-[:FRIENDS_WITH]-(f:User)
-                    RETURN f.id as friend_id
-                """, id=current_user_id)
+    from app.graph import get_all_users
 
-                friend_ids = set([r["friend_id"] for r in friends_result])
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    after = _decode_cursor(cursor) if cursor else None
 
-                for user in all_users:
-                    user["is_friend"] = user["id"] in friend_ids
-                    user["is_self"] = user["id"] == current_user_id
+    try:
+        users = get_all_users(limit=limit, after=after, search=search, current_user_id=current_user_id)
+        next_cursor = _encode_cursor([users[-1]["name"], users[-1]["id"]]) if len(users) == limit else None
 
-        return {"users": all_users}
+        return {"users": users, "next_cursor": next_cursor}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -277,199 +450,204 @@ async def add_friend(req: AddFriendRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/venues")
-async def get_venues(search: str = None):
+async def get_venues(search: str = None, limit: int = 1000, offset: int = 0):
     """
-    Get all venues, optionally filtered by search term.
+    Get venues, optionally filtered by search term.
+    Search uses an in-process inverted index over name/category/description:
+    every term prefix-matches, results are ranked by field, and paged with limit/offset.
     """
-    from app.vector import client
-    
+    from app.search import get_venue_index
+
     try:
-        # Fetch all (limit 1000 for MVP)
-        points, _ = client.scroll(
-            collection_name="venues",
-            limit=1000,
-            with_payload=True
-        )
-        
-        venues = [
-            {
-                "venue_id": p.payload.get("venue_id"),
-                "name": p.payload.get("name"),
-                "category": p.payload.get("category"),
-                "description": p.payload.get("description"),
-                "location": p.payload.get("location")
-            }
-            for p in points
-        ]
-        
+        index = get_venue_index()
         if search:
-            search_lower = search.lower()
-            venues = [
-                v for v in venues 
-                if search_lower in v["name"].lower() or 
-                   search_lower in v["category"].lower() or
-                   search_lower in v["description"].lower()
-            ]
-            
-        return {"venues": venues}
+            venues, total = index.search(search, limit=limit, offset=offset)
+        else:
+            venues, total = index.all(limit=limit, offset=offset)
+
+        return {"venues": venues, "total": total}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Sample videos rarely change, so one page of the largest allowed size is cached
+# briefly and smaller limits are sliced from it
+VENUES_WITH_VIDEOS_TTL = 300
+VENUES_WITH_VIDEOS_MAX = 100
+_venues_with_videos_cache = None
+
 @app.get("/venues-with-videos")
-async def get_venues_with_videos(limit: int = 20):
+async def get_venues_with_videos(limit: int = Query(20, ge=1, le=VENUES_WITH_VIDEOS_MAX), refresh: bool = False):
     """
     Get venues along with their sample videos for user onboarding.
     Each venue includes 1-2 sample videos for engagement.
+    Results are cached for a few minutes; pass refresh=true to bypass.
     """
+    global _venues_with_videos_cache
     from app.vector import client
-    from app.graph import driver
+    from app.graph import get_sample_videos_for_venues
+    import time
+
+    cached = _venues_with_videos_cache
+    if cached and not refresh and time.time() - cached[0] < VENUES_WITH_VIDEOS_TTL:
+        return {"venues": cached[1][:limit]}
 
     try:
         # Fetch venues from Qdrant
-        points, _ = client.scroll(
-            collection_name="venues",
-            limit=limit,
-            with_payload=True
-        )
+        with span("qdrant.scroll", collection="venues"):
+            points, _ = client.scroll(
+                collection_name="venues",
+                limit=VENUES_WITH_VIDEOS_MAX,
+                with_payload=True
+            )
 
-        venues_data = []
-
-        with driver.session() as session:
-            for p in points:
-                venue_id = p.payload.get("venue_id")
-
-                # Get videos for this venue from Neo4j
-                videos_result = session.run("""
-                    MATCH (venue:Venue {id: $venue_id})-[:POSTED]->(video:Video)
-                    RETURN video.id as id, video.title as title, video.description as description
-                    LIMIT 2
-                """, venue_id=venue_id)
-
-                videos = [{"id": r["id"], "title": r["title"], "description": r["description"]}
-                          for r in videos_result]
-
-                venues_data.append({
-                    "venue_id": venue_id,
-                    "name": p.payload.get("name"),
-                    "category": p.payload.get("category"),
-                    "description": p.payload.get("description"),
-                    "location": p.payload.get("location"),
-                    "videos": videos
-                })
+        # Sample videos for the whole page in one query
+        venue_ids = [p.payload.get("venue_id") for p in points]
+        sample_videos = get_sample_videos_for_venues(venue_ids, per_venue=2)
+
+        venues_data = [
+            {
+                "venue_id": p.payload.get("venue_id"),
+                "name": p.payload.get("name"),
+                "category": p.payload.get("category"),
+                "description": p.payload.get("description"),
+                "location": p.payload.get("location"),
+                "videos": sample_videos.get(p.payload.get("venue_id"), [])
+            }
+            for p in points
+        ]
 
-        return {"venues": venues_data}
+        _venues_with_videos_cache = (time.time(), venues_data)
+        return {"venues": venues_data[:limit]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _parse_fields(fields: str) -> set | None:
+    """Parse a comma-separated `fields=` projection; None means everything"""
+    if not fields:
+        return None
+    return {f.strip() for f in fields.split(",") if f.strip()}
+
+def _project(item: dict, fields: set | None, keep: tuple = ()) -> dict:
+    """Keep only the requested top-level keys (plus identifiers in `keep`)"""
+    if fields is None:
+        return item
+    return {k: v for k, v in item.items() if k in fields or k in keep}
+
+def _encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def _decode_cursor(cursor: str) -> list:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+_CYPHER_DATETIME = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2}(\.\d{1,9})?)?(Z|[+-]\d{2}:\d{2})?(\[[\w/+-]+\])?")
+
+def _decode_history_cursor(cursor: str) -> list:
+    """[timestamp, video_id] of the last history item on the previous page"""
+    values = _decode_cursor(cursor)
+    if not (
+        isinstance(values, list) and len(values) == 2
+        and all(isinstance(v, str) for v in values)
+        and _CYPHER_DATETIME.fullmatch(values[0])
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def _build_businesses(rows: list[dict]) -> list[dict]:
+    """
+    Shape aggregated venue rows into business records.
+    Missing category/description is filled from Qdrant with one batched scroll for the page.
+    """
+    from app.vector import client
+    from qdrant_client import models as qmodels
+
+    incomplete_ids = [r["venue_id"] for r in rows if not r["category"] or not r["description"]]
+    qdrant_payloads = {}
+    if incomplete_ids:
+        try:
+            with span("qdrant.scroll", collection="venues", venues=len(incomplete_ids)):
+                points, _ = client.scroll(
+                    collection_name="venues",
+                    scroll_filter=qmodels.Filter(must=[
+                        qmodels.FieldCondition(key="venue_id", match=qmodels.MatchAny(any=incomplete_ids))
+                    ]),
+                    limit=len(incomplete_ids),
+                    with_payload=["venue_id", "category", "description"]
+                )
+            qdrant_payloads = {p.payload.get("venue_id"): p.payload for p in points}
+        except Exception:
+            pass  # If Qdrant doesn't have these venues, just use Neo4j data
+
+    businesses = []
+    for r in rows:
+        qdrant_payload = qdrant_payloads.get(r["venue_id"], {})
+        businesses.append({
+            "venue_id": r["venue_id"],
+            "name": r["name"],
+            "category": r["category"] or qdrant_payload.get("category"),
+            "description": r["description"] or qdrant_payload.get("description"),
+            "location": r["location"],
+            "address": r["address"],
+            "neighborhood": r["neighborhood"],
+            "price_tier": r["price_tier"],
+            "total_videos": r["total_videos"],
+            "videos": r["videos"]
+        })
+    return businesses
+
+def _business_cursor(business: dict) -> list:
+    return [business["total_videos"], business["name"] or "", business["venue_id"]]
+
 @app.get("/businesses")
-async def get_all_businesses():
+async def get_all_businesses(limit: int = None, cursor: str = None, sort: str = "videos", stream: bool = False, fields: str = None):
     """
-    Get all venues/businesses with complete information and all their videos.
+    Get venues/businesses with complete information and all their videos.
     Includes engagement stats for each video.
     Uses Neo4j as source of truth for venues to ensure all venues are included.
+
+    sort: "videos" (most active first) or "name".
+    limit/cursor: keyset pagination; pass back `next_cursor` to get the next page. `total` counts all venues, not the page.
+    stream: emit every business from the cursor onwards as NDJSON, fetched in pages of `limit` (default 100).
+    fields: comma-separated business keys to return; leaving out `videos` skips the video aggregation.
     """
-    from app.vector import client
-    from app.graph import driver
+    from app.graph import get_businesses_page, count_venues, BUSINESS_SORTS
+    import orjson
 
-    try:
-        businesses = []
-
-        with driver.session() as session:
-            # Get all venues from Neo4j (source of truth)
-            venues_result = session.run("""
-                MATCH (venue:Venue)
-                RETURN venue.id as venue_id,
-                       venue.name as name,
-                       venue.category as category,
-                       venue.description as description,
-                       venue.location as location,
-                       venue.address as address,
-                       venue.neighborhood as neighborhood,
-                       venue.price_tier as price_tier
-                ORDER BY venue.name
-            """)
-
-            for venue_record in venues_result:
-                venue_id = venue_record["venue_id"]
-
-                # Get all videos and engagement stats for this venue
-                videos_result = session.run("""
-                    MATCH (venue:Venue {id: $venue_id})-[:POSTED]->(video:Video)
-                    OPTIONAL MATCH (video)<-[r:WATCHED]-(u:User)
-                    WITH video,
-                         COUNT(DISTINCT u) as total_views,
-                         COUNT(DISTINCT CASE WHEN r.action = 'saved' THEN u END) as saves,
-                         COUNT(DISTINCT CASE WHEN r.action = 'shared' THEN u END) as shares,
-                         SUM(CASE WHEN r.watch_time >= 10 THEN 1 ELSE 0 END) as quality_views
-                    RETURN video.id as id,
-                           video.title as title,
-                           video.description as description,
-                           video.video_type as video_type,
-                           video.categories as categories,
-                           video.created_at as created_at,
-                           total_views, saves, shares, quality_views
-                    ORDER BY video.created_at DESC
-                """, venue_id=venue_id)
-
-                videos = []
-                for r in videos_result:
-                    videos.append({
-                        "id": r["id"],
-                        "title": r["title"],
-                        "description": r["description"],
-                        "video_type": r["video_type"],
-                        "categories": r["categories"] or [],
-                        "created_at": r["created_at"],
-                        "engagement": {
-                            "total_views": r["total_views"] or 0,
-                            "saves": r["saves"] or 0,
-                            "shares": r["shares"] or 0,
-                            "quality_views": r["quality_views"] or 0
-                        }
-                    })
-
-                # Try to get additional metadata from Qdrant if available
-                try:
-                    qdrant_data = client.scroll(
-                        collection_name="venues",
-                        scroll_filter={
-                            "must": [
-                                {
-                                    "key": "venue_id",
-                                    "match": {"value": venue_id}
-                                }
-                            ]
-                        },
-                        limit=1,
-                        with_payload=True
-                    )
-                    if qdrant_data[0]:
-                        qdrant_payload = qdrant_data[0][0].payload
-                        # Enhance with Qdrant data if Neo4j data is missing
-                        if not venue_record["category"] and qdrant_payload.get("category"):
-                            venue_record["category"] = qdrant_payload.get("category")
-                        if not venue_record["description"] and qdrant_payload.get("description"):
-                            venue_record["description"] = qdrant_payload.get("description")
-                except:
-                    pass  # If Qdrant doesn't have this venue, just use Neo4j data
-
-                businesses.append({
-                    "venue_id": venue_id,
-                    "name": venue_record["name"],
-                    "category": venue_record["category"],
-                    "description": venue_record["description"],
-                    "location": venue_record["location"],
-                    "address": venue_record["address"],
-                    "neighborhood": venue_record["neighborhood"],
-                    "price_tier": venue_record["price_tier"],
-                    "total_videos": len(videos),
-                    "videos": videos
-                })
+    business_fields = _parse_fields(fields)
+    include_videos = business_fields is None or "videos" in business_fields
+
+    if sort not in BUSINESS_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {list(BUSINESS_SORTS)}")
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+
+    cursor_values = _decode_cursor(cursor) if cursor else None
+
+    if stream:
+        page_size = limit or 100
+
+        def generate():
+            page_cursor = cursor_values
+            while True:
+                page = _build_businesses(get_businesses_page(page_size, sort, page_cursor, include_videos))
+                for business in page:
+                    yield orjson.dumps(_project(business, business_fields, keep=("venue_id",)), default=str) + b"\n"
+                if len(page) < page_size:
+                    break
+                page_cursor = _business_cursor(page[-1])
 
-        # Sort by total videos (most active first)
-        businesses.sort(key=lambda x: x["total_videos"], reverse=True)
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
 
-        return {"businesses": businesses, "total": len(businesses)}
+    try:
+        businesses = _build_businesses(get_businesses_page(limit, sort, cursor_values, include_videos))
+        next_cursor = None
+        if limit and len(businesses) == limit:
+            next_cursor = _encode_cursor(_business_cursor(businesses[-1]))
+
+        businesses = [_project(b, business_fields, keep=("venue_id",)) for b in businesses]
+        return {"businesses": businesses, "total": count_venues(), "next_cursor": next_cursor}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -479,16 +657,17 @@ async def get_map_data():
     Fetch all venues and users for visualization.
     """
     from app.vector import client
-    from app.graph import driver
-    
+    from app.graph import run_query
+
     # Fetch Venues from Qdrant
     try:
         # Scroll through all points
-        points, _ = client.scroll(
-            collection_name="venues",
-            limit=100,
-            with_payload=True
-        )
+        with span("qdrant.scroll", collection="venues"):
+            points, _ = client.scroll(
+                collection_name="venues",
+                limit=100,
+                with_payload=True
+            )
         venues = [
             {
                 "venue_id": p.payload.get("venue_id"),
@@ -500,29 +679,49 @@ async def get_map_data():
             for p in points
         ]
     except Exception as e:
-        print(f"Error fetching venues: {e}")
+        logger.exception("Error fetching venues: %s", e)
         venues = []
         
     # Fetch Users from Neo4j (filter out null names)
     users = []
     try:
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (u:User)
-                WHERE u.name IS NOT NULL
-                RETURN u.id as id, u.name as name
-                ORDER BY u.name
-                LIMIT 100
-            """)
-            users = [{"id": r["id"], "name": r["name"]} for r in result]
+        result = run_query("map_data_users", """
+            MATCH (u:User)
+            WHERE u.name IS NOT NULL
+            RETURN u.id as id, u.name as name
+            ORDER BY u.name
+            LIMIT 100
+        """)
+        users = [{"id": r["id"], "name": r["name"]} for r in result]
     except Exception as e:
-        print(f"Error fetching users: {e}")
+        logger.exception("Error fetching users: %s", e)
         
     return {"venues": venues, "users": users}
 
+@app.get("/map/tiles")
+async def get_map_tiles(min_lat: float, min_lon: float, max_lat: float, max_lon: float, zoom: int):
+    """
+    Clustered venue points for a map viewport.
+    Clusters are precomputed per zoom level (~32px grid cells) from an in-memory index,
+    so the payload depends on the viewport size rather than the number of venues.
+    """
+    from app.maptiles import get_cluster_index
+
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+
+    try:
+        index = get_cluster_index()
+        clusters = index.query(min_lat, min_lon, max_lat, max_lon, zoom)
+        return {"zoom": zoom, "clusters": clusters, "total_venues": index.venue_count}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/ingest/interaction")
 async def ingest_interaction(interaction: Interaction):
     """Legacy endpoint for backwards compatibility"""
+    from app.worker import process_interaction
+
     process_interaction.delay(
         interaction.user_id,
         interaction.venue_id,
@@ -655,12 +854,27 @@ async def social_connect(connection: Connection):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Payload keys each /feed-video item field is built from; ranking always needs FEED_RANKING_PAYLOAD
+FEED_FIELD_PAYLOAD = {
+    "name": ["venue_name"],
+    "title": ["title"],
+    "description": ["description"],
+    "video_type": ["video_type"],
+    "categories": ["categories"],
+    "neighborhood": ["neighborhood"],
+    "price_tier": ["price_tier"],
+    "gradient": ["gradient"],
+    "location": ["location"],
+}
+FEED_RANKING_PAYLOAD = ["video_id", "venue_id", "location", "categories", "created_at"]
+
 @app.get("/feed-video")
-async def get_video_feed(user_id: str, lat: float, lon: float, radius_km: float = 2.0, limit: int = 20):
+async def get_video_feed(user_id: str, lat: float, lon: float, radius_km: float = 2.0, limit: int = 20, fields: str = None):
     """
     Video-centric feed with full algorithm transparency.
     Returns videos (not venues) ranked by multi-factor algorithm.
     Filters out seen videos and deduplicates (max 1 video per venue per batch).
+    fields: comma-separated item keys to return (video_id and venue_id are always included).
     """
     from app.vector import get_user_vector
     from app.graph import get_social_scores_for_videos, get_seen_videos
@@ -678,38 +892,50 @@ async def get_video_feed(user_id: str, lat: float, lon: float, radius_km: float
     from app.vector import client
     from qdrant_client.models import PointIdsList, Filter, FieldCondition, MatchValue
 
-    search_results = client.query_points(
-        collection_name="videos",
-        query=user_vector,
-        limit=limit * 4,  # Fetch extra to account for seen videos and deduplication
-        with_payload=True
-    ).points
+    from app.vector import get_video_payloads, get_video_payloads_by_point
+
+    # Ids and scores only; payloads are joined from the in-process catalog
+    with span("qdrant.query_points", collection="videos", limit=limit * 4):
+        search_results = client.query_points(
+            collection_name="videos",
+            query=user_vector,
+            limit=limit * 4,  # Fetch extra to account for seen videos and deduplication
+            with_payload=False
+        ).points
+    item_fields = _parse_fields(fields)
+    payload_fields = None
+    if item_fields is not None:
+        payload_fields = sorted(set(FEED_RANKING_PAYLOAD).union(*(FEED_FIELD_PAYLOAD.get(f, []) for f in item_fields)))
+    search_payloads = get_video_payloads_by_point([result.id for result in search_results], payload_fields)
 
     # 4. Filter out seen videos and build candidates
     candidates = []
     candidate_video_ids = set()
 
     for result in search_results:
-        video_id = result.payload.get("video_id")
+        payload = search_payloads.get(result.id)
+        if payload is None:
+            continue
+        video_id = payload.get("video_id")
         if video_id not in seen_video_ids_set:
             # Check proximity
-            venue_lat = result.payload.get("location", {}).get("lat", lat)
-            venue_lon = result.payload.get("location", {}).get("lon", lon)
+            venue_lat = payload.get("location", {}).get("lat", lat)
+            venue_lon = payload.get("location", {}).get("lon", lon)
             distance_km = haversine_distance(lat, lon, venue_lat, venue_lon)
 
             if distance_km <= radius_km:
                 candidates.append({
                     "video_id": video_id,
-                    "venue_id": result.payload.get("venue_id"),
+                    "venue_id": payload.get("venue_id"),
                     "score": result.score,
-                    "payload": result.payload,
+                    "payload": payload,
                     "distance_km": distance_km
                 })
                 candidate_video_ids.add(video_id)
 
     # 4b. Inject friend-engaged videos (social proof boost)
     # Query for videos that friends have engaged with but aren't in candidates yet
-    from app.graph import driver
+    from app.graph import run_query
     friend_video_query = """
     MATCH (u:User {id: $user_id})-[:FRIENDS_WITH]-(friend)-[r:WATCHED]->(vid:Video)
     WHERE r.watch_time >= 10 OR r.action IN ['saved', 'shared']
@@ -719,39 +945,32 @@ async def get_video_feed(user_id: str, lat: float, lon: float, radius_km: float
     LIMIT 50
     """
 
-    with driver.session() as session:
-        result = session.run(friend_video_query, user_id=user_id)
-        all_friend_videos = [record["video_id"] for record in result]
-        friend_video_ids = [vid for vid in all_friend_videos if vid not in candidate_video_ids and vid not in seen_video_ids_set]
+    result = run_query("feed_friend_videos", friend_video_query, user_id=user_id)
+    all_friend_videos = [record["video_id"] for record in result]
+    friend_video_ids = [vid for vid in all_friend_videos if vid not in candidate_video_ids and vid not in seen_video_ids_set]
 
-    # Fetch friend-engaged videos from Qdrant and add to candidates
+    # Look up friend-engaged videos in the catalog and add to candidates
     if friend_video_ids:
         try:
-            point_ids = [int(vid.split("_")[1]) for vid in friend_video_ids]
-            friend_videos = client.retrieve(
-                collection_name="videos",
-                ids=point_ids,
-                with_payload=True
-            )
+            friend_videos = get_video_payloads(friend_video_ids, payload_fields)
 
-            for point in friend_videos:
-                video_id = point.payload.get("video_id")
+            for video_id, payload in friend_videos.items():
                 if video_id and video_id not in candidate_video_ids:
-                    venue_lat = point.payload.get("location", {}).get("lat", lat)
-                    venue_lon = point.payload.get("location", {}).get("lon", lon)
+                    venue_lat = payload.get("location", {}).get("lat", lat)
+                    venue_lon = payload.get("location", {}).get("lon", lon)
                     distance_km = haversine_distance(lat, lon, venue_lat, venue_lon)
 
                     if distance_km <= radius_km * 1.5:  # Slightly larger radius for friend content
                         candidates.append({
                             "video_id": video_id,
-                            "venue_id": point.payload.get("venue_id"),
+                            "venue_id": payload.get("venue_id"),
                             "score": 0.5,  # Default taste score for friend-injected content
-                            "payload": point.payload,
+                            "payload": payload,
                             "distance_km": distance_km
                         })
                         candidate_video_ids.add(video_id)
         except Exception as e:
-            print(f"Failed to inject friend videos: {e}")
+            logger.warning("Failed to inject friend videos: %s", e)
 
     if not candidates:
         return {"feed": []}
@@ -760,6 +979,14 @@ async def get_video_feed(user_id: str, lat: float, lon: float, radius_km: float
     video_ids = [c["video_id"] for c in candidates]
     social_scores = get_social_scores_for_videos(video_ids, user_id)
 
+    # 5b. Engagement velocity (decayed saves/shares/views, one batched read)
+    from app.trending import get_video_velocity
+    try:
+        video_velocity = get_video_velocity(video_ids)
+    except Exception as e:
+        logger.warning("Video velocity unavailable: %s", e)
+        video_velocity = {}
+
     # 6. Calculate freshness/trending scores
     def calculate_video_freshness(created_at_str: str) -> float:
         """Calculate freshness score based on video age"""
@@ -800,16 +1027,19 @@ async def get_video_feed(user_id: str, lat: float, lon: float, radius_km: float
         # Proximity
         proximity_score = max(0, 1.0 - (distance_km / (radius_km * 2)))
 
-        # Freshness/Trending
+        # Freshness/Trending: half recency, half engagement velocity (saturates around 10 weight-units)
         created_at = payload.get("created_at", "")
         freshness_score = calculate_video_freshness(created_at)
+        velocity = video_velocity.get(video_id, 0.0)
+        velocity_score = 1.0 - math.exp(-velocity / 10.0)
+        trending_score = 0.5 * freshness_score + 0.5 * velocity_score
 
         # Final weighted score
         final_score = (
             taste_score * 0.30 +
             social_norm * 0.40 +
             proximity_score * 0.20 +
-            freshness_score * 0.10
+            trending_score * 0.10
         )
 
         # Build explanation
@@ -830,8 +1060,10 @@ async def get_video_feed(user_id: str, lat: float, lon: float, radius_km: float
                 "reason": f"{round(distance_km, 1)}km away (~{int(distance_km * 12)} min walk)"
             },
             "trending": {
-                "score": round(freshness_score, 2),
-                "reason": f"Posted {payload.get('created_at', 'recently')[:10]}"
+                "score": round(trending_score, 2),
+                "freshness": round(freshness_score, 2),
+                "velocity": round(velocity, 2),
+                "reason": f"Posted {payload.get('created_at', 'recently')[:10]}" + (", gaining engagement fast" if velocity_score >= 0.5 else "")
             }
         }
 
@@ -879,7 +1111,10 @@ async def get_video_feed(user_id: str, lat: float, lon: float, radius_km: float
     deduped_feed.sort(key=lambda x: x["final_score"], reverse=True)
     deduped_feed = deduped_feed[:limit]
 
-    return {"feed": deduped_feed}
+    if item_fields is not None:
+        deduped_feed = [_project(item, item_fields, keep=("video_id", "venue_id")) for item in deduped_feed]
+
+    return ORJSONResponse({"feed": deduped_feed})
 
 def haversine_distance(lat1, lon1, lat2, lon2):
     """Calculate distance in km between two lat/lon points"""
@@ -1025,57 +1260,56 @@ async def get_user_bookings(user_id: str):
     """
     Get all bookings for a user.
     """
-    from app.graph import driver
+    from app.graph import run_query
 
     try:
-        with driver.session() as session:
-            bookings_result = session.run("""
-                MATCH (u:User {id: $user_id})-[b:BOOKED]->(venue:Venue)
-                OPTIONAL MATCH (u)-[w:WATCHED {booking_id: b.booking_id}]->(video:Video)
-                RETURN b.booking_id as booking_id,
-                       b.party_size as party_size,
-                       b.booking_datetime as booking_datetime,
-                       b.occasion as occasion,
-                       b.special_requests as special_requests,
-                       b.status as status,
-                       b.created_at as created_at,
-                       venue.id as venue_id,
-                       venue.name as venue_name,
-                       venue.category as venue_category,
-                       venue.neighborhood as neighborhood,
-                       video.id as video_id,
-                       video.title as video_title
-                ORDER BY b.booking_datetime DESC
-            """, user_id=user_id)
-
-            bookings = []
-            for record in bookings_result:
-                booking = {
-                    "booking_id": record["booking_id"],
-                    "confirmation_number": record["booking_id"][-8:].upper(),
-                    "party_size": record["party_size"],
-                    "booking_datetime": record["booking_datetime"].isoformat() if record["booking_datetime"] else None,
-                    "occasion": record["occasion"],
-                    "special_requests": record["special_requests"],
-                    "status": record["status"],
-                    "created_at": record["created_at"].isoformat() if record["created_at"] else None,
-                    "venue": {
-                        "id": record["venue_id"],
-                        "name": record["venue_name"],
-                        "category": record["venue_category"],
-                        "neighborhood": record.get("neighborhood")
-                    },
-                    "video": {
-                        "id": record["video_id"],
-                        "title": record["video_title"]
-                    } if record["video_id"] else None
-                }
-                bookings.append(booking)
-
-            return {"bookings": bookings}
+        bookings_result = run_query("get_user_bookings", """
+            MATCH (u:User {id: $user_id})-[b:BOOKED]->(venue:Venue)
+            OPTIONAL MATCH (u)-[w:WATCHED {booking_id: b.booking_id}]->(video:Video)
+            RETURN b.booking_id as booking_id,
+                   b.party_size as party_size,
+                   b.booking_datetime as booking_datetime,
+                   b.occasion as occasion,
+                   b.special_requests as special_requests,
+                   b.status as status,
+                   b.created_at as created_at,
+                   venue.id as venue_id,
+                   venue.name as venue_name,
+                   venue.category as venue_category,
+                   venue.neighborhood as neighborhood,
+                   video.id as video_id,
+                   video.title as video_title
+            ORDER BY b.booking_datetime DESC
+        """, user_id=user_id)
+
+        bookings = []
+        for record in bookings_result:
+            booking = {
+                "booking_id": record["booking_id"],
+                "confirmation_number": record["booking_id"][-8:].upper(),
+                "party_size": record["party_size"],
+                "booking_datetime": record["booking_datetime"].isoformat() if record["booking_datetime"] else None,
+                "occasion": record["occasion"],
+                "special_requests": record["special_requests"],
+                "status": record["status"],
+                "created_at": record["created_at"].isoformat() if record["created_at"] else None,
+                "venue": {
+                    "id": record["venue_id"],
+                    "name": record["venue_name"],
+                    "category": record["venue_category"],
+                    "neighborhood": record.get("neighborhood")
+                },
+                "video": {
+                    "id": record["video_id"],
+                    "title": record["video_title"]
+                } if record["video_id"] else None
+            }
+            bookings.append(booking)
+
+        return {"bookings": bookings}
 
     except Exception as e:
-        print(f"Failed to fetch bookings: {e}")
+        logger.exception("Failed to fetch bookings: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1088,80 +1322,189 @@ class BookingRequest(BaseModel):
     video_id: str
 
 class ConfirmBookingRequest(BaseModel):
-    state: dict
+    booking_id: str
+    alternative: Optional[str] = None  # datetime of one of the offered alternatives
+
+def _booking_response(state: dict) -> dict:
+    """What the booking UI needs; the rest of the agent state stays server-side"""
+    return {
+        "booking_id": state.get("booking_id"),
+        "step": state.get("step"),
+        "logs": state.get("logs", []),
+        "booking_proposal": state.get("booking_proposal"),
+        "booking_confirmation": state.get("booking_confirmation")
+    }
+
+async def _initial_booking_state(user_id: str, video_id: str) -> dict:
+    """Look up the video's venue context and build the agent's starting state (404 if unknown)"""
+    from app.graph import run_query
+    from app.agent import new_booking_id
+
+    def fetch_video_context():
+        records = run_query("booking_video_context", """
+            MATCH (v:Video {id: $video_id})<-[:POSTED]-(venue:Venue)
+            RETURN v.title as title,
+                   v.description as description,
+                   v.video_type as video_type,
+                   v.categories as categories,
+                   venue.id as venue_id,
+                   venue.name as venue_name
+        """, video_id=video_id)
+        return records[0] if records else None
+
+    # Get video and venue info
+    result = await asyncio.to_thread(fetch_video_context)
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Video or venue not found")
+
+    venue_info = {
+        "venue_id": result["venue_id"],
+        "venue_name": result["venue_name"],
+        "title": result["title"],
+        "description": result["description"],
+        "video_type": result["video_type"],
+        "categories": result["categories"] or []
+    }
+
+    return {
+        "booking_id": new_booking_id(),
+        "video_id": video_id,
+        "user_id": user_id,
+        "venue_info": venue_info,
+        "booking_intent": None,
+        "availability_check": None,
+        "booking_proposal": None,
+        "booking_confirmation": None,
+        "step": "start",
+        "logs": ["🚀 Starting booking agent..."]
+    }
 
 @app.post("/agent/book")
 async def initiate_booking(request: BookingRequest):
     """Trigger booking agent workflow"""
-    from app.graph import driver
-    
-    # Get video and venue info
-    try:
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (v:Video {id: $video_id})<-[:POSTED]-(venue:Venue)
-                RETURN v.title as title, 
-                       v.description as description, 
-                       v.video_type as video_type, 
-                       v.categories as categories,
-                       venue.id as venue_id,
-                       venue.name as venue_name
-            """, video_id=request.video_id).single()
-            
-            if not result:
-                raise HTTPException(status_code=404, detail="Video or venue not found")
-                
-            venue_info = {
-                "venue_id": result["venue_id"],
-                "venue_name": result["venue_name"],
-                "title": result["title"],
-                "description": result["description"],
-                "video_type": result["video_type"],
-                "categories": result["categories"] or []
-            }
+    from app.agent import get_booking_agent, booking_config, start_booking_session
 
-        # Run agent
-        # Initialize state
-        initial_state = {
-            "video_id": request.video_id,
-            "user_id": request.user_id,
-            "venue_info": venue_info,
-            "booking_intent": None,
-            "availability_check": None,
-            "booking_proposal": None,
-            "booking_confirmation": None,
-            "step": "start",
-            "logs": ["🚀 Starting booking agent..."]
-        }
-        
-        # Invoke agent
-        print(f"DEBUG: Invoking agent with state: {initial_state}")
-        final_state = booking_agent.invoke(initial_state)
-        print(f"DEBUG: Agent final state keys: {final_state.keys()}")
-        print(f"DEBUG: Logs present: {'logs' in final_state} (Count: {len(final_state.get('logs', []))})")
+    try:
+        initial_state = await _initial_booking_state(request.user_id, request.video_id)
+
+        # Invoke agent; it pauses before confirm_booking, checkpointed under booking_id
+        logger.debug("Invoking agent with state: %s", initial_state)
+        agent = await get_booking_agent()
+        await start_booking_session(initial_state["booking_id"])
+        final_state = await agent.ainvoke(initial_state, booking_config(initial_state["booking_id"]))
+        logger.debug("Agent final state keys: %s", final_state.keys())
+        logger.debug("Logs present: %s (Count: %s)", 'logs' in final_state, len(final_state.get('logs', [])))
         if "booking_proposal" in final_state:
-            print(f"DEBUG: Final proposal: {final_state['booking_proposal']}")
+            logger.debug("Final proposal: %s", final_state['booking_proposal'])
         else:
-            print("DEBUG: No booking_proposal in final state!")
+            logger.warning("No booking_proposal in final state!")
 
-        return final_state
+        return _booking_response(final_state)
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Booking agent error: {e}")
+        logger.exception("Booking agent error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/agent/book/stream")
+async def stream_booking(user_id: str, video_id: str):
+    """
+    Same as POST /agent/book, streamed as Server-Sent Events:
+    - `start`: booking_id and the first log line, sent before the agent runs
+    - `node`: after each agent step, the state fields it changed plus its new log lines
+    - `done`: the same body /agent/book returns
+    - `failed`: {"detail": ...} if the agent errors mid-run
+    """
+    import orjson
+    from app.agent import get_booking_agent, booking_config, start_booking_session
+
+    initial_state = await _initial_booking_state(user_id, video_id)
+    booking_id = initial_state["booking_id"]
+
+    def sse(event: str, data: dict) -> bytes:
+        return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data, default=str) + b"\n\n"
+
+    async def generate():
+        state = dict(initial_state)
+        sent_logs = len(state["logs"])
+        yield sse("start", {"booking_id": booking_id, "logs": state["logs"]})
+
+        try:
+            agent = await get_booking_agent()
+            await start_booking_session(booking_id)
+            async for chunk in agent.astream(initial_state, booking_config(booking_id), stream_mode="updates"):
+                for node, update in chunk.items():
+                    if node.startswith("__") or not update:
+                        continue  # e.g. the interrupt marker before confirm_booking
+                    logs = update.get("logs", [])
+                    changed = {k: v for k, v in update.items() if k != "logs" and state.get(k) != v}
+                    state.update(update)
+                    yield sse("node", {"node": node, "update": changed, "logs": logs[sent_logs:]})
+                    sent_logs = len(logs) or sent_logs
+        except Exception as e:
+            logger.exception("Booking agent error: %s", e)
+            yield sse("failed", {"detail": str(e)})
+            return
+
+        yield sse("done", _booking_response(state))
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/agent/confirm-booking")
 async def confirm_booking_action(request: ConfirmBookingRequest):
-    """User confirmed the booking"""
+    """
+    User confirmed the booking (or picked one of the offered alternatives).
+    Resumes the checkpointed agent run for booking_id; the proposal is never taken from the client.
+    Only one confirm per booking_id runs (the first claims it in Redis); others get 409.
+    """
+    from app.agent import get_booking_agent, booking_config, choose_alternative, claim_confirmation, release_confirmation
+
     try:
-        # Continue agent workflow from confirmation step
-        # Since our graph ends at confirm_booking, we can just call the function directly
-        # or re-invoke the graph if we had persistence. 
-        # For this POC, we'll just call the confirm_booking node function directly
-        # as the state is passed back from frontend.
-        
-        result = confirm_booking(request.state)
-        return result
+        claimed = claim_confirmation(request.booking_id)
+    except Exception as e:
+        logger.warning("Booking confirmation claim failed: %s", e)
+        raise HTTPException(status_code=503, detail="Booking service temporarily unavailable")
+    if not claimed:
+        raise HTTPException(status_code=409, detail="Booking is already being confirmed")
+
+    completed = False
+    try:
+        agent = await get_booking_agent()
+        config = booking_config(request.booking_id)
+        snapshot = await agent.aget_state(config)
+
+        if not snapshot.values:
+            raise HTTPException(status_code=404, detail="Booking session not found")
+        if "confirm_booking" not in snapshot.next:
+            raise HTTPException(status_code=409, detail="Booking session is not awaiting confirmation")
+
+        if request.alternative:
+            try:
+                proposal = choose_alternative(snapshot.values, request.alternative)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            await agent.aupdate_state(config, {"booking_proposal": proposal})
+        elif snapshot.values["booking_proposal"]["status"] != "ready_to_book":
+            raise HTTPException(status_code=400, detail="Choose one of the offered alternatives")
+
+        final_state = await agent.ainvoke(None, config)
+        completed = True
+        return _booking_response(final_state)
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Confirmation error: {e}")
+        logger.exception("Confirmation error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # A confirm that didn't run the agent to the end (bad alternative, error) leaves the session resumable
+        if not completed:
+            try:
+                release_confirmation(request.booking_id)
+            except Exception as e:
+                logger.warning("Releasing booking confirmation claim failed: %s", e)
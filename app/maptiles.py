@@ -0,0 +1,145 @@
+import math
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Grid clustering over Web Mercator tiles: each 256px tile is split into
+# CELLS_PER_TILE x CELLS_PER_TILE cells (~32px), one cluster per occupied cell.
+MIN_ZOOM = 0
+MAX_ZOOM = 18
+CELLS_PER_TILE = 8
+INDEX_TTL = 300
+MAX_LAT = 85.05112878
+
+def _project(lat: float, lon: float) -> tuple[float, float]:
+    """lat/lon -> Web Mercator world coordinates in [0, 1)"""
+    lat = max(min(lat, MAX_LAT), -MAX_LAT)
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(max(x, 0.0), 1.0 - 1e-12), min(max(y, 0.0), 1.0 - 1e-12)
+
+class VenueClusterIndex:
+    """
+    Precomputed grid clusters for every zoom level.
+    levels[z] maps (cell_x, cell_y) -> [count, lat_sum, lon_sum, venue]
+    where `venue` is kept only while the cell holds a single venue.
+    """
+
+    def __init__(self):
+        self.levels = []
+        self.venue_count = 0
+        self.built_at = 0.0
+
+    def build(self, venues: list[dict]):
+        levels = [{} for _ in range(MIN_ZOOM, MAX_ZOOM + 1)]
+        count = 0
+        for venue in venues:
+            location = venue.get("location") or {}
+            lat, lon = location.get("lat"), location.get("lon")
+            if lat is None or lon is None:
+                continue
+            count += 1
+            x, y = _project(lat, lon)
+            for z, cells in enumerate(levels, start=MIN_ZOOM):
+                n = (1 << z) * CELLS_PER_TILE
+                key = (int(x * n), int(y * n))
+                cell = cells.get(key)
+                if cell is None:
+                    cells[key] = [1, lat, lon, venue]
+                else:
+                    cell[0] += 1
+                    cell[1] += lat
+                    cell[2] += lon
+                    cell[3] = None
+
+        self.levels = levels
+        self.venue_count = count
+        self.built_at = time.time()
+
+    def query(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, zoom: int) -> list[dict]:
+        """Clusters whose cell intersects the bounding box at the given zoom"""
+        zoom = max(MIN_ZOOM, min(int(zoom), MAX_ZOOM))
+        cells = self.levels[zoom - MIN_ZOOM] if self.levels else {}
+        n = (1 << zoom) * CELLS_PER_TILE
+
+        x0, y0 = _project(max_lat, min_lon)  # top-left
+        x1, y1 = _project(min_lat, max_lon)  # bottom-right
+        cx0, cy0, cx1, cy1 = int(x0 * n), int(y0 * n), int(x1 * n), int(y1 * n)
+
+        # Walk the viewport's cells, or the occupied cells if that is fewer
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) <= len(cells):
+            keys = ((cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1))
+            hits = ((key, cells[key]) for key in keys if key in cells)
+        else:
+            hits = ((key, cell) for key, cell in cells.items()
+                    if cx0 <= key[0] <= cx1 and cy0 <= key[1] <= cy1)
+
+        clusters = []
+        for (cx, cy), (count, lat_sum, lon_sum, venue) in hits:
+            if count == 1:
+                clusters.append({
+                    "type": "venue",
+                    "count": 1,
+                    "lat": venue["location"]["lat"],
+                    "lon": venue["location"]["lon"],
+                    "venue": venue
+                })
+            else:
+                clusters.append({
+                    "type": "cluster",
+                    "count": count,
+                    "lat": lat_sum / count,
+                    "lon": lon_sum / count,
+                    "cell": f"{zoom}/{cx}/{cy}"
+                })
+        return clusters
+
+_index = VenueClusterIndex()
+_lock = threading.Lock()
+_stale = True
+
+def invalidate_cluster_index():
+    """Mark the cluster index stale; the next tile request starts a rebuild. Call whenever venues change."""
+    global _stale
+    _stale = True
+
+def _rebuild():
+    """Build a fresh index off the request path and swap it in; the lock is held by the caller"""
+    from app.catalog import get_catalog
+
+    global _index, _stale
+    try:
+        index = VenueClusterIndex()
+        index.build(get_catalog().venues.all())
+        _index = index
+    except Exception as e:
+        logger.warning("Rebuilding %s failed: %s", VenueClusterIndex.__name__, e)
+        _stale = True
+    finally:
+        _lock.release()
+
+def get_cluster_index() -> VenueClusterIndex:
+    """
+    The current index. Only the very first call builds it inline; after that a
+    stale or expired index keeps serving while a background thread rebuilds it.
+    """
+    from app.catalog import get_catalog
+
+    global _index, _stale
+    if _index.built_at == 0:
+        with _lock:
+            if _index.built_at == 0:
+                _stale = False
+                index = VenueClusterIndex()
+                index.build(get_catalog().venues.all())
+                _index = index
+        return _index
+
+    if (_stale or time.time() - _index.built_at > INDEX_TTL) and _lock.acquire(blocking=False):
+        # Cleared before building, so an invalidation that lands mid-build triggers another rebuild
+        _stale = False
+        threading.Thread(target=_rebuild, name="cluster-index-rebuild", daemon=True).start()
+    return _index
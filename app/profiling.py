@@ -0,0 +1,136 @@
+"""
+Opt-in per-request profiling.
+
+With PROFILING_ENABLED=1, a request carrying `?_profile=...` or an
+`X-Profile: ...` header runs under a profiler and the result is written to
+PROFILE_DIR, tagged with the route and user:
+
+- `1` / `stacks`: a sampling profiler over every thread (event loop and
+  to_thread workers), saved as collapsed stacks (`*.collapsed`) for
+  flamegraph.pl / speedscope
+- `cprofile`: deterministic cProfile of the event-loop thread, saved as pstats
+  (`*.pstats`, open with `python -m pstats` or snakeviz)
+
+Only one request is profiled at a time; other requests asking for a profile
+run normally. Concurrent requests on the same worker show up in the profile
+too, so profile against an otherwise idle instance when possible.
+"""
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", 0.002))
+
+MODES = {"1": "stacks", "stacks": "stacks", "cprofile": "cprofile"}
+
+_busy = threading.Lock()
+
+def requested_mode(query_params, headers) -> str | None:
+    """Profiling mode asked for by the request, or None (also None while profiling is disabled)"""
+    if not PROFILING_ENABLED:
+        return None
+    return MODES.get(query_params.get("_profile") or headers.get("x-profile") or "")
+
+class StackSampler:
+    """Samples every thread's stack on a timer and counts identical collapsed stacks"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.counts[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+class RequestProfile:
+    """Context for one profiled request: start(), then finish(route, user_id) -> saved file name"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.profiler = cProfile.Profile() if mode == "cprofile" else StackSampler()
+
+    def start(self):
+        if self.mode == "cprofile":
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+
+    def finish(self, route: str, user_id: str = None) -> str:
+        if self.mode == "cprofile":
+            self.profiler.disable()
+        else:
+            self.profiler.stop()
+
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-") or "root"
+        # user_id comes from the request; keep it from escaping PROFILE_DIR
+        user = re.sub(r"[^A-Za-z0-9_-]", "_", user_id) if user_id else "anonymous"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_{slug}_{user}"
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        if self.mode == "cprofile":
+            name += ".pstats"
+            self.profiler.dump_stats(os.path.join(PROFILE_DIR, name))
+        else:
+            name += ".collapsed"
+            with open(os.path.join(PROFILE_DIR, name), "w") as f:
+                f.write(self.profiler.collapsed())
+        return name
+
+def try_start(mode: str) -> RequestProfile | None:
+    """Start profiling unless another request is already being profiled"""
+    if not _busy.acquire(blocking=False):
+        return None
+    profile = RequestProfile(mode)
+    try:
+        profile.start()
+    except Exception:
+        _busy.release()
+        raise
+    return profile
+
+def finish(profile: RequestProfile, route: str, user_id: str = None) -> str:
+    try:
+        return profile.finish(route, user_id)
+    finally:
+        _busy.release()
+
+def list_profiles() -> list[str]:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    return sorted(os.listdir(PROFILE_DIR), reverse=True)
+
+def profile_path(name: str) -> str | None:
+    """Path of a stored profile, or None (names are never allowed to leave PROFILE_DIR)"""
+    path = os.path.join(PROFILE_DIR, os.path.basename(name))
+    return path if os.path.isfile(path) else None
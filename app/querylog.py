@@ -0,0 +1,115 @@
+"""
+Slow Cypher query log.
+
+graph.run_query() times every named query and hands it here. Runs slower
+than SLOW_QUERY_MS are logged with their (summarized) parameters. A
+SLOW_QUERY_PROFILE_RATE fraction of slow *read* queries is re-run under
+PROFILE on a background thread; the per-operator db hits are kept in Redis
+(last PROFILES_PER_QUERY per query name) and served by /debug/slow-queries,
+so plan regressions show up as the graph grows.
+"""
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 250))
+SLOW_QUERY_PROFILE_RATE = float(os.getenv("SLOW_QUERY_PROFILE_RATE", 0.1))
+PROFILES_PER_QUERY = 20
+
+# One profiling query at a time, off the request path
+_profiler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-profiler")
+
+def _names_key() -> str:
+    return "slow_query:names"
+
+def _profiles_key(query_name: str) -> str:
+    return f"slow_query:{query_name}"
+
+def summarize_params(params: dict) -> dict:
+    """Parameters for logging: long lists are cut down to their length and first few items"""
+    summary = {}
+    for key, value in params.items():
+        if isinstance(value, (list, tuple)) and len(value) > 5:
+            summary[key] = {"len": len(value), "head": list(value[:5])}
+        else:
+            summary[key] = value
+    return summary
+
+def flatten_plan(plan: dict, depth: int = 0) -> list[dict]:
+    """PROFILE plan tree -> operators in pre-order with their db hits and rows"""
+    if not plan:
+        return []
+    operators = [{
+        "operator": plan.get("operatorType"),
+        "db_hits": plan.get("dbHits", 0),
+        "rows": plan.get("rows", 0),
+        "details": (plan.get("args") or {}).get("Details"),
+        "depth": depth
+    }]
+    for child in plan.get("children") or []:
+        operators.extend(flatten_plan(child, depth + 1))
+    return operators
+
+def record_query(query_name: str, query: str, params: dict, elapsed_ms: float, summary=None, write: bool = False):
+    if elapsed_ms < SLOW_QUERY_MS:
+        return
+
+    server_ms = None
+    if summary is not None and summary.result_available_after is not None:
+        server_ms = summary.result_available_after + (summary.result_consumed_after or 0)
+
+    logger.warning("Slow query %s: %.1fms", query_name, elapsed_ms, extra={
+        "query_name": query_name,
+        "duration_ms": round(elapsed_ms, 1),
+        "server_ms": server_ms,
+        "params": summarize_params(params)
+    })
+
+    if not write and random.random() < SLOW_QUERY_PROFILE_RATE:
+        _profiler.submit(_profile_query, query_name, query, params, elapsed_ms)
+
+def _profile_query(query_name: str, query: str, params: dict, elapsed_ms: float):
+    from app.graph import driver
+    from app.cache import get_redis_client
+
+    try:
+        with driver.session() as session:
+            summary = session.run("PROFILE " + query, **params).consume()
+        operators = flatten_plan(summary.profile)
+        entry = {
+            "ts": time.time(),
+            "duration_ms": round(elapsed_ms, 1),
+            "params": summarize_params(params),
+            "total_db_hits": sum(op["db_hits"] or 0 for op in operators),
+            "operators": operators
+        }
+
+        r = get_redis_client()
+        pipe = r.pipeline()
+        pipe.sadd(_names_key(), query_name)
+        pipe.lpush(_profiles_key(query_name), json.dumps(entry, default=str))
+        pipe.ltrim(_profiles_key(query_name), 0, PROFILES_PER_QUERY - 1)
+        pipe.execute()
+        logger.info("Profiled slow query %s: %s db hits", query_name, entry["total_db_hits"])
+    except Exception as e:
+        logger.warning("Failed to profile query %s: %s", query_name, e)
+
+def get_slow_query_profiles(query_name: str = None, limit: int = 5) -> dict[str, list[dict]]:
+    """Most recent stored profiles per query name (newest first)"""
+    from app.cache import get_redis_client
+
+    r = get_redis_client()
+    names = [query_name] if query_name else sorted(r.smembers(_names_key()))
+    pipe = r.pipeline()
+    for name in names:
+        pipe.lrange(_profiles_key(name), 0, limit - 1)
+    return {
+        name: [json.loads(entry) for entry in entries]
+        for name, entries in zip(names, pipe.execute())
+        if entries
+    }
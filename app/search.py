@@ -0,0 +1,133 @@
+import re
+import time
+import logging
+import threading
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# Field weights for ranking: a name hit beats a category hit beats a description hit
+FIELD_WEIGHTS = {"name": 3.0, "category": 2.0, "description": 1.0}
+PREFIX_FACTOR = 0.5  # prefix-only token matches count half as much as whole-token matches
+INDEX_TTL = 300
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+class VenueSearchIndex:
+    """
+    In-process inverted index over venue name/category/description.
+    Tokens are kept sorted so prefix lookups are a bisect plus a range scan,
+    and a query only ever touches postings of matching tokens.
+    """
+
+    def __init__(self):
+        self.docs = {}        # venue_id -> venue dict
+        self.postings = {}    # token -> {venue_id: field weight}
+        self.vocabulary = []  # sorted tokens
+        self.built_at = 0.0
+
+    def build(self, venues: list[dict]):
+        docs = {}
+        postings = {}
+        for venue in venues:
+            venue_id = venue["venue_id"]
+            docs[venue_id] = venue
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in set(tokenize(venue.get(field))):
+                    entry = postings.setdefault(token, {})
+                    entry[venue_id] = max(entry.get(venue_id, 0.0), weight)
+
+        self.docs = docs
+        self.postings = postings
+        self.vocabulary = sorted(postings)
+        self.built_at = time.time()
+
+    def _match_term(self, term: str) -> dict[str, float]:
+        """Score every venue containing a token that starts with `term`"""
+        scores = {}
+        i = bisect_left(self.vocabulary, term)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+            token = self.vocabulary[i]
+            factor = 1.0 if token == term else PREFIX_FACTOR
+            for venue_id, weight in self.postings[token].items():
+                scores[venue_id] = max(scores.get(venue_id, 0.0), weight * factor)
+            i += 1
+        return scores
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> tuple[list[dict], int]:
+        """
+        Every query term must prefix-match some token of the venue.
+        Returns (page of venues with `search_score`, total matches).
+        """
+        terms = tokenize(query)
+        if not terms:
+            return [], 0
+
+        # Start from the rarest term so intersections stay small
+        term_scores = sorted((self._match_term(t) for t in terms), key=len)
+        scores = dict(term_scores[0])
+        for other in term_scores[1:]:
+            scores = {vid: s + other[vid] for vid, s in scores.items() if vid in other}
+            if not scores:
+                return [], 0
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.docs[item[0]].get("name") or ""))
+        page = [
+            {**self.docs[venue_id], "search_score": round(score, 2)}
+            for venue_id, score in ranked[offset:offset + limit]
+        ]
+        return page, len(ranked)
+
+    def all(self, limit: int = 20, offset: int = 0) -> tuple[list[dict], int]:
+        venues = list(self.docs.values())
+        return venues[offset:offset + limit], len(venues)
+
+_index = VenueSearchIndex()
+_lock = threading.Lock()
+_stale = True
+
+def invalidate_venue_index():
+    """Mark the index stale; the next search starts a rebuild. Call whenever venues change."""
+    global _stale
+    _stale = True
+
+def _rebuild():
+    """Build a fresh index off the request path and swap it in; the lock is held by the caller"""
+    from app.catalog import get_catalog
+
+    global _index, _stale
+    try:
+        index = VenueSearchIndex()
+        index.build(get_catalog().venues.all())
+        _index = index
+    except Exception as e:
+        logger.warning("Rebuilding %s failed: %s", VenueSearchIndex.__name__, e)
+        _stale = True
+    finally:
+        _lock.release()
+
+def get_venue_index() -> VenueSearchIndex:
+    """
+    The current index. Only the very first call builds it inline; after that a
+    stale or expired index keeps serving while a background thread rebuilds it.
+    """
+    from app.catalog import get_catalog
+
+    global _index, _stale
+    if _index.built_at == 0:
+        with _lock:
+            if _index.built_at == 0:
+                _stale = False
+                index = VenueSearchIndex()
+                index.build(get_catalog().venues.all())
+                _index = index
+        return _index
+
+    if (_stale or time.time() - _index.built_at > INDEX_TTL) and _lock.acquire(blocking=False):
+        # Cleared before building, so an invalidation that lands mid-build triggers another rebuild
+        _stale = False
+        threading.Thread(target=_rebuild, name="venue-index-rebuild", daemon=True).start()
+    return _index
@@ -0,0 +1,181 @@
+"""
+Lightweight tracing for the API and the Celery worker.
+
+Spans nest through a contextvar, so anything called inside a span (including
+asyncio.to_thread work) becomes its child. Context crosses into Celery tasks
+as a W3C-style `traceparent` message header (see app/worker.py).
+
+Finished spans go to an in-memory ring buffer (served by /debug/traces) and,
+if TRACE_FILE is set, are appended as JSON lines by a background thread.
+Point the API and the worker at the same file (docker-compose mounts the repo
+into both) to see the whole waterfall of a request, worker included.
+"""
+import contextvars
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+TRACE_FILE = os.getenv("TRACE_FILE")
+TRACE_BUFFER_SPANS = int(os.getenv("TRACE_BUFFER_SPANS", 10000))
+
+_current = contextvars.ContextVar("current_span", default=None)
+_recent = deque(maxlen=TRACE_BUFFER_SPANS)
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attrs", "start", "duration_ms", "status", "_t0")
+
+    def __init__(self, name: str, trace_id: str = None, parent_id: str = None, attrs: dict = None):
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs or {}
+        self.start = time.time()
+        self.duration_ms = None
+        self.status = "ok"
+        self._t0 = time.perf_counter()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attrs": self.attrs
+        }
+
+def current_span() -> Span | None:
+    return _current.get()
+
+def inject() -> dict:
+    """Headers carrying the current trace into another process"""
+    parent = _current.get()
+    if parent is None:
+        return {}
+    return {"traceparent": f"00-{parent.trace_id}-{parent.span_id}-01"}
+
+def _parse_traceparent(traceparent: str | None) -> tuple[str | None, str | None]:
+    try:
+        _, trace_id, span_id, _ = traceparent.split("-")
+        return trace_id, span_id
+    except (AttributeError, ValueError):
+        return None, None
+
+def start_span(name: str, traceparent: str = None, **attrs) -> Span:
+    """
+    Start a span as a child of the current span (or of `traceparent`, for work
+    continued from another process; otherwise it starts a new trace).
+    It isn't made current; see activate(). End it with finish_span().
+    """
+    parent = _current.get()
+    if traceparent:
+        trace_id, parent_id = _parse_traceparent(traceparent)
+    elif parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_id = None, None
+    return Span(name, trace_id, parent_id, attrs)
+
+def finish_span(s: Span, error: BaseException = None):
+    """Record the span's duration (and `error`, if any) and export it"""
+    if error is not None:
+        s.status = "error"
+        s.attrs["error"] = repr(error)
+    s.duration_ms = round((time.perf_counter() - s._t0) * 1000, 3)
+    _export(s)
+
+@contextmanager
+def activate(s: Span):
+    """Make `s` the current span for the enclosed block, without ending it"""
+    token = _current.set(s)
+    try:
+        yield s
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def span(name: str, traceparent: str = None, **attrs):
+    """Time the enclosed block as a span; parenting as in start_span()"""
+    s = start_span(name, traceparent, **attrs)
+    error = None
+    try:
+        with activate(s):
+            yield s
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        finish_span(s, error)
+
+# --- Exporters ---
+
+_file_queue = queue.SimpleQueue()
+_writer = None
+_writer_lock = threading.Lock()
+
+def _write_spans():
+    with open(TRACE_FILE, "a", buffering=1) as f:
+        while True:
+            f.write(json.dumps(_file_queue.get(), default=str) + "\n")
+
+def _export(s: Span):
+    global _writer
+    record = s.to_dict()
+    _recent.append(record)
+    if TRACE_FILE:
+        if _writer is None:
+            with _writer_lock:
+                if _writer is None:
+                    _writer = threading.Thread(target=_write_spans, name="trace-writer", daemon=True)
+                    _writer.start()
+        _file_queue.put(record)
+
+def _file_spans(trace_id: str = None) -> list[dict]:
+    if not TRACE_FILE or not os.path.exists(TRACE_FILE):
+        return []
+    spans = []
+    with open(TRACE_FILE) as f:
+        for line in f:
+            if trace_id and trace_id not in line:
+                continue
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+def recent_traces(limit: int = 20) -> list[dict]:
+    """Most recent root spans in this process, newest first"""
+    roots = [s for s in reversed(_recent) if s["parent_id"] is None]
+    return roots[:limit]
+
+def get_trace(trace_id: str) -> list[dict]:
+    """
+    All known spans of one trace as a waterfall: ordered by start time, with
+    depth and offset_ms (from the trace's first span) for rendering.
+    """
+    spans = {s["span_id"]: s for s in _file_spans(trace_id) if s["trace_id"] == trace_id}
+    spans.update({s["span_id"]: s for s in list(_recent) if s["trace_id"] == trace_id})
+    if not spans:
+        return []
+
+    ordered = sorted(spans.values(), key=lambda s: s["start"])
+    t0 = ordered[0]["start"]
+    depths = {}
+    waterfall = []
+    for s in ordered:
+        depth = depths.get(s["parent_id"], -1) + 1 if s["parent_id"] in spans else 0
+        depths[s["span_id"]] = depth
+        waterfall.append({**s, "depth": depth, "offset_ms": round((s["start"] - t0) * 1000, 3)})
+    return waterfall
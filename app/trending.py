@@ -0,0 +1,128 @@
+import os
+import math
+import time
+from app.cache import r
+
+# Venue trending counts distinct people: one HyperLogLog of user ids per venue and hour.
+# A PFCOUNT over a window's buckets counts each person once, however often they engaged,
+# which is also what the graph holds (one ENGAGED_WITH edge per user and venue).
+# Buckets older than a week expire on their own.
+BUCKET_SECONDS = 3600
+RETENTION_HOURS = 24 * 7
+
+# Video velocity is an exponentially decayed sum of engagement weights
+VIDEO_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 6))
+VIDEO_DECAY_RATE = math.log(2) / (VIDEO_HALF_LIFE_HOURS * 3600)
+VIDEO_SCORE_KEY = "trending:video:score"
+VIDEO_TS_KEY = "trending:video:ts"
+
+# Decay the stored score to `now`, add the new weight, store both atomically
+_decayed_add = r.register_script("""
+local now = tonumber(ARGV[1])
+local weight = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local score = tonumber(redis.call('HGET', KEYS[1], ARGV[4]) or '0')
+local last = tonumber(redis.call('HGET', KEYS[2], ARGV[4]) or ARGV[1])
+score = score * math.exp(-rate * math.max(now - last, 0)) + weight
+redis.call('HSET', KEYS[1], ARGV[4], tostring(score))
+redis.call('HSET', KEYS[2], ARGV[4], ARGV[1])
+return tostring(score)
+""")
+
+def _bucket(ts: float) -> int:
+    return int(ts // BUCKET_SECONDS)
+
+def _venue_bucket_key(venue_id: str, bucket: int) -> str:
+    return f"trending:venue:{venue_id}:{bucket}"
+
+def record_venue_engagement(venue_id: str, user_id: str, ts: float = None):
+    """
+    Add the user to the venue's current hour bucket.
+    Called on every ENGAGED_WITH write so reads never touch the graph.
+    """
+    key = _venue_bucket_key(venue_id, _bucket(ts if ts is not None else time.time()))
+    pipe = r.pipeline(transaction=False)
+    pipe.pfadd(key, user_id)
+    pipe.expire(key, (RETENTION_HOURS + 1) * BUCKET_SECONDS)
+    pipe.execute()
+
+def get_venue_engager_counts(venue_ids: list[str], hours: int = 24) -> dict[str, int]:
+    """
+    Distinct people who engaged with each venue in the last `hours` hour buckets
+    (current partial hour included). One pipelined round-trip regardless of the number of venues.
+    """
+    if not venue_ids:
+        return {}
+
+    hours = max(1, min(hours, RETENTION_HOURS))
+    current = _bucket(time.time())
+    buckets = range(current - hours + 1, current + 1)
+
+    pipe = r.pipeline(transaction=False)
+    for venue_id in venue_ids:
+        pipe.pfcount(*[_venue_bucket_key(venue_id, bucket) for bucket in buckets])
+    return {venue_id: int(count) for venue_id, count in zip(venue_ids, pipe.execute())}
+
+def clear_counters():
+    """Drop every venue bucket and video score (e.g. after the graph's activity is wiped)"""
+    keys = list(r.scan_iter(match="trending:*", count=1000))
+    for start in range(0, len(keys), 1000):
+        r.delete(*keys[start:start + 1000])
+
+def backfill_venue_counters(hours: int = RETENTION_HOURS) -> int:
+    """
+    Rebuild the venue buckets from ENGAGED_WITH timestamps in Neo4j, replacing what's there.
+    Run by warm-up (the seeders write edges directly) and after activity is cleared.
+    Returns the number of (venue, hour) buckets written.
+    """
+    from app.graph import run_query
+
+    query = """
+    MATCH (u:User)-[r:ENGAGED_WITH]->(v:Venue)
+    WHERE r.timestamp > datetime() - duration({hours: $hours})
+    RETURN v.id as venue_id, r.timestamp.epochSeconds / $bucket_seconds as bucket, collect(DISTINCT u.id) as user_ids
+    """
+    rows = run_query("backfill_venue_counters", query, hours=hours, bucket_seconds=BUCKET_SECONDS)
+
+    old_keys = list(r.scan_iter(match="trending:venue:*", count=1000))
+    pipe = r.pipeline(transaction=True)
+    for start in range(0, len(old_keys), 1000):
+        pipe.delete(*old_keys[start:start + 1000])
+    for row in rows:
+        key = _venue_bucket_key(row["venue_id"], row["bucket"])
+        pipe.pfadd(key, *row["user_ids"])
+        pipe.expire(key, (RETENTION_HOURS + 1) * BUCKET_SECONDS)
+    pipe.execute()
+
+    return len(rows)
+
+def record_video_engagement(video_id: str, weight: float, ts: float = None) -> float:
+    """
+    Fold one WATCHED write into the video's decayed engagement score in O(1).
+    Skips and other non-positive weights don't count towards velocity.
+    """
+    if weight <= 0:
+        return 0.0
+    now = ts if ts is not None else time.time()
+    return float(_decayed_add(keys=[VIDEO_SCORE_KEY, VIDEO_TS_KEY], args=[now, weight, VIDEO_DECAY_RATE, video_id]))
+
+def get_video_velocity(video_ids: list[str]) -> dict[str, float]:
+    """
+    Read decayed engagement scores for a candidate set in one round-trip.
+    Videos with no recorded engagement are omitted.
+    """
+    if not video_ids:
+        return {}
+
+    pipe = r.pipeline(transaction=False)
+    pipe.hmget(VIDEO_SCORE_KEY, video_ids)
+    pipe.hmget(VIDEO_TS_KEY, video_ids)
+    scores, timestamps = pipe.execute()
+
+    now = time.time()
+    velocity = {}
+    for video_id, score, last in zip(video_ids, scores, timestamps):
+        if score is None or last is None:
+            continue
+        velocity[video_id] = float(score) * math.exp(-VIDEO_DECAY_RATE * max(now - float(last), 0))
+    return velocity
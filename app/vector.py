@@ -1,38 +1,140 @@
 from qdrant_client import QdrantClient, models
 import random
 import os
+import logging
+import threading
+from array import array
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
 
 QDRANT_HOST = os.getenv("QDRANT_HOST", "qdrant")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
 
-client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+_client = None
+_client_lock = threading.Lock()
+
+# Interest vectors preloaded at warm-up (float32, user id -> vector); misses go to Qdrant
+_user_vectors = {}
 
 def get_vector_client():
-    return client
+    """The shared Qdrant client, created on first use rather than at import"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+    return _client
+
+def __getattr__(name):
+    # Keeps `from app.vector import client` working with the lazily created client
+    if name == "client":
+        return get_vector_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def preload_user_vectors(limit: int = 5000) -> int:
+    """Pull up to `limit` user interest vectors into memory; returns how many were loaded"""
+    loaded = {}
+    offset = None
+    while len(loaded) < limit:
+        with span("qdrant.scroll", collection="users"):
+            points, offset = get_vector_client().scroll(
+                collection_name="users",
+                limit=min(256, limit - len(loaded)),
+                offset=offset,
+                with_payload=False,
+                with_vectors=True
+            )
+        for point in points:
+            loaded[f"user_{point.id}"] = array("f", point.vector)
+        if offset is None:
+            break
+    _user_vectors.clear()
+    _user_vectors.update(loaded)
+    return len(loaded)
+
+def get_video_payloads_by_point(point_ids: list, payload_fields: list[str] = None) -> dict:
+    """
+    Get video payloads by Qdrant point id from the in-process catalog,
+    retrieving only the misses from Qdrant (and adding them to the catalog).
+    With payload_fields, misses are fetched with that include-list and not cached.
+    """
+    from app.catalog import get_catalog
+
+    catalog = get_catalog()
+    payloads = {}
+    missing = []
+    for pid in point_ids:
+        payload = catalog.videos.get_by_point(pid)
+        if payload is not None:
+            payloads[pid] = payload
+        else:
+            missing.append(pid)
+
+    if missing:
+        with span("qdrant.retrieve", collection="videos", points=len(missing)):
+            points = get_vector_client().retrieve(collection_name="videos", ids=missing, with_payload=payload_fields or True)
+        for point in points:
+            if not payload_fields:
+                catalog.add_video(point.id, point.payload)
+            payloads[point.id] = point.payload
+
+    return payloads
+
+def get_video_payloads(video_ids: list[str], payload_fields: list[str] = None) -> dict[str, dict]:
+    """
+    Get video payloads by video_id ("video_123") via the catalog.
+    """
+    from app.catalog import get_catalog
+
+    catalog = get_catalog()
+    payloads = {}
+    missing = []
+    for vid in video_ids:
+        payload = catalog.videos.get(vid)
+        if payload is not None:
+            payloads[vid] = payload
+        else:
+            try:
+                missing.append(int(vid.split("_")[1]))  # "video_123" -> 123
+            except (IndexError, ValueError):
+                pass
+
+    if payload_fields and "video_id" not in payload_fields:
+        payload_fields = payload_fields + ["video_id"]
+    for payload in get_video_payloads_by_point(missing, payload_fields).values():
+        payloads[payload.get("video_id")] = payload
+
+    return payloads
 
 def get_user_vector(user_id: str) -> list[float]:
     """
     Retrieve the user's interest vector from Qdrant users collection.
     Falls back to random vector if not found (for backwards compatibility).
     """
+    cached = _user_vectors.get(user_id)
+    if cached is not None:
+        return cached.tolist()
+
     try:
         # Extract user index from user_id (e.g., "user_42" -> 42)
         user_index = int(user_id.split("_")[1])
 
         # Retrieve from Qdrant users collection
-        points = client.retrieve(
-            collection_name="users",
-            ids=[user_index],
-            with_vectors=True
-        )
+        with span("qdrant.retrieve", collection="users"):
+            points = get_vector_client().retrieve(
+                collection_name="users",
+                ids=[user_index],
+                with_vectors=True
+            )
 
         if points and len(points) > 0:
             return points[0].vector
         else:
-            print(f"Warning: User {user_id} not found in Qdrant, using random vector")
+            logger.warning("User %s not found in Qdrant, using random vector", user_id)
             return [random.random() for _ in range(1536)]
     except Exception as e:
-        print(f"Error retrieving user vector: {e}, using random vector")
+        logger.warning("Error retrieving user vector: %s, using random vector", e)
         return [random.random() for _ in range(1536)]
 
 def search_venues(user_vector: list[float], lat: float, lon: float, radius_km: float = 5.0, limit: int = 50) -> list[dict]:
@@ -40,23 +142,24 @@ def search_venues(user_vector: list[float], lat: float, lon: float, radius_km: f
     Search for venues in Qdrant that match the user's vector and are within the radius.
     """
     try:
-        results = client.query_points(
-            collection_name="venues",
-            query=user_vector,
-            query_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="location",
-                        geo_radius=models.GeoRadius(
-                            center=models.GeoPoint(lat=lat, lon=lon),
-                            radius=radius_km * 1000.0 # meters
+        with span("qdrant.query_points", collection="venues", limit=limit):
+            results = get_vector_client().query_points(
+                collection_name="venues",
+                query=user_vector,
+                query_filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="location",
+                            geo_radius=models.GeoRadius(
+                                center=models.GeoPoint(lat=lat, lon=lon),
+                                radius=radius_km * 1000.0 # meters
+                            )
                         )
-                    )
-                ]
-            ),
-            limit=limit,
-            with_payload=True
-        ).points
+                    ]
+                ),
+                limit=limit,
+                with_payload=True
+            ).points
         return [
             {
                 "venue_id": point.payload.get("venue_id"),
@@ -66,5 +169,5 @@ def search_venues(user_vector: list[float], lat: float, lon: float, radius_km: f
             for point in results
         ]
     except Exception as e:
-        print(f"Error searching venues: {e}")
+        logger.exception("Error searching venues: %s", e)
         return []
@@ -0,0 +1,137 @@
+"""
+Startup warm-up and readiness.
+
+Importing the app creates no clients and opens no connections: the Neo4j
+driver, Qdrant client, OpenAI client and booking agent are all built on first
+use. The lifespan handler in app/main.py starts warm_up() in the background
+instead, which creates them and preloads the in-process caches. The process
+is live as soon as it accepts connections; it reports ready once warm-up has
+finished (see /health/live and /health/ready).
+
+Steps marked required are the ones the API can't serve without (Neo4j and the
+catalog and indexes built from it). If one fails, the process stays not
+ready and the failed steps are retried every WARMUP_RETRY_S seconds. A failed
+optional step (a cache or the booking agent) leaves it ready but degraded.
+"""
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+WARMUP_USER_VECTORS = int(os.getenv("WARMUP_USER_VECTORS", 5000))
+WARMUP_RETRY_S = float(os.getenv("WARMUP_RETRY_S", 10))
+
+class Readiness:
+    def __init__(self):
+        self.started_at = time.time()
+        self.ready = False
+        self.status = "starting"  # starting | ready | degraded | not_ready
+        self.failed = []
+        self.steps = {}  # step -> {"status": ..., "ms": ..., "error": ...}
+
+    def to_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "status": self.status,
+            "failed_steps": self.failed,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "steps": self.steps
+        }
+
+readiness = Readiness()
+
+def _ensure_indexes():
+    from app.graph import ensure_indexes
+    ensure_indexes()
+
+def _load_catalog():
+    from app.catalog import catalog
+    catalog.load()
+    return f"{len(catalog.videos)} videos, {len(catalog.venues)} venues"
+
+def _build_indexes():
+    from app.search import get_venue_index
+    from app.maptiles import get_cluster_index
+    get_venue_index()
+    return f"{get_cluster_index().venue_count} venues clustered"
+
+def _load_user_vectors():
+    from app.vector import preload_user_vectors
+    return f"{preload_user_vectors(WARMUP_USER_VECTORS)} user vectors"
+
+def _warm_social_graph():
+    from app.graph import warm_social_graph
+    return f"{warm_social_graph()} friendships"
+
+def _backfill_trending():
+    # The seeders write ENGAGED_WITH edges without touching Redis
+    from app.trending import backfill_venue_counters
+    return f"{backfill_venue_counters()} venue-hour buckets"
+
+async def _prepare_booking_agent():
+    from app.agent import get_booking_agent, get_llm
+    await asyncio.to_thread(get_llm)
+    await get_booking_agent()
+
+# (name, step, required). Blocking steps run in worker threads; order matters only where a step reads the catalog
+STEPS = [
+    ("graph_indexes", _ensure_indexes, True),
+    ("catalog", _load_catalog, True),
+    ("search_and_map_indexes", _build_indexes, True),
+    ("user_vectors", _load_user_vectors, False),
+    ("social_graph", _warm_social_graph, False),
+    ("trending_counters", _backfill_trending, False),
+    ("booking_agent", _prepare_booking_agent, False),
+]
+
+async def _run_step(name: str, step) -> bool:
+    readiness.steps[name] = {"status": "running"}
+    step_start = time.perf_counter()
+    ok = True
+    try:
+        if asyncio.iscoroutinefunction(step):
+            detail = await step()
+        else:
+            detail = await asyncio.to_thread(step)
+        readiness.steps[name] = {"status": "ok", "detail": detail}
+    except Exception as e:
+        logger.warning("Warm-up step %s failed: %s", name, e)
+        readiness.steps[name] = {"status": "failed", "error": str(e)}
+        ok = False
+    readiness.steps[name]["ms"] = round((time.perf_counter() - step_start) * 1000, 1)
+    return ok
+
+def _update_readiness():
+    readiness.failed = [name for name, _, _ in STEPS if readiness.steps.get(name, {}).get("status") == "failed"]
+    required_failed = [name for name, _, required in STEPS if required and name in readiness.failed]
+    readiness.ready = not required_failed
+    if required_failed:
+        readiness.status = "not_ready"
+    elif readiness.failed:
+        readiness.status = "degraded"
+    else:
+        readiness.status = "ready"
+
+async def warm_up():
+    """Run every warm-up step, then retry failed required steps until they all succeed"""
+    start = time.perf_counter()
+    for name, step, _ in STEPS:
+        await _run_step(name, step)
+    _update_readiness()
+    logger.info(
+        "Warm-up finished in %.0fms: %s", (time.perf_counter() - start) * 1000, readiness.status,
+        extra={"steps": readiness.steps, "failed_steps": readiness.failed}
+    )
+
+    # Later required steps may depend on earlier ones, so retry from the first failure onwards
+    while not readiness.ready:
+        await asyncio.sleep(WARMUP_RETRY_S)
+        first_failed = next(i for i, (name, _, required) in enumerate(STEPS) if required and name in readiness.failed)
+        for name, step, required in STEPS[first_failed:]:
+            if required:
+                await _run_step(name, step)
+        _update_readiness()
+        if readiness.ready:
+            logger.info("Warm-up recovered: %s", readiness.status, extra={"failed_steps": readiness.failed})
@@ -1,15 +1,59 @@
 import os
+import logging
 from celery import Celery
+from celery.signals import setup_logging, before_task_publish, task_prerun, task_postrun, task_failure
+from app.logs import configure_logging
+from app.tracing import inject, start_span, finish_span, activate
+
+logger = logging.getLogger(__name__)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
 celery = Celery(__name__, broker=REDIS_URL, backend=REDIS_URL)
 
+@setup_logging.connect
+def _setup_worker_logging(**kwargs):
+    # Use our JSON/queue logging instead of Celery's default handlers
+    configure_logging()
+
+# Tracing: the publisher's span context rides along as a `traceparent` message header,
+# and each task runs inside a span continuing that trace (task_id -> (span, activation))
+_task_spans = {}
+
+@before_task_publish.connect
+def _inject_trace_headers(headers=None, **kwargs):
+    if headers is not None:
+        headers.update(inject())
+
+@task_prerun.connect
+def _start_task_span(task_id=None, task=None, **kwargs):
+    task_span = start_span(f"celery.{task.name}", traceparent=getattr(task.request, "traceparent", None), task_id=task_id)
+    activation = activate(task_span)
+    activation.__enter__()
+    _task_spans[task_id] = (task_span, activation)
+
+@task_failure.connect
+def _fail_task_span(task_id=None, exception=None, **kwargs):
+    # Sent before task_postrun; the task body's exception never reaches the span otherwise
+    entry = _task_spans.get(task_id)
+    if entry is not None:
+        entry[0].set(error=repr(exception))
+        entry[0].status = "error"
+
+@task_postrun.connect
+def _end_task_span(task_id=None, state=None, **kwargs):
+    entry = _task_spans.pop(task_id, None)
+    if entry is not None:
+        task_span, activation = entry
+        activation.__exit__(None, None, None)
+        task_span.set(state=state)
+        finish_span(task_span)
+
 @celery.task
 def process_interaction(user_id: str, venue_id: str, interaction_type: str, duration: int):
     from app.graph import log_interaction_to_graph
     
-    print(f"Processing interaction: {user_id} -> {venue_id} ({interaction_type}, {duration}s)")
+    logger.debug("Processing interaction: %s -> %s (%s, %ss)", user_id, venue_id, interaction_type, duration)
     
     # Calculate weight based on duration/type
     weight = 0.0
@@ -26,9 +70,14 @@ def process_interaction(user_id: str, venue_id: str, interaction_type: str, dura
     # Update Graph
     try:
         log_interaction_to_graph(user_id, venue_id, interaction_type, weight)
-        print(f"Updated graph for {user_id} -> {venue_id}")
+        logger.info("Processed interaction", extra={
+            "user_id": user_id,
+            "venue_id": venue_id,
+            "interaction_type": interaction_type,
+            "weight": weight
+        })
     except Exception as e:
-        print(f"Error updating graph: {e}")
+        logger.exception("Error updating graph: %s", e)
 
     # TODO: Update User Vector in Qdrant (Nudge towards venue category)
     # For MVP, we skip the vector update as we are using random user vectors.
@@ -1,5 +1,6 @@
 import sys
 import os
+import asyncio
 from app.agent import booking_agent
 
 # Add project root to path
@@ -34,7 +35,7 @@ def debug_mock_flow():
     
     print(f"\n🔄 Invoking Agent...")
     try:
-        final_state = booking_agent.invoke(initial_state)
+        final_state = asyncio.run(booking_agent.ainvoke(initial_state))
         
         print("\n📊 Final State Analysis:")
         print(f"   Step: {final_state.get('step')}")
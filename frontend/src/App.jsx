@@ -5,6 +5,7 @@ import Feed from './pages/Feed';
 import CreateUser from './pages/CreateUser';
 import UserProfile from './pages/UserProfile';
 import Businesses from './pages/Businesses';
+import VenueMap from './pages/VenueMap';
 
 function App() {
   return (
@@ -15,6 +16,7 @@ function App() {
           <Route path="create" element={<CreateUser />} />
           <Route path="profiles" element={<UserProfile />} />
           <Route path="businesses" element={<Businesses />} />
+          <Route path="map" element={<VenueMap />} />
           <Route path="*" element={<Navigate to="/" replace />} />
         </Route>
       </Routes>
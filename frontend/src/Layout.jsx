@@ -11,6 +11,7 @@ export default function Layout() {
         { icon: UserPlus, label: 'Create User', path: '/create' },
         { icon: Users, label: 'Profiles', path: '/profiles' },
         { icon: Building2, label: 'Businesses', path: '/businesses' },
+        { icon: MapPin, label: 'Map', path: '/map' },
     ];
 
     return (
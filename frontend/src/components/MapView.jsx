@@ -1,5 +1,5 @@
-import React, { useEffect, useState } from 'react';
-import { MapContainer, TileLayer, Marker, Popup, Circle } from 'react-leaflet';
+import React, { useEffect, useRef, useState } from 'react';
+import { MapContainer, TileLayer, Marker, Popup, Circle, CircleMarker, Tooltip, useMap, useMapEvents } from 'react-leaflet';
 import 'leaflet/dist/leaflet.css';
 import axios from 'axios';
 import L from 'leaflet';
@@ -19,8 +19,68 @@ L.Marker.prototype.options.icon = DefaultIcon;
 
 const NYC_CENTER = [40.7128, -74.0060];
 
-export default function MapView({ venues, users, selectedUserId, onSelectUser, onRefresh }) {
-    // Data is now passed in via props to share state with UserList
+// Venues come from /map/tiles for the visible viewport and zoom: single venues as
+// markers, dense areas as counted clusters that zoom in when clicked
+function useViewportClusters() {
+    const map = useMap();
+    const [clusters, setClusters] = useState([]);
+    const pending = useRef(null);
+
+    const load = async () => {
+        const bounds = map.getBounds();
+        pending.current?.abort();
+        const controller = new AbortController();
+        pending.current = controller;
+        try {
+            const res = await axios.get('http://localhost:8000/map/tiles', {
+                params: {
+                    min_lat: bounds.getSouth(),
+                    min_lon: bounds.getWest(),
+                    max_lat: bounds.getNorth(),
+                    max_lon: bounds.getEast(),
+                    zoom: map.getZoom()
+                },
+                signal: controller.signal
+            });
+            setClusters(res.data.clusters);
+        } catch (e) {
+            if (!axios.isCancel(e)) console.error(e);
+        }
+    };
+
+    useMapEvents({ moveend: load });
+    useEffect(() => {
+        load();
+        return () => pending.current?.abort();
+    }, []);
+
+    return clusters;
+}
+
+function VenueClusters({ renderVenue }) {
+    const map = useMap();
+    const clusters = useViewportClusters();
+
+    return clusters.map(cluster => cluster.type === 'venue' ? (
+        <React.Fragment key={cluster.venue.venue_id}>{renderVenue(cluster.venue)}</React.Fragment>
+    ) : (
+        <CircleMarker
+            key={cluster.cell}
+            center={[cluster.lat, cluster.lon]}
+            radius={Math.min(12 + Math.log2(cluster.count) * 3, 30)}
+            pathOptions={{ color: '#4f46e5', fillColor: '#6366f1', fillOpacity: 0.6 }}
+            eventHandlers={{
+                click: () => map.setView([cluster.lat, cluster.lon], Math.min(map.getZoom() + 2, map.getMaxZoom()))
+            }}
+        >
+            <Tooltip direction="center" permanent className="font-bold">
+                {cluster.count}
+            </Tooltip>
+        </CircleMarker>
+    ));
+}
+
+export default function MapView({ users = [], selectedUserId, onSelectUser, onRefresh }) {
 
     const handleInteraction = async (venueId, type) => {
         if (!selectedUserId) {
@@ -35,7 +95,7 @@ export default function MapView({ venues, users, selectedUserId, onSelectUser, o
                 duration: 60
             });
             alert(`Marked as ${type}!`);
-            onRefresh(); // Refresh to update feed/map
+            onRefresh?.(); // Refresh to update feed/map
         } catch (e) {
             console.error(e);
             alert("Failed to record interaction");
@@ -50,8 +110,8 @@ export default function MapView({ venues, users, selectedUserId, onSelectUser, o
                     attribution='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
                 />
 
-                {venues.map(venue => (
-                    <Marker key={venue.venue_id} position={[venue.location.lat, venue.location.lon]}>
+                <VenueClusters renderVenue={venue => (
+                    <Marker position={[venue.location.lat, venue.location.lon]}>
                         <Popup>
                             <div className="p-2 min-w-[200px]">
                                 <h3 className="font-bold text-lg">{venue.name}</h3>
@@ -81,7 +141,7 @@ export default function MapView({ venues, users, selectedUserId, onSelectUser, o
                             </div>
                         </Popup>
                     </Marker>
-                ))}
+                )} />
 
                 {users.map(user => (
                     <Circle
@@ -145,30 +145,52 @@ export default function ShortVideoFeed({ userId }) {
         }
     };
 
-    const handleWantToGo = async () => {
+    const handleWantToGo = () => {
         const video = venues[currentIndex];
         setIsBookingLoading(true);
-        try {
-            const response = await axios.post('http://localhost:8000/agent/book', {
-                user_id: userId,
-                video_id: video.video_id
-            });
-            console.log("Booking Agent Response:", response.data);
-            setBookingState(response.data);
-        } catch (error) {
-            console.error("Booking failed", error);
-            alert("Failed to start booking. See console.");
-        } finally {
+
+        // Stream agent progress so each step's log shows up as soon as it runs
+        const params = new URLSearchParams({ user_id: userId, video_id: video.video_id });
+        const source = new EventSource(`http://localhost:8000/agent/book/stream?${params}`);
+        const finish = () => {
+            source.close();
             setIsBookingLoading(false);
-        }
+        };
+
+        source.addEventListener('start', (event) => {
+            setBookingState(JSON.parse(event.data));
+        });
+        source.addEventListener('node', (event) => {
+            const { update, logs } = JSON.parse(event.data);
+            setBookingState(prev => ({ ...prev, ...update, logs: [...(prev?.logs || []), ...logs] }));
+        });
+        source.addEventListener('done', (event) => {
+            console.log("Booking Agent Response:", JSON.parse(event.data));
+            setBookingState(JSON.parse(event.data));
+            finish();
+        });
+        source.addEventListener('failed', (event) => {
+            console.error("Booking failed", JSON.parse(event.data));
+            alert("Failed to start booking. See console.");
+            finish();
+        });
+        source.onerror = (error) => {
+            // Connection-level error (e.g. 404 for an unknown video); EventSource would retry forever
+            console.error("Booking stream error", error);
+            setBookingState(null);
+            alert("Failed to start booking. See console.");
+            finish();
+        };
     };
 
-    const confirmBooking = async () => {
+    // `alternative` is the datetime of one of the offered alternatives, when the requested time was taken
+    const confirmBooking = async (alternative = null) => {
         if (!bookingState) return;
 
         try {
             const response = await axios.post('http://localhost:8000/agent/confirm-booking', {
-                state: bookingState
+                booking_id: bookingState.booking_id,
+                ...(alternative && { alternative })
             });
             setBookingState(response.data); // Update with confirmation
         } catch (error) {
@@ -346,7 +368,7 @@ export default function ShortVideoFeed({ userId }) {
                                     </div>
                                 )}
 
-                                {bookingState.booking_proposal && (!bookingState.booking_confirmation || !bookingState.booking_confirmation.status) && (
+                                {bookingState.booking_proposal?.status === 'ready_to_book' && (!bookingState.booking_confirmation || !bookingState.booking_confirmation.status) && (
                                     <div className="space-y-4">
                                         <div className="bg-gray-50 p-4 rounded-xl space-y-3">
                                             <div className="flex items-center gap-3 text-gray-700">
@@ -369,7 +391,7 @@ export default function ShortVideoFeed({ userId }) {
 
                                         <div className="flex gap-3 pt-2">
                                             <button
-                                                onClick={confirmBooking}
+                                                onClick={() => confirmBooking()}
                                                 className="flex-1 bg-green-600 text-white py-3 rounded-xl font-bold hover:bg-green-700 transition flex items-center justify-center gap-2"
                                             >
                                                 <Check className="w-5 h-5" />
@@ -385,6 +407,54 @@ export default function ShortVideoFeed({ userId }) {
                                     </div>
                                 )}
 
+                                {bookingState.booking_proposal?.status === 'alternatives_available' && (!bookingState.booking_confirmation || !bookingState.booking_confirmation.status) && (
+                                    <div className="space-y-4">
+                                        <p className="text-gray-600 text-sm">
+                                            {bookingState.booking_proposal.message}
+                                        </p>
+
+                                        <div className="space-y-2">
+                                            {bookingState.booking_proposal.alternatives.map((alt) => (
+                                                <button
+                                                    key={alt.datetime}
+                                                    onClick={() => confirmBooking(alt.datetime)}
+                                                    className="w-full text-left bg-gray-50 hover:bg-green-50 border border-gray-100 hover:border-green-200 p-3 rounded-xl transition flex items-center gap-3"
+                                                >
+                                                    <Calendar className="w-5 h-5 text-gray-400" />
+                                                    <div>
+                                                        <div className="font-medium text-gray-800">{alt.display}</div>
+                                                        <div className="text-xs text-gray-500">{alt.reason}</div>
+                                                    </div>
+                                                </button>
+                                            ))}
+                                        </div>
+
+                                        <button
+                                            onClick={() => setBookingState(null)}
+                                            className="w-full bg-gray-100 text-gray-700 py-3 rounded-xl font-bold hover:bg-gray-200 transition"
+                                        >
+                                            Maybe Later
+                                        </button>
+                                    </div>
+                                )}
+
+                                {/* Slot taken before confirmation, or the booking couldn't be stored */}
+                                {bookingState.booking_confirmation?.status && bookingState.booking_confirmation.status !== 'confirmed' && (
+                                    <div className="space-y-4">
+                                        <div className="bg-orange-50 border border-orange-100 p-4 rounded-xl">
+                                            <p className="text-orange-800 text-sm">
+                                                {bookingState.booking_confirmation.message}
+                                            </p>
+                                        </div>
+                                        <button
+                                            onClick={() => setBookingState(null)}
+                                            className="w-full bg-gray-100 text-gray-700 py-3 rounded-xl font-bold hover:bg-gray-200 transition"
+                                        >
+                                            Close
+                                        </button>
+                                    </div>
+                                )}
+
                                 {bookingState.booking_confirmation?.status === 'confirmed' && (
                                     <div className="space-y-4">
                                         <div className="bg-green-50 border border-green-100 p-4 rounded-xl text-center">
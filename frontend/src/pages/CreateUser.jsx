@@ -61,7 +61,7 @@ export default function CreateUser() {
     // Step 2: Add Friends
     const fetchUsersExcluding = async (excludeUserId) => {
         try {
-            const res = await axios.get('http://localhost:8000/debug/map-data');
+            const res = await axios.get('http://localhost:8000/users?limit=100');
             // Filter out the specified user to prevent self-friending
             const filteredUsers = res.data.users.filter(u => u.id !== excludeUserId);
             console.log('Fetched users for friend selection:', filteredUsers.length, 'users (excluding', excludeUserId, ')');
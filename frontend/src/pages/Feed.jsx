@@ -36,7 +36,7 @@ export default function Feed() {
     // Fetch users for selector
     useEffect(() => {
         const fetchUsers = async () => {
-            const res = await axios.get('http://localhost:8000/debug/map-data');
+            const res = await axios.get('http://localhost:8000/users?limit=100');
             setUsers(res.data.users);
             if (res.data.users.length > 0 && !selectedUserId) {
                 setSelectedUserId(res.data.users[0].id);
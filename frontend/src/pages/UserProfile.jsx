@@ -11,7 +11,7 @@ export default function UserProfile() {
     // Fetch all users for the selector
     useEffect(() => {
         const fetchUsers = async () => {
-            const res = await axios.get('http://localhost:8000/debug/map-data');
+            const res = await axios.get('http://localhost:8000/users?limit=100');
             setUsers(res.data.users);
             if (res.data.users.length > 0 && !selectedUserId) {
                 setSelectedUserId(res.data.users[0].id);
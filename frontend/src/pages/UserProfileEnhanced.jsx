@@ -5,6 +5,7 @@ import { UserPlus, Users, Clock, Share2, Bookmark, Eye, X } from 'lucide-react';
 export default function UserProfileEnhanced({ userId }) {
     const [profile, setProfile] = useState(null);
     const [allUsers, setAllUsers] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [showAddFriend, setShowAddFriend] = useState(false);
     const [search, setSearch] = useState('');
     const [loading, setLoading] = useState(true);
@@ -14,6 +15,10 @@ export default function UserProfileEnhanced({ userId }) {
         fetchProfile();
     }, [userId]);
 
+    useEffect(() => {
+        if (showAddFriend) fetchAllUsers();
+    }, [search]);
+
     const fetchProfile = async () => {
         try {
             const res = await axios.get(`http://localhost:8000/user/${userId}`);
@@ -25,10 +30,14 @@ export default function UserProfileEnhanced({ userId }) {
         }
     };
 
-    const fetchAllUsers = async () => {
+    // /users is paginated: without a cursor this loads the first page, with one it appends the next
+    const fetchAllUsers = async (cursor = null) => {
         try {
-            const res = await axios.get(`http://localhost:8000/users?current_user_id=${userId}`);
-            setAllUsers(res.data.users);
+            const params = new URLSearchParams({ current_user_id: userId, search });
+            if (cursor) params.set('cursor', cursor);
+            const res = await axios.get(`http://localhost:8000/users?${params}`);
+            setAllUsers(prev => cursor ? [...prev, ...res.data.users] : res.data.users);
+            setNextCursor(res.data.next_cursor);
         } catch (e) {
             console.error(e);
         }
@@ -189,6 +198,8 @@ export default function UserProfileEnhanced({ userId }) {
                     search={search}
                     setSearch={setSearch}
                     users={filteredUsers}
+                    hasMore={!!nextCursor}
+                    onLoadMore={() => fetchAllUsers(nextCursor)}
                     onAdd={handleAddFriend}
                     onClose={() => setShowAddFriend(false)}
                 />
@@ -305,7 +316,7 @@ function WatchHistoryItem({ item }) {
 }
 
 // Add Friend Modal Component
-function AddFriendModal({ search, setSearch, users, onAdd, onClose }) {
+function AddFriendModal({ search, setSearch, users, hasMore, onLoadMore, onAdd, onClose }) {
     return (
         <div className="fixed inset-0 bg-black/50 backdrop-blur-sm flex items-center justify-center z-50 p-4">
             <div className="bg-white rounded-2xl max-w-2xl w-full max-h-[80vh] flex flex-col shadow-2xl">
@@ -333,7 +344,7 @@ function AddFriendModal({ search, setSearch, users, onAdd, onClose }) {
 
                 {/* User List */}
                 <div className="flex-1 overflow-y-auto p-6">
-                    {users.length === 0 ? (
+                    {users.length === 0 && !hasMore ? (
                         <div className="text-center py-12 text-gray-500">
                             No users found
                         </div>
@@ -369,6 +380,14 @@ function AddFriendModal({ search, setSearch, users, onAdd, onClose }) {
                             ))}
                         </div>
                     )}
+                    {hasMore && (
+                        <button
+                            onClick={onLoadMore}
+                            className="mt-4 w-full py-2 border border-gray-300 text-gray-700 rounded-lg hover:bg-gray-50 transition"
+                        >
+                            Load more
+                        </button>
+                    )}
                 </div>
             </div>
         </div>
@@ -0,0 +1,47 @@
+import React, { useState, useEffect } from 'react';
+import axios from 'axios';
+import MapView from '../components/MapView';
+
+export default function VenueMap() {
+    const [users, setUsers] = useState([]);
+    const [selectedUserId, setSelectedUserId] = useState(null);
+
+    // Users for the "acting as" selector; venues are loaded by the map per viewport
+    useEffect(() => {
+        const fetchUsers = async () => {
+            const res = await axios.get('http://localhost:8000/users?limit=100');
+            setUsers(res.data.users);
+            if (res.data.users.length > 0 && !selectedUserId) {
+                setSelectedUserId(res.data.users[0].id);
+            }
+        };
+        fetchUsers();
+    }, []);
+
+    return (
+        <div className="h-full flex flex-col bg-gray-100">
+            <div className="bg-white border-b border-gray-200 p-6 flex justify-between items-center shadow-sm z-10">
+                <div>
+                    <h1 className="text-2xl font-bold text-gray-900">Map</h1>
+                    <p className="text-gray-500 text-sm">Every venue, clustered by zoom level. Click a cluster to zoom in.</p>
+                </div>
+                <div className="flex items-center gap-2">
+                    <span className="text-sm font-medium text-gray-600">Acting as:</span>
+                    <select
+                        className="border border-gray-300 rounded-lg px-4 py-2 outline-none focus:ring-2 focus:ring-indigo-500 bg-gray-50"
+                        value={selectedUserId || ''}
+                        onChange={e => setSelectedUserId(e.target.value)}
+                    >
+                        {users.map(u => (
+                            <option key={u.id} value={u.id}>{u.name}</option>
+                        ))}
+                    </select>
+                </div>
+            </div>
+
+            <div className="flex-1">
+                <MapView selectedUserId={selectedUserId} onSelectUser={setSelectedUserId} />
+            </div>
+        </div>
+    );
+}
@@ -89,7 +89,7 @@ def seed_graph():
             
         session.run("""
             UNWIND $users AS user
-            CREATE (:User {id: user.id, name: user.name, interests: user.interests})
+            CREATE (:User {id: user.id, name: user.name, name_lower: toLower(user.name), interests: user.interests})
         """, users=user_data)
         
         # Create Friendships (Power Law / Preferential Attachmentish)
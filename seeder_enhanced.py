@@ -16,6 +16,7 @@ from datetime import datetime, timedelta
 from qdrant_client import QdrantClient, models
 from neo4j import GraphDatabase
 from faker import Faker
+from seeding.embeddings import EmbeddingService, MockEmbeddings, OpenAIEmbeddings
 
 # Configuration
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
@@ -34,7 +35,7 @@ USE_REAL_EMBEDDINGS = False
 if OPENAI_API_KEY:
     try:
         from openai import OpenAI
-        openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        embedding_service = EmbeddingService(OpenAIEmbeddings(OpenAI(api_key=OPENAI_API_KEY)))
         USE_REAL_EMBEDDINGS = True
         print("✓ OpenAI API key found - will generate real embeddings")
     except ImportError:
@@ -355,24 +356,28 @@ USER_PERSONAS = [
 # HELPER FUNCTIONS
 # ============================================================================
 
-def generate_embedding(text: str) -> list[float]:
-    """Generate embedding using OpenAI or mock"""
-    if USE_REAL_EMBEDDINGS:
-        try:
-            response = openai_client.embeddings.create(
-                input=text,
-                model="text-embedding-3-small"
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"⚠ OpenAI API error: {e}, falling back to mock")
-            return [random.random() for _ in range(1536)]
-    else:
-        # Mock embeddings - still somewhat consistent
-        random.seed(hash(text) % 2**32)
-        embedding = [random.random() for _ in range(1536)]
-        random.seed()  # Reset seed
-        return embedding
+# Topics for clustered mock embeddings: venue categories and vibes plus user interests
+EMBEDDING_TOPICS = sorted(
+    {word for template in VENUE_TEMPLATES.values() for word in template["categories"] + template.get("vibes", [])}
+    | {interest for interests in USER_INTERESTS.values() for interest in interests}
+)
+
+mock_embeddings = MockEmbeddings()
+
+def embed_texts(texts: list[str]) -> list[list[float]]:
+    """Embed many texts at once, using OpenAI or deterministic mock vectors"""
+    if not USE_REAL_EMBEDDINGS:
+        return mock_embeddings.embed(texts).tolist()
+
+    # Batched, concurrent OpenAI calls; texts embedded by an earlier run come from the on-disk cache
+    hits, misses = embedding_service.stats["hits"], embedding_service.stats["misses"]
+    try:
+        vectors = embedding_service.embed(texts)
+    except Exception as e:
+        print(f"⚠ OpenAI API error: {e}, falling back to mock")
+        return mock_embeddings.embed(texts).tolist()
+    print(f"  Embedded {len(texts)} texts: {embedding_service.stats['hits'] - hits} cached, {embedding_service.stats['misses'] - misses} new")
+    return vectors.tolist()
 
 def create_venue_description(template_key: str, name: str, neighborhood: dict) -> str:
     """Create rich venue description"""
@@ -411,7 +416,8 @@ def seed_venues():
         print(f"⚠ Error creating users collection: {e}")
 
     venue_id_counter = 0
-    all_venues = []
+    venue_payloads = []
+    embedding_texts = []
 
     for neighborhood in NYC_NEIGHBORHOODS:
         print(f"\n📍 {neighborhood['name']} ({neighborhood['venue_count']} venues)")
@@ -433,9 +439,8 @@ def seed_venues():
             lat = neighborhood["lat"] + (random.random() - 0.5) * 0.01
             lon = neighborhood["lon"] + (random.random() - 0.5) * 0.01
 
-            # Generate embedding from description + categories
-            embedding_text = f"{name}. {description}. Categories: {', '.join(template['categories'])}"
-            vector = generate_embedding(embedding_text)
+            # Embedding text from description + categories (embedded in one batch below)
+            embedding_texts.append(f"{name}. {description}. Categories: {', '.join(template['categories'])}")
 
             # Mock video URL (using Unsplash for realistic images)
             video_url = f"https://images.unsplash.com/photo-{random.randint(1000000000000, 9999999999999)}"
@@ -455,17 +460,18 @@ def seed_venues():
                 "video_url": video_url
             }
 
-            all_venues.append(models.PointStruct(
-                id=venue_id_counter,
-                vector=vector,
-                payload=payload
-            ))
+            venue_payloads.append(payload)
 
             venue_id_counter += 1
 
             if venue_id_counter % 10 == 0:
                 print(f"  Generated {venue_id_counter} venues...")
 
+    all_venues = [
+        models.PointStruct(id=venue_index, vector=vector, payload=payload)
+        for venue_index, (vector, payload) in enumerate(zip(embed_texts(embedding_texts), venue_payloads))
+    ]
+
     # Batch upload
     print(f"\n⬆️  Uploading {len(all_venues)} venues to Qdrant...")
     batch_size = 50
@@ -493,7 +499,8 @@ def seed_users(num_users: int = 200):
         print("✓ Cleared existing users")
 
         user_data = []
-        user_vectors = []
+        user_payloads = []
+        interests_texts = []
 
         for i in range(num_users):
             # Assign persona (with some randomness)
@@ -509,9 +516,8 @@ def seed_users(num_users: int = 200):
             user_id = f"user_{i}"
             name = fake.name()
 
-            # Generate user embedding from interests
-            interests_text = " ".join(interests)
-            user_vector = generate_embedding(interests_text)
+            # User embedding text from interests (embedded in one batch below)
+            interests_texts.append(" ".join(interests))
 
             user_data.append({
                 "id": user_id,
@@ -520,19 +526,20 @@ def seed_users(num_users: int = 200):
                 "archetype": persona["archetype"]
             })
 
-            user_vectors.append(models.PointStruct(
-                id=i,
-                vector=user_vector,
-                payload={
-                    "user_id": user_id,
-                    "name": name,
-                    "interests": interests
-                }
-            ))
+            user_payloads.append({
+                "user_id": user_id,
+                "name": name,
+                "interests": interests
+            })
 
             if (i + 1) % 50 == 0:
                 print(f"  Generated {i + 1} users...")
 
+        user_vectors = [
+            models.PointStruct(id=i, vector=vector, payload=payload)
+            for i, (vector, payload) in enumerate(zip(embed_texts(interests_texts), user_payloads))
+        ]
+
         # Create users in Neo4j
         print("\n⬆️  Creating users in Neo4j...")
         session.run("""
@@ -540,6 +547,7 @@ def seed_users(num_users: int = 200):
             CREATE (:User {
                 id: user.id,
                 name: user.name,
+                name_lower: toLower(user.name),
                 interests: user.interests,
                 archetype: user.archetype
             })
@@ -765,9 +773,13 @@ if __name__ == "__main__":
     parser.add_argument("--all", action="store_true", help="Seed everything")
     parser.add_argument("--num-users", type=int, default=200, help="Number of users to create")
     parser.add_argument("--interactions-per-user", type=int, default=30, help="Avg interactions per user")
+    parser.add_argument("--topic-embeddings", action="store_true", help="Cluster mock embeddings by category/interest")
 
     args = parser.parse_args()
 
+    if args.topic_embeddings:
+        mock_embeddings = MockEmbeddings(topics=EMBEDDING_TOPICS)
+
     start_time = time.time()
 
     num_venues = 0
@@ -817,6 +829,7 @@ if __name__ == "__main__":
         print("  --engagement             Simulate watch patterns")
         print("  --num-users N            Number of users (default: 200)")
         print("  --interactions-per-user N  Avg interactions per user (default: 30)")
+        print("  --topic-embeddings       Cluster mock embeddings by category/interest")
 
     elapsed = time.time() - start_time
     print(f"\n⏱️  Total time: {elapsed:.2f}s")
@@ -8,6 +8,9 @@ This script generates:
 3. 10-15 users with clear personas (manageable for demos)
 4. Video-level engagement (watches, saves, shares)
 5. Social graph with realistic friendships
+
+Rows are generated first and then loaded; --bulk loads them with batched
+UNWIND transactions and parallel Qdrant upserts (see seeding/bulk.py).
 """
 
 import os
@@ -17,6 +20,12 @@ from datetime import datetime, timedelta
 from qdrant_client import QdrantClient, models
 from neo4j import GraphDatabase
 from faker import Faker
+from seeding.bulk import (
+    NEO4J_BATCH_SIZE, QDRANT_BATCH_SIZE, QDRANT_PARALLEL,
+    phase, prepare_graph, upsert_points, write_rows
+)
+from seeding.embeddings import EmbeddingService, MockEmbeddings, OpenAIEmbeddings
+from seeding.synthetic import SyntheticDataset
 
 # Configuration
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
@@ -35,7 +44,7 @@ USE_REAL_EMBEDDINGS = False
 if OPENAI_API_KEY:
     try:
         from openai import OpenAI
-        openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        embedding_service = EmbeddingService(OpenAIEmbeddings(OpenAI(api_key=OPENAI_API_KEY)))
         USE_REAL_EMBEDDINGS = True
         print("✓ OpenAI API key found - will generate real embeddings")
     except ImportError:
@@ -216,6 +225,25 @@ VIDEO_TYPES = {
     }
 }
 
+# Video type distribution
+VIDEO_TYPE_WEIGHTS = {
+    "ambiance": 0.3,
+    "new_menu": 0.25,
+    "live_event": 0.2,
+    "behind_scenes": 0.15,
+    "special_offer": 0.1
+}
+
+# Gradient for visual variety
+VIDEO_GRADIENTS = [
+    "from-purple-500 to-pink-500",
+    "from-blue-500 to-cyan-500",
+    "from-green-500 to-emerald-500",
+    "from-orange-500 to-red-500",
+    "from-indigo-500 to-purple-500",
+    "from-yellow-500 to-orange-500"
+]
+
 # ============================================================================
 # USER PERSONAS (10-15 users with distinct personalities)
 # ============================================================================
@@ -240,54 +268,58 @@ USER_PERSONAS = [
 # HELPER FUNCTIONS
 # ============================================================================
 
-def generate_embedding(text: str) -> list[float]:
-    """Generate embedding using OpenAI or mock"""
-    if USE_REAL_EMBEDDINGS:
-        try:
-            response = openai_client.embeddings.create(
-                input=text,
-                model="text-embedding-3-small"
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"⚠ OpenAI API error: {e}, falling back to mock")
-            return [random.random() for _ in range(1536)]
-    else:
-        # Mock embeddings - still somewhat consistent
-        random.seed(hash(text) % 2**32)
-        embedding = [random.random() for _ in range(1536)]
-        random.seed()  # Reset seed
-        return embedding
-
-def generate_video_content(venue_name: str, venue_categories: list, video_type: str) -> dict:
-    """Generate video title and description based on type"""
+# Topics for clustered mock embeddings: venue categories and vibes plus persona interests
+EMBEDDING_TOPICS = sorted(
+    {word for template in VENUE_TEMPLATES.values() for word in template["categories"] + template["vibes"]}
+    | {interest for persona in USER_PERSONAS for interest in persona["interests"]}
+)
+
+mock_embeddings = MockEmbeddings()
+
+def embed_texts(texts: list[str]) -> list[list[float]]:
+    """Embed many texts at once, using OpenAI or deterministic mock vectors"""
+    if not USE_REAL_EMBEDDINGS:
+        return mock_embeddings.embed(texts).tolist()
+
+    # Batched, concurrent OpenAI calls; texts embedded by an earlier run come from the on-disk cache
+    hits, misses = embedding_service.stats["hits"], embedding_service.stats["misses"]
+    try:
+        vectors = embedding_service.embed(texts)
+    except Exception as e:
+        print(f"⚠ OpenAI API error: {e}, falling back to mock")
+        return mock_embeddings.embed(texts).tolist()
+    print(f"  Embedded {len(texts)} texts: {embedding_service.stats['hits'] - hits} cached, {embedding_service.stats['misses'] - misses} new")
+    return vectors.tolist()
+
+def generate_video_content(venue_name: str, venue_categories: list, video_type: str, rng=random) -> dict:
+    """Generate video title and description based on type (rng: the random module or a random.Random)"""
     video_config = VIDEO_TYPES[video_type]
 
-    template = random.choice(video_config["templates"])
-    description = random.choice(video_config["descriptions"])
+    template = rng.choice(video_config["templates"])
+    description = rng.choice(video_config["descriptions"])
 
     # Fill in template variables
     replacements = {
         "{venue}": venue_name,
-        "{genre}": random.choice(["Jazz", "Blues", "Soul", "Acoustic"]),
-        "{time}": random.choice(["8pm", "9pm", "7:30pm"]),
-        "{event_name}": random.choice(["Open Mic Night", "Trivia Tuesday", "Wine Tasting"]),
-        "{day}": random.choice(["Thursday", "Friday", "Saturday", "Tuesday"]),
-        "{artist_type}": random.choice(["local artists", "emerging talent", "acclaimed musicians"]),
-        "{event_type}": random.choice(["Live Music", "Comedy Night", "DJ Set"]),
-        "{season}": random.choice(["Fall", "Winter", "Spring", "Summer"]),
-        "{dish_name}": random.choice(["Truffle Pasta", "Wagyu Burger", "Seasonal Risotto"]),
-        "{item_type}": random.choice(["Cocktail Menu", "Brunch Items", "Desserts"]),
-        "{seasonal_item}": random.choice(["Pumpkin Spice Latte", "Summer Sangria", "Holiday Cookie"]),
-        "{occasion}": random.choice(["Date Night", "Catching Up", "Weekend Brunch"]),
-        "{time_of_day}": random.choice(["Morning", "Evening", "Afternoon", "Late Night"]),
-        "{process}": random.choice(["Making Fresh Pasta", "Roasting Coffee", "Crafting Cocktails"]),
-        "{signature_item}": random.choice(["Famous Pizza", "Signature Cocktail", "House Special"]),
-        "{discount}": random.choice(["20%", "30%", "50%"]),
-        "{items}": random.choice(["All Drinks", "Select Appetizers", "Wine & Beer"]),
-        "{offer}": random.choice(["2-for-1 Drinks", "Free Appetizer", "$5 Cocktails"]),
-        "{promotion}": random.choice(["Buy One Get One", "Happy Hour Extended", "Student Discount"]),
-        "{time_range}": random.choice(["4-6pm", "5-7pm", "Before 7pm"])
+        "{genre}": rng.choice(["Jazz", "Blues", "Soul", "Acoustic"]),
+        "{time}": rng.choice(["8pm", "9pm", "7:30pm"]),
+        "{event_name}": rng.choice(["Open Mic Night", "Trivia Tuesday", "Wine Tasting"]),
+        "{day}": rng.choice(["Thursday", "Friday", "Saturday", "Tuesday"]),
+        "{artist_type}": rng.choice(["local artists", "emerging talent", "acclaimed musicians"]),
+        "{event_type}": rng.choice(["Live Music", "Comedy Night", "DJ Set"]),
+        "{season}": rng.choice(["Fall", "Winter", "Spring", "Summer"]),
+        "{dish_name}": rng.choice(["Truffle Pasta", "Wagyu Burger", "Seasonal Risotto"]),
+        "{item_type}": rng.choice(["Cocktail Menu", "Brunch Items", "Desserts"]),
+        "{seasonal_item}": rng.choice(["Pumpkin Spice Latte", "Summer Sangria", "Holiday Cookie"]),
+        "{occasion}": rng.choice(["Date Night", "Catching Up", "Weekend Brunch"]),
+        "{time_of_day}": rng.choice(["Morning", "Evening", "Afternoon", "Late Night"]),
+        "{process}": rng.choice(["Making Fresh Pasta", "Roasting Coffee", "Crafting Cocktails"]),
+        "{signature_item}": rng.choice(["Famous Pizza", "Signature Cocktail", "House Special"]),
+        "{discount}": rng.choice(["20%", "30%", "50%"]),
+        "{items}": rng.choice(["All Drinks", "Select Appetizers", "Wine & Beer"]),
+        "{offer}": rng.choice(["2-for-1 Drinks", "Free Appetizer", "$5 Cocktails"]),
+        "{promotion}": rng.choice(["Buy One Get One", "Happy Hour Extended", "Student Discount"]),
+        "{time_range}": rng.choice(["4-6pm", "5-7pm", "Before 7pm"])
     }
 
     title = template
@@ -301,17 +333,85 @@ def generate_video_content(venue_name: str, venue_categories: list, video_type:
         "valid_days": video_config["valid_days"]
     }
 
+def video_embedding_text(title: str, description: str, venue_name: str, categories: list) -> str:
+    return f"{title}. {description}. At {venue_name}. Categories: {', '.join(categories)}"
+
 # ============================================================================
-# SEED VENUES & VIDEOS
+# CYPHER - one UNWIND statement per phase, shared by row-at-a-time and bulk loads
 # ============================================================================
 
-def seed_venues_and_videos():
-    """Seed venues and their videos"""
-    print("\n" + "="*60)
-    print("SEEDING NYC VENUES & VIDEOS")
-    print("="*60)
+CREATE_VENUES = """
+    UNWIND $rows AS row
+    CREATE (v:Venue {
+        id: row.venue_id,
+        name: row.name,
+        description: row.description,
+        categories: row.categories,
+        price_tier: row.price_tier,
+        neighborhood: row.neighborhood,
+        lat: row.lat,
+        lon: row.lon
+    })
+"""
+
+CREATE_VIDEOS = """
+    UNWIND $rows AS row
+    MATCH (v:Venue {id: row.venue_id})
+    CREATE (vid:Video {
+        id: row.video_id,
+        title: row.title,
+        description: row.description,
+        video_type: row.video_type,
+        created_at: datetime(row.created_at),
+        valid_until: datetime(row.valid_until)
+    })
+    CREATE (v)-[:POSTED]->(vid)
+"""
+
+CREATE_USERS = """
+    UNWIND $rows AS row
+    CREATE (u:User {
+        id: row.user_id,
+        name: row.name,
+        name_lower: toLower(row.name),
+        interests: row.interests,
+        archetype: row.archetype
+    })
+"""
+
+MERGE_FRIENDSHIPS = """
+    UNWIND $rows AS row
+    MATCH (a:User {id: row.user_a}), (b:User {id: row.user_b})
+    MERGE (a)-[:FRIENDS_WITH]->(b)
+    MERGE (b)-[:FRIENDS_WITH]->(a)
+"""
+
+MERGE_ENGAGEMENT = """
+    UNWIND $rows AS row
+    MATCH (u:User {id: row.user_id})
+    MATCH (vid:Video {id: row.video_id})
+    MERGE (u)-[r:WATCHED {timestamp: datetime(row.timestamp)}]->(vid)
+    SET r.watch_time = row.watch_time,
+        r.action = row.action,
+        r.weight = row.weight
+"""
+
+def load_options(bulk: bool) -> dict:
+    """Batch sizes for a load: large UNWIND batches in bulk mode, one row per round trip otherwise"""
+    if bulk:
+        return {
+            "neo4j_batch_size": NEO4J_BATCH_SIZE,
+            "qdrant_batch_size": QDRANT_BATCH_SIZE,
+            "qdrant_parallel": QDRANT_PARALLEL
+        }
+    return {"neo4j_batch_size": 1, "qdrant_batch_size": 50, "qdrant_parallel": 1}
+
+# ============================================================================
+# SEED VENUES & VIDEOS
+# ============================================================================
 
-    # Recreate Qdrant collections
+def recreate_collections():
+    """Recreate the Qdrant videos and users collections"""
     try:
         qdrant.recreate_collection(
             collection_name="videos",
@@ -330,23 +430,12 @@ def seed_venues_and_videos():
     except Exception as e:
         print(f"⚠ Error creating users collection: {e}")
 
-    # Clear Neo4j
-    with driver.session() as session:
-        session.run("MATCH (n) DETACH DELETE n")
-        print("✓ Cleared Neo4j database")
-
-    venue_id_counter = 0
-    video_id_counter = 0
-    all_videos = []
-
-    # Create video type distribution
-    video_type_weights = {
-        "ambiance": 0.3,
-        "new_menu": 0.25,
-        "live_event": 0.2,
-        "behind_scenes": 0.15,
-        "special_offer": 0.1
-    }
+def generate_venues_and_videos() -> tuple[list[dict], list[dict], list]:
+    """Build venue rows, video rows and Qdrant video points for every neighborhood"""
+    venue_rows = []
+    video_rows = []
+    video_payloads = []
+    embedding_texts = []
 
     for neighborhood in NYC_NEIGHBORHOODS:
         print(f"\n📍 {neighborhood['name']} ({neighborhood['venue_count']} venues)")
@@ -358,7 +447,7 @@ def seed_venues_and_videos():
             template_key = random.choice(template_keys)
             template = VENUE_TEMPLATES[template_key]
 
-            venue_id = f"venue_{venue_id_counter}"
+            venue_id = f"venue_{len(venue_rows)}"
             venue_name = random.choice(template["names"]) + " " + neighborhood['name'].split()[0]
             venue_description = random.choice(template["descriptions"]) + f" in {neighborhood['name']}"
 
@@ -366,60 +455,37 @@ def seed_venues_and_videos():
             lat = neighborhood["lat"] + (random.random() - 0.5) * 0.01
             lon = neighborhood["lon"] + (random.random() - 0.5) * 0.01
 
-            # Create venue in Neo4j
-            with driver.session() as session:
-                session.run("""
-                    CREATE (v:Venue {
-                        id: $venue_id,
-                        name: $name,
-                        description: $description,
-                        categories: $categories,
-                        price_tier: $price_tier,
-                        neighborhood: $neighborhood,
-                        lat: $lat,
-                        lon: $lon
-                    })
-                """,
-                    venue_id=venue_id,
-                    name=venue_name,
-                    description=venue_description,
-                    categories=template["categories"],
-                    price_tier=random.choice(template["price_tier"]),
-                    neighborhood=neighborhood["name"],
-                    lat=lat,
-                    lon=lon
-                )
+            venue_rows.append({
+                "venue_id": venue_id,
+                "name": venue_name,
+                "description": venue_description,
+                "categories": template["categories"],
+                "price_tier": random.choice(template["price_tier"]),
+                "neighborhood": neighborhood["name"],
+                "lat": lat,
+                "lon": lon
+            })
 
             # Create 3-5 videos for this venue
             num_videos = random.randint(3, 5)
 
             for vid_idx in range(num_videos):
                 video_type = random.choices(
-                    list(video_type_weights.keys()),
-                    weights=list(video_type_weights.values())
+                    list(VIDEO_TYPE_WEIGHTS.keys()),
+                    weights=list(VIDEO_TYPE_WEIGHTS.values())
                 )[0]
 
                 video_content = generate_video_content(venue_name, template["categories"], video_type)
-                video_id = f"video_{video_id_counter}"
+                video_index = len(video_rows)
+                video_id = f"video_{video_index}"
 
                 # Video created some time in the last 30 days
                 days_old = random.randint(0, 30)
                 created_at = datetime.now() - timedelta(days=days_old)
                 valid_until = created_at + timedelta(days=video_content["valid_days"])
 
-                # Generate embedding from video content
-                embedding_text = f"{video_content['title']}. {video_content['description']}. At {venue_name}. Categories: {', '.join(template['categories'])}"
-                vector = generate_embedding(embedding_text)
-
-                # Gradient for visual variety
-                gradients = [
-                    "from-purple-500 to-pink-500",
-                    "from-blue-500 to-cyan-500",
-                    "from-green-500 to-emerald-500",
-                    "from-orange-500 to-red-500",
-                    "from-indigo-500 to-purple-500",
-                    "from-yellow-500 to-orange-500"
-                ]
+                # Embedding text from video content (embedded in one batch below)
+                embedding_texts.append(video_embedding_text(video_content["title"], video_content["description"], venue_name, template["categories"]))
 
                 payload = {
                     "video_id": video_id,
@@ -434,106 +500,107 @@ def seed_venues_and_videos():
                     "neighborhood": neighborhood["name"],
                     "price_tier": random.choice(template["price_tier"]),
                     "location": {"lat": lat, "lon": lon},
-                    "gradient": random.choice(gradients)
+                    "gradient": random.choice(VIDEO_GRADIENTS)
                 }
 
-                all_videos.append(models.PointStruct(
-                    id=video_id_counter,
-                    vector=vector,
-                    payload=payload
-                ))
-
-                # Create video in Neo4j
-                with driver.session() as session:
-                    session.run("""
-                        MATCH (v:Venue {id: $venue_id})
-                        CREATE (vid:Video {
-                            id: $video_id,
-                            title: $title,
-                            description: $description,
-                            video_type: $video_type,
-                            created_at: datetime($created_at),
-                            valid_until: datetime($valid_until)
-                        })
-                        CREATE (v)-[:POSTED]->(vid)
-                    """,
-                        venue_id=venue_id,
-                        video_id=video_id,
-                        title=video_content["title"],
-                        description=video_content["description"],
-                        video_type=video_content["video_type"],
-                        created_at=created_at.isoformat(),
-                        valid_until=valid_until.isoformat()
-                    )
-
-                video_id_counter += 1
-
-            venue_id_counter += 1
-
-            if venue_id_counter % 10 == 0:
-                print(f"  Generated {venue_id_counter} venues with {video_id_counter} videos...")
-
-    # Batch upload videos to Qdrant
-    print(f"\n⬆️  Uploading {len(all_videos)} videos to Qdrant...")
-    batch_size = 50
-    for i in range(0, len(all_videos), batch_size):
-        batch = all_videos[i:i + batch_size]
-        qdrant.upsert(collection_name="videos", points=batch)
-        print(f"  Uploaded batch {i//batch_size + 1}/{(len(all_videos)-1)//batch_size + 1}")
-
-    print(f"\n✅ Seeded {venue_id_counter} venues with {video_id_counter} videos")
-    return venue_id_counter, video_id_counter
+                video_payloads.append(payload)
+
+                video_rows.append({
+                    "venue_id": venue_id,
+                    "video_id": video_id,
+                    "title": video_content["title"],
+                    "description": video_content["description"],
+                    "video_type": video_content["video_type"],
+                    "created_at": created_at.isoformat(),
+                    "valid_until": valid_until.isoformat()
+                })
+
+            if len(venue_rows) % 10 == 0:
+                print(f"  Generated {len(venue_rows)} venues with {len(video_rows)} videos...")
+
+    video_points = [
+        models.PointStruct(id=video_index, vector=vector, payload=payload)
+        for video_index, (vector, payload) in enumerate(zip(embed_texts(embedding_texts), video_payloads))
+    ]
+    return venue_rows, video_rows, video_points
+
+def seed_venues_and_videos(bulk: bool = False):
+    """Seed venues and their videos"""
+    print("\n" + "="*60)
+    print("SEEDING NYC VENUES & VIDEOS")
+    print("="*60)
+
+    options = load_options(bulk)
+
+    recreate_collections()
+
+    # Clear Neo4j
+    prepare_graph(driver)
+    print("✓ Cleared Neo4j database")
+
+    with phase("generate venues & videos") as p:
+        venue_rows, video_rows, video_points = generate_venues_and_videos()
+        p.add(len(venue_rows) + len(video_rows))
+
+    print(f"\n⬆️  Loading {len(venue_rows)} venues and {len(video_rows)} videos into Neo4j...")
+    with phase("neo4j venues") as p:
+        p.add(write_rows(driver, CREATE_VENUES, venue_rows, options["neo4j_batch_size"]))
+    with phase("neo4j videos") as p:
+        p.add(write_rows(driver, CREATE_VIDEOS, video_rows, options["neo4j_batch_size"]))
+
+    print(f"\n⬆️  Uploading {len(video_points)} videos to Qdrant...")
+    with phase("qdrant videos") as p:
+        p.add(upsert_points(qdrant, "videos", video_points, options["qdrant_batch_size"], options["qdrant_parallel"]))
+
+    print(f"\n✅ Seeded {len(venue_rows)} venues with {len(video_rows)} videos")
+    return len(venue_rows), len(video_rows)
 
 # ============================================================================
 # SEED USERS
 # ============================================================================
 
-def seed_users():
+def seed_users(bulk: bool = False):
     """Seed 10-15 users with distinct personas"""
     print("\n" + "="*60)
     print(f"SEEDING {len(USER_PERSONAS)} USERS")
     print("="*60)
 
-    user_vectors = []
+    options = load_options(bulk)
+    user_rows = []
+    user_payloads = []
 
-    with driver.session() as session:
-        for i, persona in enumerate(USER_PERSONAS):
-            user_id = f"user_{i}"
-
-            # Generate user embedding from interests
-            interests_text = " ".join(persona["interests"])
-            user_vector = generate_embedding(interests_text)
-
-            # Create user in Neo4j
-            session.run("""
-                CREATE (u:User {
-                    id: $user_id,
-                    name: $name,
-                    interests: $interests,
-                    archetype: $archetype
-                })
-            """,
-                user_id=user_id,
-                name=persona["name"],
-                interests=persona["interests"],
-                archetype=persona["archetype"]
-            )
-
-            user_vectors.append(models.PointStruct(
-                id=i,
-                vector=user_vector,
-                payload={
-                    "user_id": user_id,
-                    "name": persona["name"],
-                    "interests": persona["interests"]
-                }
-            ))
+    for i, persona in enumerate(USER_PERSONAS):
+        user_id = f"user_{i}"
+
+        user_rows.append({
+            "user_id": user_id,
+            "name": persona["name"],
+            "interests": persona["interests"],
+            "archetype": persona["archetype"]
+        })
+
+        user_payloads.append({
+            "user_id": user_id,
+            "name": persona["name"],
+            "interests": persona["interests"]
+        })
+
+        print(f"  ✓ Created {persona['name']} ({persona['archetype']})")
+
+    # Generate user embeddings from interests
+    interests_texts = [" ".join(persona["interests"]) for persona in USER_PERSONAS]
+    user_vectors = [
+        models.PointStruct(id=i, vector=vector, payload=payload)
+        for i, (vector, payload) in enumerate(zip(embed_texts(interests_texts), user_payloads))
+    ]
 
-            print(f"  ✓ Created {persona['name']} ({persona['archetype']})")
+    with phase("neo4j users") as p:
+        p.add(write_rows(driver, CREATE_USERS, user_rows, options["neo4j_batch_size"]))
 
     # Upload user vectors to Qdrant
     print("\n⬆️  Uploading user vectors to Qdrant...")
-    qdrant.upsert(collection_name="users", points=user_vectors)
+    with phase("qdrant users") as p:
+        p.add(upsert_points(qdrant, "users", user_vectors, options["qdrant_batch_size"], options["qdrant_parallel"]))
 
     print(f"\n✅ Seeded {len(USER_PERSONAS)} users")
     return USER_PERSONAS
@@ -542,40 +609,45 @@ def seed_users():
 # SEED FRIENDSHIPS
 # ============================================================================
 
-def seed_friendships(user_data: list):
-    """Create friendships - each user has 3-5 friends"""
-    print("\n" + "="*60)
-    print("CREATING SOCIAL GRAPH")
-    print("="*60)
-
+def generate_friendships(user_data: list) -> list[dict]:
+    """Friendship pairs - each user picks 3-5 friends"""
     num_users = len(user_data)
-    friendships_created = 0
+    pairs = []
 
-    with driver.session() as session:
-        for i, user in enumerate(user_data):
-            user_id = f"user_{i}"
+    for i, user in enumerate(user_data):
+        user_id = f"user_{i}"
+
+        # Each user gets 3-5 friends
+        num_friends = random.randint(3, 5)
 
-            # Each user gets 3-5 friends
-            num_friends = random.randint(3, 5)
+        # Avoid self-friendship
+        possible_friends = [j for j in range(num_users) if j != i]
+        friend_indices = random.sample(possible_friends, min(num_friends, len(possible_friends)))
 
-            # Avoid self-friendship
-            possible_friends = [j for j in range(num_users) if j != i]
-            friend_indices = random.sample(possible_friends, min(num_friends, len(possible_friends)))
+        for friend_idx in friend_indices:
+            friend_id = f"user_{friend_idx}"
 
-            for friend_idx in friend_indices:
-                friend_id = f"user_{friend_idx}"
+            # Only create if user_id < friend_id to avoid duplicates
+            if user_id < friend_id:
+                pairs.append({"user_a": user_id, "user_b": friend_id})
 
-                # Only create if user_id < friend_id to avoid duplicates
-                if user_id < friend_id:
-                    session.run("""
-                        MATCH (a:User {id: $user_a}), (b:User {id: $user_b})
-                        MERGE (a)-[:FRIENDS_WITH]->(b)
-                        MERGE (b)-[:FRIENDS_WITH]->(a)
-                    """, user_a=user_id, user_b=friend_id)
-                    friendships_created += 1
+    return pairs
 
-        print(f"\n✅ Created {friendships_created} bidirectional friendships")
+def seed_friendships(user_data: list, bulk: bool = False):
+    """Create friendships - each user has 3-5 friends"""
+    print("\n" + "="*60)
+    print("CREATING SOCIAL GRAPH")
+    print("="*60)
 
+    options = load_options(bulk)
+    pairs = generate_friendships(user_data)
+
+    with phase("neo4j friendships") as p:
+        p.add(write_rows(driver, MERGE_FRIENDSHIPS, pairs, options["neo4j_batch_size"]))
+
+    print(f"\n✅ Created {len(pairs)} bidirectional friendships")
+
+    with driver.session() as session:
         # Print friend summary
         result = session.run("""
             MATCH (u:User)
@@ -593,91 +665,83 @@ def seed_friendships(user_data: list):
 # SIMULATE VIDEO ENGAGEMENT
 # ============================================================================
 
-def simulate_video_engagement(user_data: list, num_videos: int):
+ENGAGEMENT_TYPES = {
+    "skip": {"weight": -0.5, "watch_time_range": (0, 3), "action": "skipped"},
+    "brief_view": {"weight": 0.3, "watch_time_range": (3, 10), "action": "viewed"},
+    "engaged_view": {"weight": 1.0, "watch_time_range": (10, 30), "action": "viewed"},
+    "full_view": {"weight": 2.0, "watch_time_range": (30, 60), "action": "viewed"},
+    "save": {"weight": 1.5, "watch_time_range": (15, 60), "action": "saved"},
+    "share": {"weight": 3.0, "watch_time_range": (20, 60), "action": "shared"},
+}
+
+ENGAGEMENT_DIST = [
+    ("skip", 0.15),
+    ("brief_view", 0.25),
+    ("engaged_view", 0.35),
+    ("full_view", 0.15),
+    ("save", 0.07),
+    ("share", 0.03),
+]
+
+def generate_engagement(user_data: list, num_videos: int) -> list[dict]:
+    """WATCHED rows - each user watches 20-40 videos"""
+    rows = []
+
+    for i, user in enumerate(user_data):
+        user_id = f"user_{i}"
+
+        # Each user watches 20-40 videos
+        num_watches = random.randint(20, 40)
+        video_indices = random.sample(range(num_videos), min(num_watches, num_videos))
+
+        for v_idx in video_indices:
+            video_id = f"video_{v_idx}"
+
+            # Determine engagement type
+            engagement_type = random.choices(
+                [e[0] for e in ENGAGEMENT_DIST],
+                weights=[e[1] for e in ENGAGEMENT_DIST]
+            )[0]
+
+            config = ENGAGEMENT_TYPES[engagement_type]
+            watch_time = random.randint(*config["watch_time_range"])
+            weight = config["weight"]
+            action_type = config["action"]
+
+            # Timestamp (random within last 30 days)
+            days_ago = random.randint(0, 30)
+            timestamp = datetime.now() - timedelta(days=days_ago)
+
+            rows.append({
+                "user_id": user_id,
+                "video_id": video_id,
+                "watch_time": watch_time,
+                "action": action_type,
+                "weight": weight,
+                "timestamp": timestamp.isoformat()
+            })
+
+        if (i + 1) % 5 == 0:
+            print(f"  Simulated engagement for {i + 1} users ({len(rows)} interactions)...")
+
+    return rows
+
+def simulate_video_engagement(user_data: list, num_videos: int, bulk: bool = False):
     """Simulate video-level engagement (watches, saves, shares)"""
     print("\n" + "="*60)
     print("SIMULATING VIDEO ENGAGEMENT")
     print("="*60)
 
-    engagement_types = {
-        "skip": {"weight": -0.5, "watch_time_range": (0, 3)},
-        "brief_view": {"weight": 0.3, "watch_time_range": (3, 10)},
-        "engaged_view": {"weight": 1.0, "watch_time_range": (10, 30)},
-        "full_view": {"weight": 2.0, "watch_time_range": (30, 60)},
-        "save": {"weight": 1.5, "watch_time_range": (15, 60)},
-        "share": {"weight": 3.0, "watch_time_range": (20, 60)},
-    }
+    options = load_options(bulk)
+    rows = generate_engagement(user_data, num_videos)
 
-    with driver.session() as session:
-        total_interactions = 0
-
-        for i, user in enumerate(user_data):
-            user_id = f"user_{i}"
-
-            # Each user watches 20-40 videos
-            num_watches = random.randint(20, 40)
-            video_indices = random.sample(range(num_videos), min(num_watches, num_videos))
-
-            for v_idx in video_indices:
-                video_id = f"video_{v_idx}"
-
-                # Determine engagement type
-                engagement_dist = [
-                    ("skip", 0.15),
-                    ("brief_view", 0.25),
-                    ("engaged_view", 0.35),
-                    ("full_view", 0.15),
-                    ("save", 0.07),
-                    ("share", 0.03),
-                ]
-
-                engagement_type = random.choices(
-                    [e[0] for e in engagement_dist],
-                    weights=[e[1] for e in engagement_dist]
-                )[0]
-
-                config = engagement_types[engagement_type]
-                watch_time = random.randint(*config["watch_time_range"])
-                weight = config["weight"]
-
-                # Determine action type
-                if engagement_type == "share":
-                    action_type = "shared"
-                elif engagement_type == "save":
-                    action_type = "saved"
-                elif engagement_type == "skip":
-                    action_type = "skipped"
-                else:
-                    action_type = "viewed"
-
-                # Timestamp (random within last 30 days)
-                days_ago = random.randint(0, 30)
-                timestamp = datetime.now() - timedelta(days=days_ago)
-
-                # Log to Neo4j (video-level engagement)
-                session.run("""
-                    MATCH (u:User {id: $user_id})
-                    MATCH (vid:Video {id: $video_id})
-                    MERGE (u)-[r:WATCHED {timestamp: datetime($timestamp)}]->(vid)
-                    SET r.watch_time = $watch_time,
-                        r.action = $action,
-                        r.weight = $weight
-                """,
-                    user_id=user_id,
-                    video_id=video_id,
-                    watch_time=watch_time,
-                    action=action_type,
-                    weight=weight,
-                    timestamp=timestamp.isoformat()
-                )
+    # Log to Neo4j (video-level engagement)
+    with phase("neo4j engagement") as p:
+        p.add(write_rows(driver, MERGE_ENGAGEMENT, rows, options["neo4j_batch_size"]))
 
-                total_interactions += 1
-
-            if (i + 1) % 5 == 0:
-                print(f"  Simulated engagement for {i + 1} users ({total_interactions} interactions)...")
-
-        print(f"\n✅ Created {total_interactions} video engagement records")
+    print(f"\n✅ Created {len(rows)} video engagement records")
 
+    with driver.session() as session:
         # Print engagement breakdown
         breakdown = session.run("""
             MATCH ()-[r:WATCHED]->()
@@ -689,6 +753,77 @@ def simulate_video_engagement(user_data: list, num_videos: int):
         for record in breakdown:
             print(f"   {record['action']}: {record['count']}")
 
+# ============================================================================
+# SYNTHETIC DATASET (large-scale, streamed through the bulk loaders)
+# ============================================================================
+
+def seed_synthetic(seed: int, num_users: int, num_venues: int, num_cities: int, avg_friends: int, avg_watches: int):
+    """Stream a large reproducible dataset into Neo4j and Qdrant, chunk by chunk"""
+    print("\n" + "="*60)
+    print(f"SEEDING SYNTHETIC DATASET (seed {seed})")
+    print("="*60)
+
+    dataset = SyntheticDataset(
+        venue_templates=VENUE_TEMPLATES,
+        video_type_weights=VIDEO_TYPE_WEIGHTS,
+        video_content=generate_video_content,
+        gradients=VIDEO_GRADIENTS,
+        personas=USER_PERSONAS,
+        engagement_types=ENGAGEMENT_TYPES,
+        engagement_dist=ENGAGEMENT_DIST,
+        seed=seed,
+        num_users=num_users,
+        num_venues=num_venues,
+        num_cities=num_cities,
+        avg_friends=avg_friends,
+        avg_watches=avg_watches
+    )
+    print(f"  {len(dataset.cities)} cities, {dataset.num_venues:,} venues, {dataset.num_videos:,} videos, "
+          f"{dataset.num_users:,} users, {dataset.num_friendships:,} friendships, ~{dataset.expected_engagements:,} engagements")
+
+    options = load_options(bulk=True)
+    recreate_collections()
+    prepare_graph(driver)
+    print("✓ Cleared Neo4j database")
+
+    with phase("venues & videos") as p:
+        for venue_rows, video_rows, video_payloads in dataset.venues():
+            p.add(write_rows(driver, CREATE_VENUES, venue_rows, options["neo4j_batch_size"]))
+            p.add(write_rows(driver, CREATE_VIDEOS, video_rows, options["neo4j_batch_size"]))
+            texts = [
+                video_embedding_text(payload["title"], payload["description"], payload["venue_name"], payload["categories"])
+                for payload in video_payloads
+            ]
+            points = [
+                models.PointStruct(id=int(payload["video_id"].split("_")[1]), vector=vector, payload=payload)
+                for vector, payload in zip(embed_texts(texts), video_payloads)
+            ]
+            upsert_points(qdrant, "videos", points, options["qdrant_batch_size"], options["qdrant_parallel"])
+
+    with phase("users") as p:
+        for user_rows in dataset.users():
+            p.add(write_rows(driver, CREATE_USERS, user_rows, options["neo4j_batch_size"]))
+            vectors = embed_texts([" ".join(row["interests"]) for row in user_rows])
+            points = [
+                models.PointStruct(
+                    id=int(row["user_id"].split("_")[1]),
+                    vector=vector,
+                    payload={"user_id": row["user_id"], "name": row["name"], "interests": row["interests"]}
+                )
+                for vector, row in zip(vectors, user_rows)
+            ]
+            upsert_points(qdrant, "users", points, options["qdrant_batch_size"], options["qdrant_parallel"])
+
+    with phase("friendships") as p:
+        for pairs in dataset.friendships():
+            p.add(write_rows(driver, MERGE_FRIENDSHIPS, pairs, options["neo4j_batch_size"]))
+
+    with phase("engagement") as p:
+        for rows in dataset.engagements():
+            p.add(write_rows(driver, MERGE_ENGAGEMENT, rows, options["neo4j_batch_size"]))
+
+    print(f"\n✅ Seeded synthetic dataset from seed {seed}")
+
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -702,25 +837,40 @@ if __name__ == "__main__":
     parser.add_argument("--friends", action="store_true", help="Seed friendships")
     parser.add_argument("--engagement", action="store_true", help="Simulate video engagement")
     parser.add_argument("--all", action="store_true", help="Seed everything")
+    parser.add_argument("--bulk", action="store_true", help="Load with batched UNWIND transactions and parallel Qdrant upserts")
+    parser.add_argument("--topic-embeddings", action="store_true", help="Cluster mock embeddings by category/interest")
+    parser.add_argument("--synthetic", action="store_true", help="Stream a large synthetic dataset through the bulk loaders")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for --synthetic")
+    parser.add_argument("--num-users", type=int, default=100_000, help="Users for --synthetic")
+    parser.add_argument("--num-venues", type=int, default=20_000, help="Venues for --synthetic")
+    parser.add_argument("--num-cities", type=int, default=20, help="Cities for --synthetic")
+    parser.add_argument("--avg-friends", type=int, default=12, help="Mean friends per user for --synthetic")
+    parser.add_argument("--avg-watches", type=int, default=30, help="Mean watched videos per user for --synthetic")
 
     args = parser.parse_args()
 
+    if args.topic_embeddings:
+        mock_embeddings = MockEmbeddings(topics=EMBEDDING_TOPICS)
+
     start_time = time.time()
 
     num_venues = 0
     num_videos = 0
     user_data = []
 
+    if args.synthetic:
+        seed_synthetic(args.seed, args.num_users, args.num_venues, args.num_cities, args.avg_friends, args.avg_watches)
+
     if args.all or args.venues:
-        num_venues, num_videos = seed_venues_and_videos()
+        num_venues, num_videos = seed_venues_and_videos(bulk=args.bulk)
 
     if args.all or args.users:
-        user_data = seed_users()
+        user_data = seed_users(bulk=args.bulk)
 
     if args.all or args.friends:
         if not user_data:
             user_data = USER_PERSONAS
-        seed_friendships(user_data)
+        seed_friendships(user_data, bulk=args.bulk)
 
     if args.all or args.engagement:
         if num_videos == 0:
@@ -732,16 +882,19 @@ if __name__ == "__main__":
         if not user_data:
             user_data = USER_PERSONAS
 
-        simulate_video_engagement(user_data, num_videos)
+        simulate_video_engagement(user_data, num_videos, bulk=args.bulk)
 
-    if not (args.all or args.venues or args.users or args.friends or args.engagement):
-        print("Usage: python seeder_video.py [--all] [--venues] [--users] [--friends] [--engagement]")
+    if not (args.all or args.venues or args.users or args.friends or args.engagement or args.synthetic):
+        print("Usage: python seeder_video.py [--all] [--venues] [--users] [--friends] [--engagement] [--bulk] [--synthetic]")
         print("\nOptions:")
         print("  --all          Seed everything")
         print("  --venues       Seed NYC venues and videos")
         print("  --users        Seed 10-15 users with personas")
         print("  --friends      Create social graph")
         print("  --engagement   Simulate video-level engagement")
+        print("  --bulk         Batched UNWIND loads and parallel Qdrant upserts")
+        print("  --topic-embeddings  Cluster mock embeddings by category/interest")
+        print("  --synthetic    Large reproducible dataset (--seed, --num-users, --num-venues, --num-cities, --avg-friends, --avg-watches)")
 
     elapsed = time.time() - start_time
     print(f"\n⏱️  Total time: {elapsed:.2f}s")
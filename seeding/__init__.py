@@ -0,0 +1,3 @@
+"""
+Shared building blocks for the seeder scripts (seeder_video.py, seeder_enhanced.py).
+"""
@@ -0,0 +1,227 @@
+"""
+Embedding providers for the seeders.
+
+A vector is a pure function of its text. A stable 64-bit content hash
+(blake2b; the built-in hash() is salted per process) keys a splitmix64
+stream, which NumPy evaluates for a whole batch of texts at once. No global
+RNG state is touched, and the same text gets the same vector in every run.
+
+With `topics`, each text's vector is pulled towards the centroid of every
+topic it mentions. Texts that share topics (a jazz bar's videos and a user
+interested in jazz) then land near each other, and similarity search in
+benchmarks behaves the way it does on real embeddings instead of returning
+uniformly random neighbours.
+
+OpenAIEmbeddings sends many inputs per API call. EmbeddingService wraps any
+provider with an on-disk, content-addressed cache: a memory-mapped float32
+matrix (vectors.f32) and the content hash of each row (keys.txt), loaded into
+a hash -> row index; one directory per model. Misses are embedded in batches, with at most
+max_concurrency requests in flight, so re-seeding never re-embeds (or pays
+for) a venue, video or persona text it has seen before. A provider is any
+object with `model`, `dim` and `embed(texts) -> float32 array`, so a stub
+can stand in for OpenAI.
+"""
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+EMBEDDING_DIM = 1536
+BATCH_SIZE = 1024
+
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", ".embedding_cache")
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", 256))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", 4))
+
+# splitmix64 constants
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+_WORD = re.compile(r"[a-z0-9'-]+")
+
+def stable_hash(text: str) -> int:
+    """64-bit content hash that's the same in every process"""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+def hash_vectors(keys: np.ndarray, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """Uniform [-1, 1) float32 vectors, one row per uint64 key (splitmix64 over key + column)"""
+    columns = np.arange(1, dim + 1, dtype=np.uint64) * _GOLDEN
+    with np.errstate(over="ignore"):
+        z = keys.astype(np.uint64)[:, None] + columns[None, :]
+        z = (z ^ (z >> np.uint64(30))) * _MIX1
+        z = (z ^ (z >> np.uint64(27))) * _MIX2
+        z ^= z >> np.uint64(31)
+    # Top 24 bits are exact in float32
+    return (z >> np.uint64(40)).astype(np.float32) * np.float32(2.0 ** -23) - np.float32(1.0)
+
+def _keys(texts: list[str]) -> np.ndarray:
+    return np.fromiter((stable_hash(text) for text in texts), dtype=np.uint64, count=len(texts))
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, np.float32(1e-12))
+
+class MockEmbeddings:
+    """Stable float32 embeddings computed locally, optionally clustered by topic"""
+
+    def __init__(self, dim: int = EMBEDDING_DIM, topics: list[str] = None, topic_weight: float = 0.8):
+        self.dim = dim
+        self.topics = sorted({topic.lower() for topic in topics or []})
+        self.topic_weight = topic_weight
+        # The model name namespaces the cache, so it must change whenever the vectors would
+        if self.topics:
+            topics_hash = hashlib.blake2b("\0".join(self.topics).encode("utf-8"), digest_size=6).hexdigest()
+            self.model = f"mock-topics-{topics_hash}-d{dim}-w{topic_weight:g}"
+        else:
+            self.model = f"mock-d{dim}"
+        self._centroids = None
+        if self.topics:
+            self._centroids = _normalize(hash_vectors(_keys([f"topic:{topic}" for topic in self.topics]), dim))
+
+    def _topic_membership(self, texts: list[str]) -> np.ndarray:
+        """(texts x topics) 0/1 matrix: single-word topics match whole words, phrases match substrings"""
+        membership = np.zeros((len(texts), len(self.topics)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            lowered = text.lower()
+            words = set(_WORD.findall(lowered))
+            for col, topic in enumerate(self.topics):
+                if (topic in lowered) if " " in topic else (topic in words):
+                    membership[row, col] = 1.0
+        return membership
+
+    def embed(self, texts) -> np.ndarray:
+        """Unit-length float32 vectors, one row per text"""
+        texts = list(texts)
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), BATCH_SIZE):
+            batch = texts[start:start + BATCH_SIZE]
+            vectors = _normalize(hash_vectors(_keys(batch), self.dim))
+            if self._centroids is not None:
+                membership = self._topic_membership(batch)
+                topical = _normalize(membership @ self._centroids)
+                # Texts that mention no topic keep their pure hash vector
+                weight = np.where(membership.any(axis=1, keepdims=True), self.topic_weight, 0.0).astype(np.float32)
+                vectors = weight * topical + (1 - weight) * vectors
+            out[start:start + len(batch)] = _normalize(vectors)
+        return out
+
+    def embed_one(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+class OpenAIEmbeddings:
+    """OpenAI embeddings, many inputs per request"""
+
+    def __init__(self, client, model: str = "text-embedding-3-small", dim: int = EMBEDDING_DIM):
+        self.client = client
+        self.model = model
+        self.dim = dim
+
+    def embed(self, texts) -> np.ndarray:
+        response = self.client.embeddings.create(input=list(texts), model=self.model)
+        data = sorted(response.data, key=lambda item: item.index)
+        return np.asarray([item.embedding for item in data], dtype=np.float32)
+
+def content_key(model: str, text: str) -> str:
+    return hashlib.blake2b(f"{model}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+class EmbeddingCache:
+    """
+    Append-only float32 matrix on disk, addressed by content key.
+    Row i of vectors.f32 holds the vector for line i of keys.txt.
+    """
+
+    def __init__(self, path: str, dim: int):
+        os.makedirs(path, exist_ok=True)
+        self.dim = dim
+        self.row_bytes = 4 * dim
+        self.vectors_path = os.path.join(path, "vectors.f32")
+        self.keys_path = os.path.join(path, "keys.txt")
+        self._matrix = None
+
+        # Drop anything past the last complete (vector, key) pair, e.g. from an interrupted append
+        keys = []
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path) as f:
+                keys = [line.rstrip("\n") for line in f if line.endswith("\n")]
+        rows = min(len(keys), self._row_count())
+        if os.path.exists(self.vectors_path):
+            os.truncate(self.vectors_path, rows * self.row_bytes)
+        with open(self.keys_path, "w") as f:
+            f.writelines(f"{key}\n" for key in keys[:rows])
+        self.index = {key: row for row, key in enumerate(keys[:rows])}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _row_count(self) -> int:
+        if not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // self.row_bytes
+
+    def _map(self) -> np.ndarray:
+        rows = self._row_count()
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._matrix
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found = {key: self.index[key] for key in keys if key in self.index}
+        if not found:
+            return {}
+        matrix = self._map()
+        return {key: np.array(matrix[row]) for key, row in found.items()}
+
+    def put_many(self, keys: list[str], vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(keys), self.dim)
+        first_row = len(self.index)
+        # Vectors first, then their keys: a key on disk always has its row behind it
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.keys_path, "a") as f:
+            f.writelines(f"{key}\n" for key in keys)
+        for offset, key in enumerate(keys):
+            self.index[key] = first_row + offset
+
+class EmbeddingService:
+    """Batched, concurrency-bounded embedding with a content-addressed cache"""
+
+    def __init__(self, provider, cache_dir: str = EMBEDDING_CACHE_DIR, batch_size: int = EMBED_BATCH_SIZE, max_concurrency: int = EMBED_CONCURRENCY):
+        self.provider = provider
+        self.cache = EmbeddingCache(os.path.join(cache_dir, provider.model), provider.dim) if cache_dir else None
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.stats = {"hits": 0, "misses": 0, "requests": 0}
+
+    def embed(self, texts) -> np.ndarray:
+        """Float32 vectors, one row per text; only texts not already cached reach the provider"""
+        texts = list(texts)
+        keys = [content_key(self.provider.model, text) for text in texts]
+        vectors = self.cache.get_many(keys) if self.cache is not None else {}
+        self.stats["hits"] += sum(1 for key in keys if key in vectors)
+
+        # Each distinct missing text is embedded once, however often it repeats
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+        self.stats["misses"] += len(missing)
+
+        if missing:
+            missing_keys = list(missing)
+            batches = [missing_keys[i:i + self.batch_size] for i in range(0, len(missing_keys), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="embed") as pool:
+                results = pool.map(lambda batch: self.provider.embed([missing[key] for key in batch]), batches)
+                for batch, batch_vectors in zip(batches, results):
+                    self.stats["requests"] += 1
+                    # Cache as each batch lands, so a failure later on doesn't lose what was paid for
+                    if self.cache is not None:
+                        self.cache.put_many(batch, batch_vectors)
+                    vectors.update(zip(batch, np.asarray(batch_vectors, dtype=np.float32)))
+
+        out = np.empty((len(texts), self.provider.dim), dtype=np.float32)
+        for row, key in enumerate(keys):
+            out[row] = vectors[key]
+        return out
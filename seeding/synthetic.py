@@ -0,0 +1,387 @@
+"""
+Streaming synthetic data for large-scale test datasets.
+
+SyntheticDataset expands a single seed into users, friendships, venues,
+videos and engagement edges. Each of these is yielded in chunks of about
+chunk_size rows, ready for the bulk loaders in seeding/bulk.py. Memory is
+bounded by the chunk size plus a few numeric arrays per user and per video.
+Every chunk draws from its own RNG, derived from (seed, stream, chunk
+number), so the same seed always produces the same dataset. Timestamps are
+the one exception: they are relative to `now`.
+
+- Users and venues are spread over many cities with a Zipf-like size
+  distribution. Each city's ids form one contiguous block.
+- Friendships follow a Chung-Lu model. Expected degrees have a power-law
+  (Pareto) distribution, so a few users have hundreds of friends and most
+  have a handful. Most friends live in the same city. Pairs are distinct,
+  and there are num_friendships of them.
+- Engagement has a heavy-tailed number of watches per user. Videos are
+  picked by power-law popularity, mostly from the user's own city, and each
+  user watches a given video at most once.
+
+The content vocabulary (venue templates, video types, personas, engagement
+mix) comes from the seeder that drives the generator. See
+seeder_video.py --synthetic.
+"""
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+
+CITIES = [
+    ("New York", 40.7128, -74.0060), ("Los Angeles", 34.0522, -118.2437), ("Chicago", 41.8781, -87.6298),
+    ("Houston", 29.7604, -95.3698), ("Phoenix", 33.4484, -112.0740), ("Philadelphia", 39.9526, -75.1652),
+    ("San Antonio", 29.4241, -98.4936), ("San Diego", 32.7157, -117.1611), ("Dallas", 32.7767, -96.7970),
+    ("Austin", 30.2672, -97.7431), ("San Jose", 37.3382, -121.8863), ("Columbus", 39.9612, -82.9988),
+    ("Charlotte", 35.2271, -80.8431), ("Indianapolis", 39.7684, -86.1581), ("San Francisco", 37.7749, -122.4194),
+    ("Seattle", 47.6062, -122.3321), ("Denver", 39.7392, -104.9903), ("Washington", 38.9072, -77.0369),
+    ("Boston", 42.3601, -71.0589), ("Nashville", 36.1627, -86.7816), ("Detroit", 42.3314, -83.0458),
+    ("Portland", 45.5152, -122.6784), ("Las Vegas", 36.1699, -115.1398), ("Miami", 25.7617, -80.1918),
+    ("Atlanta", 33.7490, -84.3880), ("Minneapolis", 44.9778, -93.2650), ("New Orleans", 29.9511, -90.0715),
+    ("Pittsburgh", 40.4406, -79.9959), ("Salt Lake City", 40.7608, -111.8910), ("Kansas City", 39.0997, -94.5786)
+]
+
+DISTRICTS = ["Downtown", "Midtown", "Uptown", "Old Town", "Riverside", "Arts District", "Harbor", "University", "Westside", "Eastside"]
+
+FIRST_NAMES = ["Alex", "Maya", "Jordan", "Priya", "Sam", "Elena", "Marcus", "Aisha", "Leo", "Grace",
+               "Diego", "Hannah", "Omar", "Chloe", "Ravi", "Zoe", "Ethan", "Lucia", "Noah", "Mei"]
+LAST_NAMES = ["Garcia", "Smith", "Nguyen", "Patel", "Johnson", "Kim", "Brown", "Lopez", "Chen", "Davis",
+              "Martin", "Singh", "Wilson", "Rossi", "Taylor", "Cohen", "Moore", "Sato", "Clark", "Silva"]
+
+# Stream ids for per-chunk RNGs
+_STREAMS = {"layout": 0, "users": 1, "friendships": 2, "venues": 3, "engagement": 4}
+
+CITY_SIZE_EXPONENT = 0.8    # city k gets a share proportional to 1 / k^0.8
+DEGREE_EXPONENT = 2.5       # P(degree = k) ~ k^-2.5
+POPULARITY_EXPONENT = 1.2   # video popularity weights ~ Pareto(1.2)
+FRIEND_LOCALITY = 0.8       # fraction of friendships within the user's city
+WATCH_LOCALITY = 0.9        # fraction of watches of videos in the user's city
+MAX_WATCHES = 1000
+MAX_DRAW_ROUNDS = 50        # redraws per chunk while topping up distinct pairs
+POPULARITY_ROUNDS = 5       # after this many, watch top-ups ignore popularity so rare deficits fill quickly
+
+def _allocate(total: int, shares: np.ndarray) -> np.ndarray:
+    """Split `total` ids into contiguous blocks by share; returns block offsets (len(shares) + 1)"""
+    exact = total * shares / shares.sum()
+    counts = np.floor(exact).astype(np.int64)
+    remainder = total - int(counts.sum())
+    counts[np.argsort(counts - exact)[:remainder]] += 1
+    return np.concatenate([[0], np.cumsum(counts)])
+
+def _weighted_pick(cumulative: np.ndarray, lo, hi, u: np.ndarray) -> np.ndarray:
+    """
+    Indices in [lo, hi) chosen with probability proportional to their weight.
+    `cumulative` is [0, w0, w0+w1, ...]; `u` is uniform [0, 1), one per pick.
+    """
+    start, end = cumulative[lo], cumulative[hi]
+    picks = np.searchsorted(cumulative, start + u * (end - start), side="right") - 1
+    return np.clip(picks, lo, np.asarray(hi) - 1)
+
+class SyntheticDataset:
+    def __init__(
+        self,
+        *,
+        venue_templates: dict,
+        video_type_weights: dict,
+        video_content,
+        gradients: list[str],
+        personas: list[dict],
+        engagement_types: dict,
+        engagement_dist: list[tuple],
+        seed: int = 42,
+        num_users: int = 100_000,
+        num_venues: int = 20_000,
+        num_cities: int = 20,
+        avg_friends: int = 12,
+        avg_watches: int = 30,
+        chunk_size: int = 10_000,
+        now: datetime = None
+    ):
+        """
+        video_content(venue_name, categories, video_type, rng) -> {"title", "description", "video_type", "valid_days"}
+        engagement_types: type -> {"weight", "watch_time_range", "action"}; engagement_dist: [(type, probability)]
+        """
+        self.venue_templates = venue_templates
+        self.video_type_weights = video_type_weights
+        self.video_content = video_content
+        self.gradients = gradients
+        self.personas = personas
+        self.engagement_types = engagement_types
+        self.engagement_dist = engagement_dist
+        self.seed = seed
+        self.num_users = num_users
+        self.num_venues = num_venues
+        self.avg_friends = avg_friends
+        self.avg_watches = avg_watches
+        self.chunk_size = chunk_size
+        self.now = now or datetime.now()
+
+        rng = self._rng("layout")
+
+        # Cities beyond the built-in list get synthetic "Metro N" centers in the continental US
+        cities = list(CITIES[:num_cities])
+        for k in range(len(cities), num_cities):
+            cities.append((f"Metro {k + 1}", float(rng.uniform(26, 48)), float(rng.uniform(-122, -72))))
+        self.cities = cities
+        self.city_names = [name for name, _, _ in cities]
+        self.district_centers = [
+            [(lat + float(dlat), lon + float(dlon)) for dlat, dlon in rng.normal(0, 0.02, size=(len(DISTRICTS), 2))]
+            for _, lat, lon in cities
+        ]
+
+        shares = 1.0 / np.arange(1, len(cities) + 1) ** CITY_SIZE_EXPONENT
+        self.user_offsets = _allocate(num_users, shares)
+        self.venue_offsets = _allocate(num_venues, shares)
+        self.user_city = np.repeat(np.arange(len(cities), dtype=np.int32), np.diff(self.user_offsets))
+        self.venue_city = np.repeat(np.arange(len(cities), dtype=np.int32), np.diff(self.venue_offsets))
+
+        # 3-5 videos per venue; video ids follow venue ids, so each city's videos are contiguous too
+        self.videos_per_venue = rng.integers(3, 6, size=num_venues)
+        self.video_offsets = np.concatenate([[0], np.cumsum(self.videos_per_venue)])
+        self.num_videos = int(self.video_offsets[-1])
+        self.city_video_offsets = self.video_offsets[self.venue_offsets]
+
+        # Chung-Lu expected degrees: Pareto with mean avg_friends, capped
+        min_degree = avg_friends * (DEGREE_EXPONENT - 2) / (DEGREE_EXPONENT - 1)
+        degrees = min_degree * (1 - rng.random(num_users)) ** (-1 / (DEGREE_EXPONENT - 1))
+        degrees = np.minimum(degrees, max(1, min(num_users - 1, 50 * avg_friends)))
+        self.user_cumulative = np.concatenate([[0.0], np.cumsum(degrees)])
+        # Capping trims the degree sum, so the pair count comes from avg_friends rather than from the weights
+        self.num_friendships = min(num_users * avg_friends // 2, num_users * (num_users - 1) // 2)
+
+        popularity = rng.pareto(POPULARITY_EXPONENT, size=self.num_videos) + 1
+        self.video_cumulative = np.concatenate([[0.0], np.cumsum(popularity)])
+
+    def _rng(self, stream: str, chunk: int = 0) -> np.random.Generator:
+        return np.random.default_rng([self.seed, _STREAMS[stream], chunk])
+
+    def _py_rng(self, stream: str, chunk: int) -> random.Random:
+        # For per-row string choices; str seeds hash the same way in every process
+        return random.Random(f"{self.seed}:{stream}:{chunk}")
+
+    @property
+    def expected_engagements(self) -> int:
+        return self.num_users * self.avg_watches
+
+    def users(self):
+        """Chunks of user rows: {"user_id", "name", "interests", "archetype", "city"}"""
+        all_interests = sorted({interest for persona in self.personas for interest in persona["interests"]})
+        for chunk, start in enumerate(range(0, self.num_users, self.chunk_size)):
+            rng = self._py_rng("users", chunk)
+            rows = []
+            for i in range(start, min(start + self.chunk_size, self.num_users)):
+                persona = rng.choice(self.personas)
+                extra = [item for item in rng.sample(all_interests, rng.randint(0, 2)) if item not in persona["interests"]]
+                rows.append({
+                    "user_id": f"user_{i}",
+                    "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    "interests": persona["interests"] + extra,
+                    "archetype": persona["archetype"],
+                    "city": self.city_names[self.user_city[i]]
+                })
+            yield rows
+
+    def _pick_friends(self, rng: np.random.Generator, sources: np.ndarray) -> np.ndarray:
+        """One Chung-Lu endpoint per source: weight-proportional, mostly from the source's city"""
+        cities = self.user_city[sources]
+        local = rng.random(len(sources)) < FRIEND_LOCALITY
+        lo = np.where(local, self.user_offsets[cities], 0)
+        hi = np.where(local, self.user_offsets[cities + 1], self.num_users)
+        return _weighted_pick(self.user_cumulative, lo, hi, rng.random(len(sources)))
+
+    def _expected_pairs(self, start: int, end: int) -> float:
+        """Relative share of pairs whose lower endpoint is in [start, end)"""
+        ids = np.arange(start, end)
+        cumulative = self.user_cumulative
+        total = cumulative[-1]
+        city_lo = cumulative[self.user_offsets[self.user_city[ids]]]
+        city_hi = cumulative[self.user_offsets[self.user_city[ids] + 1]]
+        above_global = (total - cumulative[ids + 1]) / total
+        above_local = (city_hi - cumulative[ids + 1]) / np.maximum(city_hi - city_lo, 1e-12)
+        weights = cumulative[ids + 1] - cumulative[ids]
+        return float((weights * (FRIEND_LOCALITY * above_local + (1 - FRIEND_LOCALITY) * above_global)).sum())
+
+    def friendships(self):
+        """
+        Chunks of distinct {"user_a", "user_b"} pairs, user_a being the lower user index.
+        A chunk owns every pair whose lower endpoint is in its user range, so
+        deduplicating inside the chunk makes the whole stream distinct. Chunks
+        redraw until they reach their share of num_friendships.
+        """
+        if self.num_friendships == 0:
+            return
+        users_per_chunk = max(1, 2 * self.chunk_size // max(1, self.avg_friends))
+        starts = list(range(0, self.num_users, users_per_chunk))
+        shares = np.array([self._expected_pairs(start, min(start + users_per_chunk, self.num_users)) for start in starts])
+        targets = np.diff(_allocate(self.num_friendships, shares))
+
+        for chunk, start in enumerate(starts):
+            end = min(start + users_per_chunk, self.num_users)
+            rng = self._rng("friendships", chunk)
+            pairs = np.empty(0, dtype=np.int64)
+            keep_rate = 0.5
+            for _ in range(MAX_DRAW_ROUNDS):
+                missing = int(targets[chunk]) - len(pairs)
+                if missing <= 0:
+                    break
+                n = int(missing / max(keep_rate, 0.01) * 1.2) + 16
+                sources = _weighted_pick(self.user_cumulative, start, end, rng.random(n))
+                friends = self._pick_friends(rng, sources)
+                # Only (lower, higher) draws belong to this chunk; the mirrored draw belongs to the friend's chunk
+                keep = friends > sources
+                keep_rate = max(keep.mean(), 0.01)
+                keys = np.unique(sources[keep].astype(np.int64) * self.num_users + friends[keep])
+                new = rng.permutation(np.setdiff1d(keys, pairs, assume_unique=True))[:missing]
+                pairs = np.concatenate([pairs, new])
+
+            pairs.sort()
+            user_a = (pairs // self.num_users).tolist()
+            user_b = (pairs % self.num_users).tolist()
+            yield [{"user_a": f"user_{a}", "user_b": f"user_{b}"} for a, b in zip(user_a, user_b)]
+
+    def venues(self):
+        """
+        Chunks of (venue_rows, video_rows, video_payloads), in the shape
+        seeder_video.py loads into Neo4j and Qdrant. A chunk covers enough
+        venues for about chunk_size videos.
+        """
+        venues_per_chunk = max(1, self.chunk_size // 4)
+        template_keys = list(self.venue_templates.keys())
+        video_type_keys = list(self.video_type_weights.keys())
+        video_type_weights = list(self.video_type_weights.values())
+
+        for chunk, start in enumerate(range(0, self.num_venues, venues_per_chunk)):
+            rng = self._py_rng("venues", chunk)
+            venue_rows, video_rows, video_payloads = [], [], []
+
+            for v in range(start, min(start + venues_per_chunk, self.num_venues)):
+                city = int(self.venue_city[v])
+                district = rng.randrange(len(DISTRICTS))
+                neighborhood = f"{DISTRICTS[district]}, {self.city_names[city]}"
+                center_lat, center_lon = self.district_centers[city][district]
+
+                template = self.venue_templates[rng.choice(template_keys)]
+                venue_id = f"venue_{v}"
+                venue_name = rng.choice(template["names"]) + " " + DISTRICTS[district].split()[0]
+                lat = center_lat + (rng.random() - 0.5) * 0.01
+                lon = center_lon + (rng.random() - 0.5) * 0.01
+
+                venue_rows.append({
+                    "venue_id": venue_id,
+                    "name": venue_name,
+                    "description": rng.choice(template["descriptions"]) + f" in {neighborhood}",
+                    "categories": template["categories"],
+                    "price_tier": rng.choice(template["price_tier"]),
+                    "neighborhood": neighborhood,
+                    "lat": lat,
+                    "lon": lon
+                })
+
+                first_video = int(self.video_offsets[v])
+                for video_index in range(first_video, first_video + int(self.videos_per_venue[v])):
+                    video_type = rng.choices(video_type_keys, weights=video_type_weights)[0]
+                    content = self.video_content(venue_name, template["categories"], video_type, rng)
+                    created_at = self.now - timedelta(days=rng.randint(0, 30))
+                    valid_until = created_at + timedelta(days=content["valid_days"])
+                    video_id = f"video_{video_index}"
+
+                    video_rows.append({
+                        "venue_id": venue_id,
+                        "video_id": video_id,
+                        "title": content["title"],
+                        "description": content["description"],
+                        "video_type": content["video_type"],
+                        "created_at": created_at.isoformat(),
+                        "valid_until": valid_until.isoformat()
+                    })
+                    video_payloads.append({
+                        "video_id": video_id,
+                        "venue_id": venue_id,
+                        "venue_name": venue_name,
+                        "title": content["title"],
+                        "description": content["description"],
+                        "video_type": content["video_type"],
+                        "created_at": created_at.isoformat(),
+                        "valid_until": valid_until.isoformat(),
+                        "categories": template["categories"],
+                        "neighborhood": neighborhood,
+                        "price_tier": rng.choice(template["price_tier"]),
+                        "location": {"lat": lat, "lon": lon},
+                        "gradient": rng.choice(self.gradients)
+                    })
+
+            yield venue_rows, video_rows, video_payloads
+
+    def _pick_videos(self, rng: np.random.Generator, user_ids: np.ndarray) -> np.ndarray:
+        """One popularity-weighted video per entry, mostly from the user's city"""
+        n = len(user_ids)
+        cities = self.user_city[user_ids]
+        lo = self.city_video_offsets[cities]
+        hi = self.city_video_offsets[cities + 1]
+        local = (rng.random(n) < WATCH_LOCALITY) & (hi > lo)
+        return _weighted_pick(
+            self.video_cumulative,
+            np.where(local, lo, 0),
+            np.where(local, hi, self.num_videos),
+            rng.random(n)
+        )
+
+    def engagements(self):
+        """Chunks of WATCHED rows: {"user_id", "video_id", "watch_time", "action", "weight", "timestamp"}"""
+        kinds = [kind for kind, _ in self.engagement_dist]
+        probabilities = np.array([p for _, p in self.engagement_dist], dtype=np.float64)
+        probabilities /= probabilities.sum()
+        configs = [self.engagement_types[kind] for kind in kinds]
+        low = np.array([config["watch_time_range"][0] for config in configs])
+        high = np.array([config["watch_time_range"][1] for config in configs])
+        actions = [config["action"] for config in configs]
+        weights = [config["weight"] for config in configs]
+
+        users_per_chunk = max(1, self.chunk_size // max(1, self.avg_watches))
+        for chunk, start in enumerate(range(0, self.num_users, users_per_chunk)):
+            rng = self._rng("engagement", chunk)
+            users = np.arange(start, min(start + users_per_chunk, self.num_users))
+
+            # Heavy-tailed watches per user (lognormal rate with mean avg_watches)
+            rates = rng.lognormal(np.log(max(1, self.avg_watches)) - 0.5, 1.0, size=len(users))
+            wanted = np.minimum(np.minimum(rng.poisson(rates), MAX_WATCHES), self.num_videos)
+
+            # Distinct videos per user: draw, drop repeats of a (user, video) pair, redraw the shortfall
+            pairs = np.empty(0, dtype=np.int64)
+            missing = wanted
+            for attempt in range(MAX_DRAW_ROUNDS):
+                user_ids = np.repeat(users, missing)
+                if len(user_ids) == 0:
+                    break
+                if attempt < POPULARITY_ROUNDS:
+                    video_ids = self._pick_videos(rng, user_ids)
+                else:
+                    video_ids = rng.integers(0, self.num_videos, size=len(user_ids))
+                keys = user_ids.astype(np.int64) * self.num_videos + video_ids
+                _, first = np.unique(keys, return_index=True)
+                keys = keys[np.sort(first)]
+                pairs = np.concatenate([pairs, keys[~np.isin(keys, pairs)]])
+                missing = wanted - np.bincount(pairs // self.num_videos - start, minlength=len(users))
+
+            n = len(pairs)
+            if n == 0:
+                continue
+            pairs.sort()
+            user_ids = pairs // self.num_videos
+            video_ids = pairs % self.num_videos
+
+            kind = rng.choice(len(kinds), size=n, p=probabilities)
+            watch_time = low[kind] + (rng.random(n) * (high[kind] - low[kind] + 1)).astype(np.int64)
+            seconds_ago = rng.integers(0, 31 * 86400, size=n)
+
+            yield [
+                {
+                    "user_id": f"user_{u}",
+                    "video_id": f"video_{v}",
+                    "watch_time": w,
+                    "action": actions[k],
+                    "weight": weights[k],
+                    "timestamp": (self.now - timedelta(seconds=s)).isoformat()
+                }
+                for u, v, k, w, s in zip(user_ids.tolist(), video_ids.tolist(), kind.tolist(), watch_time.tolist(), seconds_ago.tolist())
+            ]
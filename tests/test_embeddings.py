@@ -0,0 +1,97 @@
+"""
+EmbeddingService and EmbeddingCache against a stub provider (no network).
+"""
+import os
+
+import numpy as np
+
+from seeding.embeddings import EmbeddingCache, EmbeddingService, MockEmbeddings
+
+DIM = 8
+
+class StubProvider:
+    """Records every batch it's asked to embed; vectors come from MockEmbeddings"""
+
+    def __init__(self, model: str = "stub", dim: int = DIM):
+        self.model = model
+        self.dim = dim
+        self.calls = []
+        self._mock = MockEmbeddings(dim=dim)
+
+    def embed(self, texts) -> np.ndarray:
+        texts = list(texts)
+        self.calls.append(texts)
+        return self._mock.embed(texts)
+
+    @property
+    def embedded(self) -> list[str]:
+        return [text for batch in self.calls for text in batch]
+
+def test_duplicate_texts_are_embedded_once(tmp_path):
+    provider = StubProvider()
+    service = EmbeddingService(provider, cache_dir=str(tmp_path), batch_size=2, max_concurrency=2)
+
+    texts = ["jazz bar", "taco stand", "jazz bar", "rooftop", "taco stand"]
+    vectors = service.embed(texts)
+
+    assert sorted(provider.embedded) == ["jazz bar", "rooftop", "taco stand"]
+    assert all(len(batch) <= 2 for batch in provider.calls)
+    assert service.stats == {"hits": 0, "misses": 3, "requests": 2}
+    assert vectors.shape == (5, DIM)
+    np.testing.assert_array_equal(vectors[0], vectors[2])
+    np.testing.assert_array_equal(vectors[1], vectors[4])
+    np.testing.assert_allclose(vectors, provider._mock.embed(texts))
+
+def test_cache_hits_across_instances(tmp_path):
+    first = StubProvider()
+    before = EmbeddingService(first, cache_dir=str(tmp_path)).embed(["a", "b"])
+
+    second = StubProvider()
+    service = EmbeddingService(second, cache_dir=str(tmp_path))
+    after = service.embed(["b", "c", "a"])
+
+    assert second.embedded == ["c"]
+    assert service.stats == {"hits": 2, "misses": 1, "requests": 1}
+    np.testing.assert_array_equal(after[0], before[1])
+    np.testing.assert_array_equal(after[2], before[0])
+
+def test_cache_is_namespaced_by_model(tmp_path):
+    EmbeddingService(StubProvider(model="one"), cache_dir=str(tmp_path)).embed(["a"])
+
+    other = StubProvider(model="two")
+    EmbeddingService(other, cache_dir=str(tmp_path)).embed(["a"])
+
+    assert other.embedded == ["a"]
+
+def test_torn_tail_is_trimmed(tmp_path):
+    path = str(tmp_path / "cache")
+    cache = EmbeddingCache(path, DIM)
+    vectors = np.arange(3 * DIM, dtype=np.float32).reshape(3, DIM)
+    cache.put_many(["k0", "k1", "k2"], vectors)
+
+    # An interrupted append: half a vector row, and a key line without its newline
+    with open(cache.vectors_path, "ab") as f:
+        f.write(b"\0" * (2 * DIM))
+    with open(cache.keys_path, "a") as f:
+        f.write("k3")
+
+    reopened = EmbeddingCache(path, DIM)
+    assert len(reopened) == 3
+    assert os.path.getsize(reopened.vectors_path) == 3 * 4 * DIM
+    with open(reopened.keys_path) as f:
+        assert f.read() == "k0\nk1\nk2\n"
+    np.testing.assert_array_equal(reopened.get_many(["k2"])["k2"], vectors[2])
+
+def test_keys_without_vectors_are_dropped(tmp_path):
+    path = str(tmp_path / "cache")
+    cache = EmbeddingCache(path, DIM)
+    cache.put_many(["k0", "k1"], np.ones((2, DIM), dtype=np.float32))
+
+    # Keys written but their vector never landed
+    with open(cache.vectors_path, "r+b") as f:
+        f.truncate(4 * DIM)
+
+    reopened = EmbeddingCache(path, DIM)
+    assert reopened.get_many(["k0", "k1"]).keys() == {"k0"}
+    reopened.put_many(["k1"], np.full((1, DIM), 2.0, dtype=np.float32))
+    np.testing.assert_array_equal(EmbeddingCache(path, DIM).get_many(["k1"])["k1"], np.full(DIM, 2.0))
@@ -0,0 +1,117 @@
+"""
+Booking intent precompute against a stub LLM and an in-memory Redis.
+"""
+import asyncio
+import json
+from datetime import date
+
+import pytest
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("redis")
+
+from app import intents
+
+# A Wednesday
+TODAY = date(2026, 10, 21)
+
+VIDEO = {
+    "video_id": "vid_1",
+    "title": "Friday Jazz Night",
+    "description": "Live trio every Friday",
+    "video_type": "event",
+    "categories": ["Jazz", "Cocktails"],
+    "venue_name": "Blue Room",
+}
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+class StubResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+class StubLLM:
+    """Answers every prompt with the same intent and records what it was asked"""
+
+    def __init__(self, intent: dict):
+        self.intent = intent
+        self.calls = []
+
+    async def ainvoke(self, messages):
+        self.calls.append(messages)
+        return StubResponse(json.dumps(self.intent))
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(intents, "get_redis_client", lambda: client)
+    return client
+
+def _intent(**overrides) -> dict:
+    intent = {
+        "party_size": 2,
+        "days_ahead": 5,
+        "weekday": None,
+        "suggested_time": "20:00",
+        "occasion": "date_night",
+        "special_requests": "",
+        "reasoning": "",
+    }
+    intent.update(overrides)
+    return intent
+
+def _stored(redis_client) -> dict:
+    return json.loads(redis_client.get("booking_intent:vid_1"))["intent"]
+
+def test_prompt_asks_for_a_relative_day():
+    prompt = intents.build_intent_messages(VIDEO)[0].content
+    assert '"days_ahead"' in prompt
+    assert '"weekday"' in prompt
+    assert "YYYY-MM-DD" not in prompt
+
+def test_precompute_stores_days_ahead(redis_client):
+    llm = StubLLM(_intent(days_ahead=5))
+    stats = asyncio.run(intents.precompute_intents([VIDEO], llm))
+
+    assert stats == {"computed": 1, "skipped": 0, "failed": 0}
+    assert len(llm.calls) == 1
+    assert _stored(redis_client)["days_ahead"] == 5
+    assert "weekday" not in _stored(redis_client)
+
+    intent = intents.from_relative(_stored(redis_client), today=TODAY)
+    assert intent["suggested_date"] == "2026-10-26"
+    assert "days_ahead" not in intent
+
+def test_cached_intent_is_not_recomputed(redis_client):
+    asyncio.run(intents.precompute_intents([VIDEO], StubLLM(_intent())))
+
+    llm = StubLLM(_intent())
+    stats = asyncio.run(intents.precompute_intents([VIDEO], llm))
+
+    assert stats == {"computed": 0, "skipped": 1, "failed": 0}
+    assert llm.calls == []
+
+def test_weekday_resolves_to_next_occurrence(redis_client):
+    asyncio.run(intents.precompute_intents([VIDEO], StubLLM(_intent(weekday="Friday"))))
+
+    stored = _stored(redis_client)
+    assert stored["weekday"] == "friday"
+    assert intents.from_relative(stored, today=TODAY)["suggested_date"] == "2026-10-23"
+    # Never today: on a Friday the next Friday is a week out
+    assert intents.from_relative(stored, today=date(2026, 10, 23))["suggested_date"] == "2026-10-30"
+
+@pytest.mark.parametrize("days_ahead", [0, -2, 45, "soon", None])
+def test_out_of_range_days_fall_back_to_default(redis_client, days_ahead):
+    asyncio.run(intents.precompute_intents([VIDEO], StubLLM(_intent(days_ahead=days_ahead, weekday="someday"))))
+
+    stored = _stored(redis_client)
+    assert stored["days_ahead"] == intents.DEFAULT_DAYS_AHEAD
+    assert "weekday" not in stored
@@ -36,7 +36,7 @@ def test_booking_flow():
     
     print(f"\n1. Invoking Agent with initial state for {venue_info['venue_name']}...")
     try:
-        state = booking_agent.invoke(initial_state)
+        state = asyncio.run(booking_agent.ainvoke(initial_state))
         
         print(f"✅ Agent finished. Current step: {state.get('step')}")
         